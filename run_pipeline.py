@@ -4,97 +4,208 @@ Arizona U12 Soccer Rankings Pipeline
 ===================================
 
 Complete pipeline to generate U12 soccer rankings from raw data to final output.
-This script orchestrates the entire process:
+This script orchestrates the entire process in one Python process:
 
 1. Team Matching & Data Cleaning
-2. Comprehensive History Generation  
+2. Comprehensive History Generation
 3. V5.3E Enhanced Ranking Calculation
 4. Output Generation
 
+Stages form a DAG (see utils/pipeline_dag.py): each input CSV is read once
+and DataFrames are handed to the next stage in memory. Independent stages
+run concurrently, e.g. history generation and the iterative (Elo) SOS
+alongside Off/Def and strength-adjusted metrics. Every ranking input comes
+from this run's matched games: baseline SOS from the history stage, and the
+iterative SOS from the master-vs-master matched games, not from files
+left in the working directory.
+Matched games and the comprehensive history are written as typed Parquet
+(see utils/columnar_io.py); --csv also writes the CSVs.
+
 Usage:
-    python run_pipeline.py
+    python run_pipeline.py                      # full pipeline
+    python run_pipeline.py --from-matched       # skip team matching, start from Matched_Games.csv
+    python run_pipeline.py --stage history      # one stage (plus what it depends on)
+    python run_pipeline.py --workers 1          # serial run
+    python run_pipeline.py --csv                # also export Matched_Games / history CSVs
+    python run_pipeline.py --low-memory         # compact dtypes for very large inputs
+
+The per-stage scripts keep their own CLIs:
+    python src/core/team_matcher.py
+    python src/core/history_generator.py --in data/processed/Matched_Games.csv --out data/processed/Team_Game_Histories_COMPREHENSIVE.csv
+    python src/core/ranking_engine.py --in data/processed/Matched_Games.csv --out data/output/Rankings_v53_enhanced.csv
 
 Output Files:
     - data/output/Rankings_v53_enhanced.csv
-    - data/output/connectivity_report_v53e.csv
+    - connectivity_report_v53e.csv
 """
 
-import subprocess
+import argparse
 import sys
+import time
 from pathlib import Path
 import pandas as pd
 
-def run_command(command, description):
-    """Run a command and handle errors."""
-    print(f"\n🔄 {description}...")
-    try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully")
-        if result.stdout:
-            print(f"Output: {result.stdout.strip()}")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed")
-        print(f"Error: {e.stderr}")
-        return False
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+from core import ranking_engine as engine
+from core import history_generator
+from utils.pipeline_dag import PipelineDAG, PipelineStageError
+from utils import columnar_io
+from utils.columnar_io import read_table, resolve_table_path
+from utils.team_codes import TeamCodes
 
-def check_input_files():
+MASTER_TEAM_LIST = "data/input/AZ MALE U12 MASTER TEAM LIST.csv"
+GAME_HISTORY = "data/input/AZ MALE U12 GAME HISTORY LAST 18 MONTHS .csv"
+MATCHED_GAMES = "data/processed/Matched_Games.csv"
+COMPREHENSIVE_HISTORY = "data/processed/Team_Game_Histories_COMPREHENSIVE.csv"
+RANKINGS_OUT = "data/output/Rankings_v53_enhanced.csv"
+CONNECTIVITY_OUT = "connectivity_report_v53e.csv"  # written to the cwd, as by ranking_engine.py
+
+def check_input_files(from_matched=False):
     """Check that required input files exist."""
-    required_files = [
-        "data/input/AZ MALE U12 MASTER TEAM LIST.csv",
-        "data/input/AZ MALE U12 GAME HISTORY LAST 18 MONTHS .csv"
-    ]
-    
+    required_files = [MASTER_TEAM_LIST, MATCHED_GAMES if from_matched else GAME_HISTORY]
+
     missing_files = []
     for file_path in required_files:
-        if not Path(file_path).exists():
+        if not resolve_table_path(file_path).exists():
             missing_files.append(file_path)
-    
+
     if missing_files:
         print("❌ Missing required input files:")
         for file_path in missing_files:
             print(f"   - {file_path}")
         return False
-    
+
     print("✅ All required input files found")
     return True
 
+# ---- Stages ----
+
+def match_teams(master_df, raw_games):
+    """Step 1: match game-history names to the master list (writes Matched_Games.csv)."""
+    from core import team_matcher  # needs fuzzywuzzy; not imported for --from-matched runs
+    matched = team_matcher.main(master_df=master_df.copy(), games_df=raw_games)
+    if matched is None:
+        raise RuntimeError("Team matching could not load its inputs")
+    return matched
+
+def generate_history(matched):
+    """Step 2: comprehensive history (written to data/processed for the dashboards)."""
+    return history_generator.generate_comprehensive_history(
+        Path(MATCHED_GAMES), Path(COMPREHENSIVE_HISTORY), games_df=matched
+    )
+
+def ranking_games(matched, master_mapping):
+    """Windowed, master-team long games with int32 team codes."""
+    long = engine.clamp_window(engine.wide_to_long(matched))
+    long = engine.filter_to_master_teams(long, *master_mapping)
+    return TeamCodes.attach(long)
+
+def baseline_sos(base, history):
+    """Baseline SOS from the comprehensive history built by the `history` stage."""
+    if history is None or len(history) == 0:
+        print("Warning: Comprehensive history is empty, using offensive ranking as SOS proxy")
+        return base["Off_raw"].rank(pct=True)
+    sos_raw, sos_stats = engine.compute_baseline_sos(engine.canonical_sos_history(history), base.index)
+    engine.check_sos_match_rates(sos_stats, len(base))
+    return sos_raw
+
+def iterative_sos(matched, master_mapping):
+    """Iterative SOS of the SOS_ENGINE engine on the matched games of this run (master vs master)."""
+    if not engine.USE_ITERATIVE_SOS:
+        return None
+    from analytics.iterative_opponent_strength_v53_enhanced import filter_master_games
+    try:
+        games = filter_master_games(matched, master_mapping[1])
+        if len(games) == 0:
+            raise ValueError("No master team games found in dataset")
+        sos_iterative, _ = engine.compute_sos_from_games(games)
+        return sos_iterative
+    except Exception as e:
+        print(f"Warning: Failed to compute iterative SOS: {e}")
+        return None
+
+def write_rankings(games, master_mapping, base, sa_metrics, sos_raw, sos_iterative, games_total):
+    """Step 3/4: final PowerScore table, written like ranking_engine.py does."""
+    long, team_codes = games
+    last_game = long.groupby("team_id")["Date"].max()
+    last_game.index = team_codes.decode(last_game.index.to_numpy())
+    out = engine.finalize_rankings(base, sa_metrics, sos_raw, sos_iterative, last_game, games_total)
+    out_visible = engine.visible_rankings(out)
+    engine.check_ranked_teams(out_visible, *master_mapping)
+    Path(RANKINGS_OUT).parent.mkdir(parents=True, exist_ok=True)
+    out_visible[engine.RANKINGS_COLUMNS].to_csv(RANKINGS_OUT, index=False, encoding="utf-8")
+    return out_visible
+
+def write_connectivity(matched):
+    connectivity_df = engine.generate_connectivity_report(matched)
+    connectivity_df.to_csv(CONNECTIVITY_OUT, index=False)
+    return connectivity_df
+
+def build_pipeline(from_matched=False) -> PipelineDAG:
+    """Pipeline stages and their data dependencies."""
+    dag = PipelineDAG()
+    dag.add("master", lambda: pd.read_csv(MASTER_TEAM_LIST))
+    if from_matched:
+        dag.add("matched_games", lambda: read_table(MATCHED_GAMES))
+    else:
+        dag.add("raw_games", lambda: pd.read_csv(GAME_HISTORY))
+        dag.add("matched_games", match_teams, deps=("master", "raw_games"))
+    dag.add("history", generate_history, deps=("matched_games",))
+    dag.add("master_mapping", lambda m: engine.load_master_team_mapping(master_teams=m), deps=("master",))
+    dag.add("ranking_games", ranking_games, deps=("matched_games", "master_mapping"))
+    dag.add("base", lambda g: engine.compute_off_def_raw(g[0], g[1]), deps=("ranking_games",))
+    dag.add("strength_adjusted", lambda g, base: engine.compute_strength_adjusted_metrics(g[0], base, g[1]),
+            deps=("ranking_games", "base"))
+    dag.add("baseline_sos", baseline_sos, deps=("base", "history"))
+    dag.add("iterative_sos", iterative_sos, deps=("matched_games", "master_mapping"))
+    dag.add("games_total", lambda history: history.groupby("Team").size(), deps=("history",))
+    dag.add("rankings", write_rankings,
+            deps=("ranking_games", "master_mapping", "base", "strength_adjusted",
+                  "baseline_sos", "iterative_sos", "games_total"))
+    dag.add("connectivity", write_connectivity, deps=("matched_games",))
+    return dag
+
 def main():
     """Main pipeline execution."""
+    p = argparse.ArgumentParser(description="Arizona U12 rankings pipeline (in-process DAG)")
+    p.add_argument("--from-matched", action="store_true",
+                   help=f"Start from {MATCHED_GAMES} instead of re-running team matching")
+    p.add_argument("--stage", nargs="+", default=None,
+                   help="Only run these stages (and the stages they depend on)")
+    p.add_argument("--workers", type=int, default=4, help="Concurrent stages (1 = serial)")
+    p.add_argument("--csv", action="store_true",
+                   help="Also write CSV copies of the Parquet matched games and history")
+    p.add_argument("--low-memory", action="store_true",
+                   help="Compact dtypes in the ranking stages (categorical teams, int8/int16 scores, float32)")
+    args = p.parse_args()
+    if args.csv:
+        columnar_io.WRITE_CSV_EXPORTS = True
+    if args.low_memory:
+        engine.LOW_MEMORY_MODE = True
+
     print("🏆 Arizona U12 Soccer Rankings Pipeline")
     print("=" * 50)
-    
+
     # Check input files
-    if not check_input_files():
-        sys.exit(1)
-    
-    # Step 1: Team Matching & Data Cleaning
-    if not run_command(
-        "python src/core/team_matcher.py",
-        "Team Matching & Data Cleaning"
-    ):
+    if not check_input_files(args.from_matched):
         sys.exit(1)
-    
-    # Step 2: Comprehensive History Generation
-    if not run_command(
-        "python src/core/history_generator.py --in data/processed/Matched_Games.csv --out data/processed/Team_Game_Histories_COMPREHENSIVE.csv",
-        "Comprehensive History Generation"
-    ):
-        sys.exit(1)
-    
-    # Step 3: V5.3E Enhanced Ranking Calculation
-    if not run_command(
-        "python src/core/ranking_engine.py --in data/processed/Matched_Games.csv --out data/output/Rankings_v53_enhanced.csv",
-        "V5.3E Enhanced Ranking Calculation"
-    ):
+
+    t0 = time.time()
+    dag = build_pipeline(args.from_matched)
+    try:
+        dag.run(args.stage, max_workers=args.workers)
+    except PipelineStageError as e:
+        print(f"❌ {e}: {e.__cause__!r}")
         sys.exit(1)
-    
+
+    print("\n⏱ Stage timings:")
+    for name, seconds in dag.timings.items():
+        print(f"   {name:<18} {seconds:6.1f}s")
+    print(f"⏱ Pipeline wall time: {time.time() - t0:.1f}s")
+
     # Verify outputs
-    output_files = [
-        "data/output/Rankings_v53_enhanced.csv",
-        "data/output/connectivity_report_v53e.csv"
-    ]
-    
+    output_files = [RANKINGS_OUT, CONNECTIVITY_OUT]
+
     print("\n📊 Pipeline Results:")
     for file_path in output_files:
         if Path(file_path).exists():
@@ -102,7 +213,7 @@ def main():
             print(f"✅ {file_path} - {len(df)} records")
         else:
             print(f"❌ {file_path} - Not found")
-    
+
     print("\n🎉 Pipeline completed successfully!")
     print("Check data/output/ for final rankings and reports.")
 
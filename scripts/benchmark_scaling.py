@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Scaling Benchmark on Synthetic National Data
+============================================
+
+Generates synthetic master lists and Matched_Games files (see
+src/utils/synthetic_data.py) at several sizes and times the pipeline
+components on each:
+
+- generate: synthetic data generation and CSV writing
+- history: comprehensive history generation
+- engine: ranking_engine.build_rankings_from_wide without the Elo SOS
+  (its per-stage profile is kept in the engine.stages field)
+- elo: the iterative (Elo) SOS on its own
+- matcher_hybrid / matcher_sophisticated: noisy names matched against the
+  master list of their age group, with accuracy against the true team
+
+Each scale runs in a fresh process, so the peak RSS of one scale does not
+carry over to the next. The Elo SOS and the matchers are skipped beyond
+--elo-max-games / --matcher-max-teams, where a single run takes hours.
+
+Usage:
+    python scripts/benchmark_scaling.py --scales 10000 100000 1000000
+    python scripts/benchmark_scaling.py --scales 5000000 --components generate engine --out data/benchmarks/5m.csv
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root and src to path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "src"))
+
+from utils.synthetic_data import SyntheticLeague, default_team_count
+from utils.stage_profiler import StageProfiler, profile_path_for
+
+COMPONENTS = ["generate", "history", "engine", "elo", "matchers"]
+ELO_MAX_GAMES = 100_000
+MATCHER_MAX_TEAMS = 100_000
+MATCHER_QUERIES = 50
+
+
+def _write_engine_inputs(league, games, work):
+    """Lay the synthetic data out where the engine, history generator and Elo loader look (cwd-relative)."""
+    from core import ranking_engine as engine
+    master = pd.DataFrame({"Team Name": league.master["Team_Name"], "Club": ""})
+    for d in ["data/input", "data/processed", "data/output"]:
+        (work / d).mkdir(parents=True, exist_ok=True)
+    master.to_csv(work / engine.MASTER_TEAM_LIST_PATH, index=False)
+    master.to_csv(work / engine.ITERATIVE_SOS_MASTER_PATH, index=False)
+    games.to_csv(work / "data/processed/Matched_Games.csv", index=False)
+    games.to_csv(work / engine.ITERATIVE_SOS_GAMES_PATH, index=False)
+    league.write_master_lists(work / "data/input")
+
+
+def _bench_matchers(prof, league, n_queries, seed):
+    """Match noisy scraped names against their age group's master names."""
+    from src.identity.hybrid_matcher import HybridMatcher
+    from sophisticated_team_matcher import SophisticatedTeamMatcher
+
+    rng = np.random.default_rng(seed)
+    teams = rng.choice(league.n_teams, min(n_queries, league.n_teams), replace=False)
+    queries = league.variants()[teams, rng.integers(0, 4, len(teams))]
+    truth = league.master["Team_Name"].to_numpy()[teams]
+    by_age = {age: group["Team_Name"].tolist() for age, group in league.master.groupby("Age_U")}
+    query_age = league.master["Age_U"].to_numpy()[teams]
+
+    hybrid, sophisticated = HybridMatcher(threshold=0.7), SophisticatedTeamMatcher()
+    for name, match in [("matcher_hybrid", lambda q, c: (hybrid.find_best_match(q, c) or (None,))[0]),
+                        ("matcher_sophisticated", lambda q, c: sophisticated.find_best_match(q, c))]:
+        with prof.stage(name) as info:
+            found = [match(q, by_age[age]) for q, age in zip(queries, query_age)]
+            info["rows"] = len(queries)
+            info["candidates"] = int(np.mean([len(by_age[age]) for age in query_age]))
+            info["accuracy"] = round(float(np.mean([f == t for f, t in zip(found, truth)])), 4)
+        prof.stages[-1]["ms_per_query"] = round(1000 * prof.stages[-1]["wall_s"] / max(1, len(queries)), 2)
+
+
+def run_scale(n_games, components, seed=0, elo_max_games=ELO_MAX_GAMES,
+              matcher_max_teams=MATCHER_MAX_TEAMS, matcher_queries=MATCHER_QUERIES, work_dir=None) -> list:
+    """
+    Benchmark every component at one scale.
+
+    Returns:
+        One record per component (StageProfiler format plus games/teams)
+    """
+    from core import ranking_engine as engine
+    from core import history_generator
+
+    n_teams = default_team_count(n_games)
+    prof = StageProfiler(f"benchmark_{n_games}")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        work = Path(tmp)
+        with prof.stage("generate") as info:
+            league = SyntheticLeague(n_teams, seed=seed)
+            games = league.games(n_games)
+            _write_engine_inputs(league, games, work)
+            info["rows"] = len(games)
+        del games
+        os.chdir(work)
+        try:
+            if "history" in components or "engine" in components:
+                # The engine reads the root history for baseline SOS
+                with prof.stage("history") as info:
+                    hist = history_generator.generate_comprehensive_history(
+                        Path("data/processed/Matched_Games.csv"), Path(engine.SOS_HISTORY_PATH))
+                    info["rows"] = len(hist)
+                del hist
+
+            if "engine" in components:
+                use_iterative, engine.USE_ITERATIVE_SOS = engine.USE_ITERATIVE_SOS, False
+                try:
+                    out_csv = Path("data/output/Rankings_benchmark.csv")
+                    with prof.stage("engine") as info:
+                        engine.build_rankings_from_wide(Path("data/processed/Matched_Games.csv"), out_csv,
+                                                        use_cache=False)
+                        info["rows"] = len(pd.read_csv(out_csv))
+                    with open(profile_path_for(out_csv)) as f:
+                        prof.stages[-1]["stages"] = {s["stage"]: s["wall_s"] for s in json.load(f)["stages"]}
+                finally:
+                    engine.USE_ITERATIVE_SOS = use_iterative
+
+            if "elo" in components and n_games <= elo_max_games:
+                with prof.stage("elo") as info:
+                    sos = engine.compute_iterative_sos()
+                    info["rows"] = 0 if sos is None else len(sos)
+        finally:
+            os.chdir(cwd)
+
+    # The matchers load their mappings (data/mappings) relative to the project root
+    if "matchers" in components and n_teams <= matcher_max_teams:
+        _bench_matchers(prof, league, matcher_queries, seed)
+
+    return [{"games": n_games, "teams": n_teams, **record} for record in prof.stages]
+
+
+def print_table(results: pd.DataFrame):
+    """Seconds per component (rows) and scale (columns)."""
+    table = results.pivot_table(index="stage", columns="games", values="wall_s", sort=False)
+    print("\n📊 Wall seconds by component and scale:")
+    print(table.round(2).to_string())
+    if "accuracy" in results:
+        acc = results.dropna(subset=["accuracy"])
+        for r in acc.itertuples():
+            print(f"   {r.stage} @ {r.games}: {r.ms_per_query:.1f} ms/query over {r.candidates} candidates, "
+                  f"accuracy {r.accuracy:.1%}")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark ranking components on synthetic national-scale data")
+    p.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                   help="Numbers of games to benchmark")
+    p.add_argument("--components", nargs="+", default=COMPONENTS, choices=COMPONENTS)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--elo-max-games", type=int, default=ELO_MAX_GAMES,
+                   help="Skip the Elo SOS above this many games")
+    p.add_argument("--matcher-max-teams", type=int, default=MATCHER_MAX_TEAMS,
+                   help="Skip the matchers above this many teams")
+    p.add_argument("--matcher-queries", type=int, default=MATCHER_QUERIES, help="Noisy names to match per scale")
+    p.add_argument("--work-dir", default=None, help="Directory for the temporary per-scale data")
+    p.add_argument("--out", default="data/benchmarks/scaling_benchmark.csv",
+                   help="Results CSV (a .json with the same name holds the per-stage engine profile)")
+    args = p.parse_args()
+
+    records = []
+    for n_games in args.scales:
+        print(f"\n🏁 Benchmarking {n_games:,} games")
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            records += pool.submit(run_scale, n_games, args.components, args.seed, args.elo_max_games,
+                                   args.matcher_max_teams, args.matcher_queries, args.work_dir).result()
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    results = pd.DataFrame(records)
+    results.drop(columns=["stages"], errors="ignore").to_csv(out, index=False)
+    with open(out.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, default=str)
+    print_table(results)
+    print(f"\n✅ Results saved to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,10 @@ Key Features:
 - Convergence detection and iteration limits
 - Normalized output for integration with existing rankings
 - Adaptive K-factor for volatility control
+- Array kernel: games factorized to int32 team indices once, rating range
+  tracked with heaps (RATING_RANGE_MODE) instead of a scan per game
+- Batch mode (UPDATE_MODE = "batch"): simultaneous, vectorized iterations
+  whose ratings do not depend on the input row order
 
 Usage:
     from analytics.iterative_opponent_strength_v53_enhanced import compute_iterative_sos_adaptive
@@ -25,11 +29,16 @@ Usage:
 
 import pandas as pd
 import numpy as np
+import heapq
+import sys
 from collections import defaultdict
 from statistics import mean
 from pathlib import Path
 import warnings
 
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.columnar_io import read_table
+
 # ---- Iterative SOS Configuration ----
 INITIAL_RATING = 1500
 K_FACTOR = 24                    # Update sensitivity
@@ -45,6 +54,15 @@ ADAPTIVE_K_ENABLED = True
 ADAPTIVE_K_MIN_GAMES = 8       # minimum games for full weight
 ADAPTIVE_K_ALPHA = 0.5         # opponent gap exponent
 ADAPTIVE_K_BETA = 0.6          # sample size exponent
+# Rating range that normalizes team strengths for the opponent-gap term:
+# "exact" = live min/max before every game (heap-tracked, O(log teams)),
+# "pass" = min/max snapshot at the start of each iteration (O(1), lags within a pass)
+RATING_RANGE_MODE = "exact"
+RATING_RANGE_MODES = ("exact", "pass")
+# "sequential" = each game sees the ratings left by the previous one (row order matters),
+# "batch" = every game scored on the previous iteration's ratings, deltas applied at once
+UPDATE_MODE = "sequential"
+UPDATE_MODES = ("sequential", "batch")
 
 
 def adaptive_multiplier(team_strength, opp_strength, games_used, 
@@ -52,6 +70,9 @@ def adaptive_multiplier(team_strength, opp_strength, games_used,
     """
     Shrink single-game impact when opponent is much weaker or GP is small.
     
+    Accepts scalars or NumPy arrays (broadcast elementwise), so a whole
+    long-format frame can be scored in one call.
+    
     Args:
         team_strength: Team's current normalized strength (0-1)
         opp_strength: Opponent's normalized strength (0-1)
@@ -62,14 +83,19 @@ def adaptive_multiplier(team_strength, opp_strength, games_used,
         beta: Sample size exponent
     
     Returns:
-        Adjusted K-factor multiplier (0-1)
+        Adjusted K-factor multiplier (0-1), scalar or array
     """
+    team_strength = np.asarray(team_strength, dtype=float)
+    opp_strength = np.asarray(opp_strength, dtype=float)
+    games_used = np.asarray(games_used, dtype=float)
+    
     # Opponent gap: if much stronger, shrink impact
-    gap = max(0.0, team_strength - opp_strength)
+    # (fmax/fmin ignore NaN like the builtin max/min did)
+    gap = np.fmax(0.0, team_strength - opp_strength)
     opp_factor = 1.0 / (1.0 + gap**alpha)
     
     # Sample penalty: if < min_games, shrink impact
-    sample_factor = min(1.0, (games_used / min_games)**beta)
+    sample_factor = np.fmin(1.0, (games_used / min_games)**beta)
     
     return k_base * opp_factor * sample_factor
 
@@ -86,7 +112,7 @@ def load_and_filter_games(matched_games_path: str) -> pd.DataFrame:
         Filtered DataFrame with only master team games and mapped team names
     """
     print(f"Loading games from {matched_games_path}...")
-    df = pd.read_csv(matched_games_path)
+    df = read_table(matched_games_path)
     
     # Load master team list
     master_teams = pd.read_csv("AZ MALE U12 MASTER TEAM LIST.csv")
@@ -106,9 +132,26 @@ def load_and_filter_games(matched_games_path: str) -> pd.DataFrame:
             combined_name = team_name
         team_name_mapping[team_name] = combined_name
     
+    return filter_master_games(df, team_name_mapping)
+
+
+def filter_master_games(df: pd.DataFrame, team_name_mapping: dict) -> pd.DataFrame:
+    """
+    Master team vs master team games of an already loaded wide games frame,
+    with team names mapped to "Team Name Club".
+    
+    Args:
+        df: Wide games (Team A, Team B, ...); not modified
+        team_name_mapping: "Team Name" -> "Team Name Club"
+        
+    Returns:
+        Filtered copy with mapped team names
+    """
     # Apply team name mapping to include club names
-    df["Team A"] = df["Team A"].map(lambda x: team_name_mapping.get(x, x))
-    df["Team B"] = df["Team B"].map(lambda x: team_name_mapping.get(x, x))
+    df = df.assign(**{
+        "Team A": df["Team A"].map(lambda x: team_name_mapping.get(x, x)),
+        "Team B": df["Team B"].map(lambda x: team_name_mapping.get(x, x)),
+    })
     
     # Filter to master team vs master team games (using mapped names)
     master_games = df[
@@ -121,6 +164,12 @@ def load_and_filter_games(matched_games_path: str) -> pd.DataFrame:
     return master_games
 
 
+def games_played_by(games_df: pd.DataFrame, as_of) -> pd.DataFrame:
+    """Games played on or before `as_of` (the whole day counts)."""
+    end = pd.Timestamp(as_of).normalize() + pd.Timedelta(days=1)
+    return games_df[pd.to_datetime(games_df["Date"], errors="coerce") < end]
+
+
 def initialize_ratings(teams: list) -> dict:
     """
     Initialize all teams with the same starting rating.
@@ -134,8 +183,180 @@ def initialize_ratings(teams: list) -> dict:
     return {team: INITIAL_RATING for team in teams}
 
 
+def elo_game_arrays(games_df: pd.DataFrame, teams: list) -> tuple:
+    """
+    Factorize games for the Elo kernel.
+    
+    Args:
+        games_df: DataFrame with Team A, Team B, Score A, Score B columns
+        teams: Team names in rating-array order
+        
+    Returns:
+        Tuple of (int32 Team A indices, int32 Team B indices, K_FACTOR times
+        goal-differential multiplier per game, actual outcome for Team A
+        per game: 1 win, 0 loss, 0.5 tie)
+    """
+    index = pd.Index(teams)
+    team_a = index.get_indexer(games_df["Team A"]).astype(np.int32)
+    team_b = index.get_indexer(games_df["Team B"]).astype(np.int32)
+    missing = (team_a < 0) | (team_b < 0)
+    if missing.any():
+        names = pd.unique(games_df.loc[missing, ["Team A", "Team B"]].to_numpy().ravel())
+        raise KeyError(f"Teams without a rating: {[n for n in names if n not in index]}")
+    
+    gd = games_df["Score A"].to_numpy(dtype=float) - games_df["Score B"].to_numpy(dtype=float)
+    actual = np.where(gd > 0, 1.0, np.where(gd < 0, 0.0, 0.5))
+    if USE_GOAL_DIFF_AWARE:
+        mult = 1 + GOAL_DIFF_MULT * np.minimum(np.abs(gd), GOAL_DIFF_CAP)
+    else:
+        mult = np.ones(len(gd))
+    # K_FACTOR * mult * (actual - exp_a) evaluates left to right, so the
+    # fixed product can be taken per game up front
+    return team_a, team_b, K_FACTOR * mult, actual
+
+
+def elo_pass(ratings: list, game_terms: list, sample_factor: list, adaptive: bool,
+             rating_range: str = "exact") -> list:
+    """
+    One sequential Elo pass over all games, updating `ratings` in place.
+    
+    Games are applied in order, each seeing the ratings left by the previous
+    one, with the same arithmetic as the per-game update of the original
+    row loop, so the ratings are bit-identical to it in "exact" range mode.
+    
+    Args:
+        ratings: Ratings by team index (Python floats)
+        game_terms: (team_a, team_b, k_mult, actual) per game, see elo_game_arrays
+        sample_factor: Sample-size part of the adaptive multiplier by team index
+        adaptive: Apply the adaptive K-factor
+        rating_range: "exact" or "pass", see RATING_RANGE_MODE
+        
+    Returns:
+        List of |rating change| of Team A per game
+    """
+    exact = adaptive and rating_range == "exact"
+    if exact:
+        # Lazy min/max heaps of (rating, team, version). Every update bumps
+        # the team's version and pushes the new rating; an entry is current
+        # only while its version is the team's latest, so stale tops are
+        # popped when they surface. Heaps past 2x the team count are rebuilt
+        # from the live ratings, keeping memory flat across passes.
+        version = [0] * len(ratings)
+        max_heap = 2 * len(ratings)
+        low, high = _range_heaps(ratings, version)
+    elif adaptive:
+        min_rating, max_rating = min(ratings), max(ratings)
+    
+    deltas = []
+    for a, b, k_mult, actual in game_terms:
+        exp_a = 1 / (1 + 10 ** ((ratings[b] - ratings[a]) / RATING_SCALE))
+        base_change = k_mult * (actual - exp_a)
+        
+        if adaptive:
+            # Normalize ratings to 0-1 range for the opponent-gap term
+            if exact:
+                while version[low[0][1]] != low[0][2]:
+                    heapq.heappop(low)
+                while version[high[0][1]] != high[0][2]:
+                    heapq.heappop(high)
+                min_rating, max_rating = ratings[low[0][1]], ratings[high[0][1]]
+            if max_rating > min_rating:
+                strength_a = (ratings[a] - min_rating) / (max_rating - min_rating)
+                strength_b = (ratings[b] - min_rating) / (max_rating - min_rating)
+            else:
+                strength_a = strength_b = 0.5
+            gap_a = max(0.0, strength_a - strength_b)
+            gap_b = max(0.0, strength_b - strength_a)
+            change_a = base_change * ((1.0 / (1.0 + gap_a**ADAPTIVE_K_ALPHA)) * sample_factor[a])
+            change_b = -base_change * ((1.0 / (1.0 + gap_b**ADAPTIVE_K_ALPHA)) * sample_factor[b])
+        else:
+            change_a = base_change
+            change_b = -base_change
+        
+        ratings[a] += change_a
+        ratings[b] += change_b
+        deltas.append(abs(change_a))
+        if exact:
+            if len(low) >= max_heap:
+                low, high = _range_heaps(ratings, version)
+                continue
+            for i in (a, b):
+                version[i] += 1
+                r = ratings[i]
+                heapq.heappush(low, (r, i, version[i]))
+                heapq.heappush(high, (-r, i, version[i]))
+    return deltas
+
+
+def _range_heaps(ratings: list, version: list) -> tuple:
+    """Fresh min/max heaps of (±rating, team, version) for `elo_pass`."""
+    low = [(r, i, version[i]) for i, r in enumerate(ratings)]
+    high = [(-r, i, version[i]) for i, r in enumerate(ratings)]
+    heapq.heapify(low)
+    heapq.heapify(high)
+    return low, high
+
+
+def elo_batch_step(team_a, team_b, k_mult, n_teams: int) -> np.ndarray:
+    """
+    Per-team step size for batch updates: 1 / (1 + the team's largest
+    possible Elo curvature, sum of k_mult * ln(10) / (4 * RATING_SCALE) over
+    its games). Applying each team's plain sum of game changes at once would
+    overshoot the fixed point for teams with many games and oscillate; with
+    this step every update stays below it, while a team with a single game
+    still moves by almost its full Elo change.
+    """
+    curvature = k_mult * np.log(10) / (4 * RATING_SCALE)
+    return 1.0 / (1.0 + np.bincount(team_a, curvature, n_teams) + np.bincount(team_b, curvature, n_teams))
+
+
+def elo_batch_pass(ratings: np.ndarray, team_a, team_b, k_mult, actual, sample_factor: np.ndarray,
+                   step: np.ndarray, adaptive: bool) -> np.ndarray:
+    """
+    One simultaneous Elo iteration, updating `ratings` (float array) in place.
+    
+    Every game's expected score and adaptive K use the ratings as they stood
+    at the start of the iteration (rating range included). The per-game
+    changes are summed per team with np.add.at and applied at once, scaled
+    by `step` (see elo_batch_step).
+    
+    Returns:
+        |rating change| of every team with games, sorted ascending
+    """
+    exp_a = 1 / (1 + 10 ** ((ratings[team_b] - ratings[team_a]) / RATING_SCALE))
+    base_change = k_mult * (actual - exp_a)
+    change_a, change_b = base_change, -base_change
+    if adaptive:
+        min_rating, max_rating = ratings.min(), ratings.max()
+        if max_rating > min_rating:
+            strength = (ratings - min_rating) / (max_rating - min_rating)
+        else:
+            strength = np.full(len(ratings), 0.5)
+        gap = strength[team_a] - strength[team_b]
+        change_a = base_change * ((1.0 / (1.0 + np.maximum(0.0, gap) ** ADAPTIVE_K_ALPHA)) * sample_factor[team_a])
+        change_b = -base_change * ((1.0 / (1.0 + np.maximum(0.0, -gap) ** ADAPTIVE_K_ALPHA)) * sample_factor[team_b])
+    
+    delta = np.zeros(len(ratings))
+    np.add.at(delta, team_a, change_a)
+    np.add.at(delta, team_b, change_b)
+    delta *= step
+    ratings += delta
+    return np.sort(np.abs(delta[step < 1.0]))
+
+
+def _canonical_game_order(teams: list, team_a, team_b, k_mult, actual) -> np.ndarray:
+    """
+    Game order by (Team A name, Team B name, multiplier, outcome), so batch
+    sums accumulate in the same order however the input rows are sorted.
+    """
+    name_rank = np.empty(len(teams), dtype=np.int64)
+    name_rank[np.argsort(np.asarray(teams, dtype=object), kind="mergesort")] = np.arange(len(teams))
+    return np.lexsort((actual, k_mult, name_rank[team_b], name_rank[team_a]))
+
+
 def run_elo_iterations_adaptive(games_df: pd.DataFrame, ratings: dict, 
-                               use_adaptive_k: bool = True) -> tuple:
+                               use_adaptive_k: bool = True, rating_range: str = None,
+                               update_mode: str = None) -> tuple:
     """
     Run iterative Elo updates until convergence or max iterations.
     Enhanced with adaptive K-factor for volatility control.
@@ -144,10 +365,23 @@ def run_elo_iterations_adaptive(games_df: pd.DataFrame, ratings: dict,
         games_df: DataFrame with Team A, Team B, Score A, Score B columns
         ratings: Dictionary of current team ratings
         use_adaptive_k: Whether to apply adaptive K-factor
+        rating_range: Rating normalization for the adaptive K ("exact" or
+            "pass", default RATING_RANGE_MODE); batch updates always use the
+            range at the start of the iteration
+        update_mode: "sequential" or "batch" (default UPDATE_MODE). Batch
+            results do not depend on the row order of `games_df`
         
     Returns:
-        Tuple of (final_ratings, convergence_info)
+        Tuple of (final_ratings, convergence_info). In batch mode the mean
+        deltas are per team (mean |rating change| of teams with games).
     """
+    rating_range = RATING_RANGE_MODE if rating_range is None else rating_range
+    if rating_range not in RATING_RANGE_MODES:
+        raise ValueError(f"rating_range must be one of {RATING_RANGE_MODES}, got {rating_range!r}")
+    update_mode = UPDATE_MODE if update_mode is None else update_mode
+    if update_mode not in UPDATE_MODES:
+        raise ValueError(f"update_mode must be one of {UPDATE_MODES}, got {update_mode!r}")
+    batch = update_mode == "batch"
     print("Running Elo iterations with adaptive K-factor..." if use_adaptive_k else "Running Elo iterations...")
     
     convergence_info = {
@@ -157,86 +391,37 @@ def run_elo_iterations_adaptive(games_df: pd.DataFrame, ratings: dict,
         'final_iteration': 0
     }
     
-    # Count games per team for adaptive K
-    games_played = defaultdict(int)
-    for _, game in games_df.iterrows():
-        games_played[game["Team A"]] += 1
-        games_played[game["Team B"]] += 1
+    teams = list(ratings)
+    values = list(ratings.values())
+    team_a, team_b, k_mult, actual = elo_game_arrays(games_df, teams)
+    
+    # Sample-size part of the adaptive multiplier is fixed per team, so score
+    # every team in one array call (zero opponent gap isolates the sample term)
+    games_played = np.bincount(np.concatenate([team_a, team_b]), minlength=len(teams))
+    sample_factor = adaptive_multiplier(
+        0.0, 0.0, games_played.astype(float),
+        k_base=1.0, min_games=ADAPTIVE_K_MIN_GAMES,
+        alpha=ADAPTIVE_K_ALPHA, beta=ADAPTIVE_K_BETA
+    ).tolist()
+    adaptive = use_adaptive_k and ADAPTIVE_K_ENABLED
+    if batch:
+        order = _canonical_game_order(teams, team_a, team_b, k_mult, actual)
+        batch_games = (team_a[order], team_b[order], k_mult[order], actual[order])
+        rating_array = np.array(values, dtype=float)
+        sample_array = np.asarray(sample_factor)
+        step = elo_batch_step(*batch_games[:3], len(teams))
+    else:
+        game_terms = list(zip(team_a.tolist(), team_b.tolist(), k_mult.tolist(), actual.tolist()))
     
     for iteration in range(MAX_ITERS):
-        deltas = []
-        
-        for _, game in games_df.iterrows():
-            team_a = game["Team A"]
-            team_b = game["Team B"]
-            score_a = game["Score A"]
-            score_b = game["Score B"]
-            
-            # Calculate goal differential
-            gd = score_a - score_b
-            
-            # Determine actual outcome (1 = A wins, 0 = B wins, 0.5 = tie)
-            if gd > 0:
-                actual = 1
-            elif gd < 0:
-                actual = 0
-            else:
-                actual = 0.5
-            
-            # Calculate expected outcome using logistic function
-            rating_diff = ratings[team_b] - ratings[team_a]
-            exp_a = 1 / (1 + 10 ** (rating_diff / RATING_SCALE))
-            
-            # Apply goal-differential multiplier (capped)
-            if USE_GOAL_DIFF_AWARE:
-                mult = 1 + GOAL_DIFF_MULT * min(abs(gd), GOAL_DIFF_CAP)
-            else:
-                mult = 1
-            
-            # Calculate base rating change
-            base_change = K_FACTOR * mult * (actual - exp_a)
-            
-            # Apply adaptive K-factor if enabled
-            if use_adaptive_k and ADAPTIVE_K_ENABLED:
-                # Normalize ratings to 0-1 range for adaptive multiplier
-                all_ratings = list(ratings.values())
-                min_rating = min(all_ratings)
-                max_rating = max(all_ratings)
-                
-                if max_rating > min_rating:
-                    team_a_strength = (ratings[team_a] - min_rating) / (max_rating - min_rating)
-                    team_b_strength = (ratings[team_b] - min_rating) / (max_rating - min_rating)
-                else:
-                    team_a_strength = team_b_strength = 0.5
-                
-                # Apply adaptive multiplier to both teams
-                k_mult_a = adaptive_multiplier(
-                    team_a_strength, team_b_strength, games_played[team_a],
-                    k_base=1.0, min_games=ADAPTIVE_K_MIN_GAMES,
-                    alpha=ADAPTIVE_K_ALPHA, beta=ADAPTIVE_K_BETA
-                )
-                k_mult_b = adaptive_multiplier(
-                    team_b_strength, team_a_strength, games_played[team_b],
-                    k_base=1.0, min_games=ADAPTIVE_K_MIN_GAMES,
-                    alpha=ADAPTIVE_K_ALPHA, beta=ADAPTIVE_K_BETA
-                )
-                
-                # Apply different K-factors to each team
-                change_a = base_change * k_mult_a
-                change_b = -base_change * k_mult_b
-            else:
-                # Standard symmetric updates
-                change_a = base_change
-                change_b = -base_change
-            
-            # Update ratings
-            ratings[team_a] += change_a
-            ratings[team_b] += change_b
-            
-            deltas.append(abs(change_a))
+        if batch:
+            deltas = elo_batch_pass(rating_array, *batch_games, sample_array, step, adaptive)
+            mean_delta = float(deltas.mean())
+        else:
+            deltas = elo_pass(values, game_terms, sample_factor, adaptive, rating_range)
+            mean_delta = sum(deltas) / len(deltas)
         
         # Track convergence
-        mean_delta = sum(deltas) / len(deltas)
         convergence_info['iterations'].append(iteration + 1)
         convergence_info['mean_deltas'].append(mean_delta)
         
@@ -253,6 +438,7 @@ def run_elo_iterations_adaptive(games_df: pd.DataFrame, ratings: dict,
         convergence_info['final_iteration'] = MAX_ITERS
         print(f"Reached maximum iterations ({MAX_ITERS}) without convergence")
     
+    ratings.update(zip(teams, rating_array.tolist() if batch else values))
     return ratings, convergence_info
 
 
@@ -324,40 +510,28 @@ def normalize_sos(opp_strength: dict) -> dict:
     return normalized
 
 
-def compute_iterative_sos_adaptive(matched_games_path: str, 
-                                  k_factor: float = 24.0,
-                                  use_adaptive_k: bool = True,
-                                  convergence_tol: float = 1.0,
-                                  max_iterations: int = 30) -> dict:
+def compute_iterative_sos_from_games(games_df: pd.DataFrame,
+                                     initial_ratings: dict = None,
+                                     use_adaptive_k: bool = True,
+                                     rating_range: str = None,
+                                     update_mode: str = None) -> tuple:
     """
-    Main entry point: Compute iterative SOS for all teams with adaptive K-factor.
+    Compute iterative SOS from an already loaded, master-filtered games frame.
+    
+    Passing the ratings of a previous run as `initial_ratings` warm-starts the
+    Elo iterations (new teams start at INITIAL_RATING), which typically
+    converges in far fewer passes after a small batch of new games.
     
     Args:
-        matched_games_path: Path to Matched_Games.csv
-        k_factor: Base K-factor for Elo updates
+        games_df: DataFrame with Team A, Team B, Score A, Score B columns
+        initial_ratings: Optional dictionary of starting ratings by team
         use_adaptive_k: Whether to apply adaptive K-factor
-        convergence_tol: Convergence tolerance
-        max_iterations: Maximum iterations
+        rating_range: "exact" or "pass" (default RATING_RANGE_MODE)
+        update_mode: "sequential" or "batch" (default UPDATE_MODE)
         
     Returns:
-        Dictionary mapping team names to normalized SOS values
+        Tuple of (normalized SOS by team, final Elo ratings by team)
     """
-    print("=" * 60)
-    print("ITERATIVE SOS ENGINE (V5.3E Enhanced)")
-    print("=" * 60)
-    
-    # Update global parameters
-    global K_FACTOR, CONV_TOL, MAX_ITERS
-    K_FACTOR = k_factor
-    CONV_TOL = convergence_tol
-    MAX_ITERS = max_iterations
-    
-    # Step 1: Load and filter games
-    games_df = load_and_filter_games(matched_games_path)
-    
-    if len(games_df) == 0:
-        raise ValueError("No master team games found in dataset")
-    
     # Step 2: Get unique teams and initialize ratings
     teams = pd.unique(games_df[["Team A", "Team B"]].values.ravel("K"))
     teams = [t for t in teams if pd.notna(t)]  # Remove any NaN values
@@ -365,10 +539,15 @@ def compute_iterative_sos_adaptive(matched_games_path: str,
     print(f"Found {len(teams)} unique teams")
     
     ratings = initialize_ratings(teams)
+    if initial_ratings:
+        warm = sum(team in initial_ratings for team in teams)
+        ratings.update({team: initial_ratings[team] for team in teams if team in initial_ratings})
+        print(f"Warm-started {warm} of {len(teams)} teams from previous ratings")
     
     # Step 3: Run iterative Elo updates with adaptive K
     final_ratings, convergence_info = run_elo_iterations_adaptive(
-        games_df, ratings, use_adaptive_k=use_adaptive_k
+        games_df, ratings, use_adaptive_k=use_adaptive_k, rating_range=rating_range,
+        update_mode=update_mode
     )
     
     # Step 4: Compute opponent strengths
@@ -389,6 +568,53 @@ def compute_iterative_sos_adaptive(matched_games_path: str,
     print(f"Final mean Delta rating: {convergence_info['mean_deltas'][-1]:.2f}")
     print(f"SOS range: {min(sos_normalized.values()):.3f} - {max(sos_normalized.values()):.3f}")
     
+    return sos_normalized, final_ratings
+
+
+def compute_iterative_sos_adaptive(matched_games_path: str, 
+                                  k_factor: float = 24.0,
+                                  use_adaptive_k: bool = True,
+                                  convergence_tol: float = 1.0,
+                                  max_iterations: int = 30,
+                                  as_of=None,
+                                  rating_range: str = None,
+                                  update_mode: str = None) -> dict:
+    """
+    Main entry point: Compute iterative SOS for all teams with adaptive K-factor.
+    
+    Args:
+        matched_games_path: Path to Matched_Games.csv
+        k_factor: Base K-factor for Elo updates
+        use_adaptive_k: Whether to apply adaptive K-factor
+        convergence_tol: Convergence tolerance
+        max_iterations: Maximum iterations
+        as_of: Optional date; only games played on or before it are used
+        rating_range: "exact" or "pass" (default RATING_RANGE_MODE)
+        update_mode: "sequential" or "batch" (default UPDATE_MODE)
+        
+    Returns:
+        Dictionary mapping team names to normalized SOS values
+    """
+    print("=" * 60)
+    print("ITERATIVE SOS ENGINE (V5.3E Enhanced)")
+    print("=" * 60)
+    
+    # Update global parameters
+    global K_FACTOR, CONV_TOL, MAX_ITERS
+    K_FACTOR = k_factor
+    CONV_TOL = convergence_tol
+    MAX_ITERS = max_iterations
+    
+    # Step 1: Load and filter games
+    games_df = load_and_filter_games(matched_games_path)
+    if as_of is not None:
+        games_df = games_played_by(games_df, as_of)
+    
+    if len(games_df) == 0:
+        raise ValueError("No master team games found in dataset")
+    
+    sos_normalized, _ = compute_iterative_sos_from_games(games_df, use_adaptive_k=use_adaptive_k,
+                                                         rating_range=rating_range, update_mode=update_mode)
     return sos_normalized
 
 
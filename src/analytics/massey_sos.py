@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Least-Squares (Massey) Opponent-Strength / SOS Engine
+=====================================================
+
+Alternative to the Elo engine in iterative_opponent_strength_v53_enhanced:
+one margin-of-victory least-squares fit over the whole game graph instead of
+up to MAX_ITERS sequential Elo passes.
+
+Every master-vs-master game contributes one equation
+
+    rating[Team A] - rating[Team B] = clip(Score A - Score B, ±GOAL_DIFF_CAP)
+
+The equations form a sparse games × teams incidence matrix (+1 / -1 per
+row), solved with LSQR (or CG on the normal equations, i.e. the Massey
+matrix). Without ridge regularization the ratings are only defined up to a
+constant per connected component, so each component is centered on zero
+(Massey's sum-to-zero row); RIDGE_LAMBDA > 0 shrinks ratings of teams with
+few games towards zero instead.
+
+A team's SOS is the mean rating of its opponents, normalized to 0-1 like
+the Elo engine, so `compute_massey_sos` returns the same dict[team] ->
+normalized SOS as `compute_iterative_sos_adaptive`. Select it in the ranking
+engine with SOS_ENGINE=massey.
+
+Usage:
+    from analytics.massey_sos import compute_massey_sos
+    sos_dict = compute_massey_sos("Matched_Games.csv")
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import lsqr
+
+sys.path.append(str(Path(__file__).parent.parent))
+from analytics.iterative_opponent_strength_v53_enhanced import (
+    games_played_by, load_and_filter_games, normalize_sos
+)
+from utils.sparse_solvers import conjugate_gradient
+
+# ---- Massey SOS Configuration ----
+GOAL_DIFF_CAP = 6               # Cap blowouts at 6 goals (same as the Elo engine)
+RIDGE_LAMBDA = 0.0              # Ridge penalty on ratings (0 = plain Massey)
+SOLVER = "lsqr"                 # "lsqr" (incidence matrix) or "cg" (normal equations)
+SOLVER_TOL = 1e-10              # Relative tolerance of the iterative solver
+SOLVERS = ("lsqr", "cg")
+
+
+def game_teams(games_df: pd.DataFrame, teams: list) -> tuple:
+    """Team A and Team B of every game as indices into `teams`."""
+    index = pd.Index(teams)
+    return index.get_indexer(games_df["Team A"]), index.get_indexer(games_df["Team B"])
+
+
+def incidence_matrix(games_df: pd.DataFrame, teams: list):
+    """
+    Sparse games × teams incidence matrix and capped margins.
+
+    Args:
+        games_df: DataFrame with Team A, Team B, Score A, Score B columns
+        teams: Team names in rating-vector order
+
+    Returns:
+        Tuple of (CSR matrix with +1 for Team A and -1 for Team B per game,
+        margin vector clip(Score A - Score B, ±GOAL_DIFF_CAP))
+    """
+    team_a, team_b = game_teams(games_df, teams)
+    n = len(games_df)
+    rows = np.repeat(np.arange(n), 2)
+    cols = np.column_stack([team_a, team_b]).ravel()
+    vals = np.tile([1.0, -1.0], n)
+    matrix = sparse.csr_matrix((vals, (rows, cols)), shape=(n, len(teams)))
+    margin = games_df["Score A"].to_numpy(dtype=float) - games_df["Score B"].to_numpy(dtype=float)
+    return matrix, np.clip(margin, -GOAL_DIFF_CAP, GOAL_DIFF_CAP)
+
+
+def solve_massey(matrix, margin: np.ndarray, ridge: float = None, solver: str = None,
+                 x0: np.ndarray = None) -> np.ndarray:
+    """
+    Least-squares ratings: argmin ||matrix @ r - margin||² + ridge * ||r||².
+
+    Args:
+        matrix, margin: Output of incidence_matrix
+        ridge: Ridge penalty (default RIDGE_LAMBDA)
+        solver: "lsqr" or "cg" (default SOLVER)
+        x0: Optional starting ratings (warm start)
+
+    Returns:
+        Rating vector; without ridge, centered on zero per connected component
+    """
+    ridge = RIDGE_LAMBDA if ridge is None else ridge
+    solver = SOLVER if solver is None else solver
+    if solver not in SOLVERS:
+        raise ValueError(f"solver must be one of {SOLVERS}, got {solver!r}")
+    n_teams = matrix.shape[1]
+    if solver == "lsqr":
+        ratings = lsqr(matrix, margin, damp=np.sqrt(ridge), atol=SOLVER_TOL, btol=SOLVER_TOL,
+                       iter_lim=max(1000, 10 * n_teams), x0=x0)[0]
+    else:
+        # Massey matrix (graph Laplacian of the game graph) plus ridge
+        massey = (matrix.T @ matrix + ridge * sparse.identity(n_teams)).tocsr()
+        ratings = conjugate_gradient(massey, matrix.T @ margin, SOLVER_TOL, x0=x0, maxiter=max(1000, 10 * n_teams))
+
+    if ridge == 0:
+        # Only rating differences are identified within a component
+        _, component = connected_components(matrix.T @ matrix, directed=False)
+        sums = np.bincount(component, ratings)
+        sizes = np.bincount(component)
+        ratings = ratings - (sums / sizes)[component]
+    return ratings
+
+
+def opponent_mean_ratings(team_a: np.ndarray, team_b: np.ndarray, ratings: np.ndarray) -> np.ndarray:
+    """Mean opponent rating per team (NaN for teams without games)."""
+    n_teams = len(ratings)
+    total = np.bincount(team_a, ratings[team_b], n_teams) + np.bincount(team_b, ratings[team_a], n_teams)
+    count = np.bincount(team_a, minlength=n_teams) + np.bincount(team_b, minlength=n_teams)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return total / count
+
+
+def compute_massey_sos_from_games(games_df: pd.DataFrame, initial_ratings: dict = None,
+                                  ridge: float = None, solver: str = None) -> tuple:
+    """
+    Massey SOS from an already loaded, master-filtered games frame.
+
+    Args:
+        games_df: DataFrame with Team A, Team B, Score A, Score B columns
+        initial_ratings: Optional ratings of a previous run (solver warm start)
+        ridge: Ridge penalty (default RIDGE_LAMBDA)
+        solver: "lsqr" or "cg" (default SOLVER)
+
+    Returns:
+        Tuple of (normalized SOS by team, Massey ratings by team in goals)
+    """
+    teams = pd.unique(games_df[["Team A", "Team B"]].values.ravel("K"))
+    teams = [t for t in teams if pd.notna(t)]
+    print(f"Found {len(teams)} unique teams")
+
+    matrix, margin = incidence_matrix(games_df, teams)
+    x0 = None
+    if initial_ratings:
+        x0 = np.array([initial_ratings.get(t, 0.0) for t in teams], dtype=float)
+    ratings = solve_massey(matrix, margin, ridge, solver, x0)
+
+    opp_strength = dict(zip(teams, opponent_mean_ratings(*game_teams(games_df, teams), ratings).tolist()))
+    sos_normalized = normalize_sos(opp_strength)
+
+    print("\n" + "=" * 60)
+    print("MASSEY SOS SUMMARY")
+    print("=" * 60)
+    print(f"Teams processed: {len(teams)}")
+    print(f"Games processed: {len(games_df)}")
+    print(f"Solver: {SOLVER if solver is None else solver}, ridge: {RIDGE_LAMBDA if ridge is None else ridge}")
+    print(f"Rating range: {ratings.min():.2f} - {ratings.max():.2f} goals")
+    return sos_normalized, dict(zip(teams, ratings.tolist()))
+
+
+def compute_massey_sos(matched_games_path: str, as_of=None) -> dict:
+    """
+    Main entry point: Massey SOS for all master teams.
+
+    Args:
+        matched_games_path: Path to Matched_Games.csv
+        as_of: Optional date; only games played on or before it are used
+
+    Returns:
+        Dictionary mapping team names to normalized SOS values
+    """
+    print("=" * 60)
+    print("MASSEY SOS ENGINE (least squares)")
+    print("=" * 60)
+
+    games_df = load_and_filter_games(matched_games_path)
+    if as_of is not None:
+        games_df = games_played_by(games_df, as_of)
+    if len(games_df) == 0:
+        raise ValueError("No master team games found in dataset")
+
+    sos_normalized, _ = compute_massey_sos_from_games(games_df)
+    return sos_normalized
@@ -1,5 +1,6 @@
 # app.py
 import os
+import sys
 import time
 import json
 import urllib.parse
@@ -12,6 +13,9 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.columnar_io import resolve_table_path
+
 # Note: Prediction module removed as part of cleanup
 
 # ---- Config ----
@@ -206,20 +210,22 @@ def find_history_path(state: Optional[str], gender: Optional[str], year: Optiona
     # For team history details, prefer comprehensive history (shows ALL games from last 18 months)
     # The comprehensive file has all games, but basic data only
     
-    # Try comprehensive history first (shows ALL games from last 18 months)
-    comprehensive_path = Path("Team_Game_Histories_COMPREHENSIVE.csv")
+    # Try comprehensive history first (shows ALL games from last 18 months);
+    # the pipeline writes it as typed Parquet, the CSV is an optional export.
+    # resolve_table_path picks whichever of the two the engine reads (newer wins)
+    comprehensive_path = resolve_table_path(Path("Team_Game_Histories_COMPREHENSIVE.csv"))
     if comprehensive_path.exists():
         return comprehensive_path
     
     # Fallback to enriched history files (has calculations but fewer games)
     sfx = slice_suffix(state, gender, year)
     enriched_candidates = [
-        DATA_DIR / f"Team_Game_Histories{sfx}.parquet",
         DATA_DIR / f"Team_Game_Histories{sfx}.csv",
         Path("Team_Game_Histories.csv"),  # Global enriched file
     ]
     
-    for p in enriched_candidates:
+    for csv_path in enriched_candidates:
+        p = resolve_table_path(csv_path)
         if p.exists():
             return p
     
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Daily Rank Time Series (V5.3E)
+==============================
+
+Materializes every team's rank and PowerScore for every day of a season
+(trend charts, the "what changed today" panel) without one full ranking run
+per day.
+
+A sliding-window evaluator walks the days in order over the per-team sorted
+games of a RankingSnapshotStore. Each team's ranking window is a contiguous
+slice of its sorted games, found by binary search; from one day to the next
+only teams whose slice gained or lost games are recomputed:
+
+1. Off_raw/Def_raw for the teams whose window changed
+2. Strength-adjusted metrics for those teams plus every team whose gathered
+   opponent strengths changed (same rule as incremental_ranking.py)
+3. Baseline SOS, iterative SOS and GamesTotal only on days whose history or
+   Elo games gained rows
+4. The league-wide normalization and ranking (finalize_rankings), every day
+
+Each day equals `RankingSnapshotStore.rankings_as_of(day)` (and so
+`ranking_engine.py --as-of day`). The visible ranks are written as one long,
+compact Parquet table: Date, Team, Rank, PowerScore_adj, GamesPlayed, Status,
+plus RankChange/PowerScoreChange against the previous day.
+
+Usage:
+    python src/core/daily_rank_series.py --in Matched_Games.csv --start 2025-01-01 --end 2025-06-30 \\
+        --out data/output/Daily_Ranks_v53_enhanced.parquet
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from core import ranking_engine as engine
+from core.incremental_ranking import strength_dependents
+from core.ranking_snapshots import RankingSnapshotStore, empty_rankings
+from utils.columnar_io import write_table
+
+SERIES_PATH = "data/output/Daily_Ranks_v53_enhanced.parquet"
+SERIES_COLUMNS = ["Date", "Team", "Rank", "PowerScore_adj", "GamesPlayed", "Status",
+                  "RankChange", "PowerScoreChange"]
+_DAY = np.timedelta64(1, "D")
+
+
+def _played_count(dates, today) -> int:
+    """Number of `dates` on or before `today` (the whole day counts)."""
+    return int(np.count_nonzero(dates < np.datetime64(today + pd.Timedelta(days=1))))
+
+
+class DailyRankSeries:
+    """Rankings advanced day by day, recomputing only teams whose window changed."""
+
+    def __init__(self, store: RankingSnapshotStore):
+        self.store = store
+        self.codes = store.codes
+        self.team_id = store.long["team_id"].to_numpy()
+        self.opp_id = store.long["opp_id"].to_numpy()
+        self.file_pos = store.long["file_pos"].to_numpy()
+        self.positions = np.arange(len(store.long))
+
+        # (team, day) search keys: the rows are per-team contiguous and date
+        # ascending, so a team's window is the slice [lo, hi) between two keys
+        days = store.dates.astype("datetime64[D]")
+        self._first_day = days.min() if len(days) else np.datetime64("1970-01-01")
+        self._keys = (self.team_id.astype(np.int64) << 32) + (days - self._first_day).astype(np.int64)
+        self._teams = np.arange(len(self.codes), dtype=np.int64)
+        self.lo = np.zeros(len(self.codes), dtype=np.int64)
+        self.hi = np.zeros(len(self.codes), dtype=np.int64)
+
+        # Per-team state for the current day
+        self.base = None
+        self.sa_metrics = None
+        self.first_pos = np.full(len(self.codes), np.iinfo(np.int64).max)
+
+        # League-wide inputs, refreshed only when their games change
+        self._sos = (None, None)
+        self._elo = (None, None)
+        self._games_total = (None, None)
+        self._elo_dates = (pd.to_datetime(store.elo_games["Date"], errors="coerce").to_numpy()
+                           if store.elo_games is not None else None)
+        self.today = None
+        self.last_update = {}
+
+    def _bounds(self, day) -> np.ndarray:
+        """Search key of `day` for every team (days outside the data are clamped)."""
+        offset = np.clip((np.datetime64(day, "D") - self._first_day) // _DAY, 0, 2**32 - 1)
+        return (self._teams << 32) + offset
+
+    def _window_slices(self, today):
+        cutoff = today - pd.Timedelta(days=engine.WINDOW_DAYS)
+        lo = np.searchsorted(self._keys, self._bounds(cutoff), side="left")
+        hi = np.searchsorted(self._keys, self._bounds(today + pd.Timedelta(days=1)), side="left")
+        return lo, hi
+
+    def _rows(self, team_mask, lo, hi) -> np.ndarray:
+        """Row mask of the window slices of the teams in `team_mask`."""
+        pos, team = self.positions, self.team_id
+        return team_mask[team] & (pos >= lo[team]) & (pos < hi[team])
+
+    def advance(self, as_of) -> pd.DataFrame:
+        """
+        Move the window to `as_of` and re-rank.
+
+        Returns:
+            All ranked teams as of `as_of`, as finalize_rankings
+        """
+        today = engine.as_of_date(as_of)
+        long = self.store.long
+        lo, hi = self._window_slices(today)
+        changed = (lo != self.lo) | (hi != self.hi)
+        affected = np.flatnonzero(changed)
+        ranked = hi > lo
+        if not ranked.any():
+            # No team has a game in the window (e.g. a season series that starts
+            # before the first game): nothing to rank, and the next ranked day
+            # starts from scratch
+            self.base = self.sa_metrics = None
+            self.first_pos[affected] = np.iinfo(np.int64).max
+            self.lo, self.hi, self.today = lo, hi, today
+            self.last_update = {"window_changed_teams": 0, "sa_recomputed_teams": 0, "ranked_teams": 0}
+            return empty_rankings()
+
+        # Off_raw/Def_raw and first appearance: only teams whose slice moved
+        rows = self._rows(changed, lo, hi)
+        old_base = self.base
+        affected_names = self.codes.decode(affected)
+        parts = [] if old_base is None else [old_base.drop(index=affected_names, errors="ignore")]
+        if rows.any():
+            parts.append(engine.compute_off_def_raw(long[rows], self.codes))
+        base = pd.concat(parts)
+        self.first_pos[affected] = np.iinfo(np.int64).max
+        np.minimum.at(self.first_pos, self.team_id[rows], self.file_pos[rows])
+        # League means/scales sum in team order: keep the full build's
+        # first-appearance order, as RankingSnapshotStore.rankings_as_of does
+        order_ids = np.flatnonzero(ranked)
+        order_ids = order_ids[np.argsort(self.first_pos[order_ids], kind="mergesort")]
+        order = self.codes.decode(order_ids)
+        self.base = base.loc[order]
+
+        # Strength-adjusted metrics: moved teams plus their changed neighbourhood
+        window = self._rows(ranked, lo, hi)
+        team_id, opp_id = self.team_id[window], self.opp_id[window]
+        sa_teams = strength_dependents(self.base if old_base is None else old_base, self.base,
+                                       self.codes, team_id, opp_id, affected)
+        refresh = np.zeros(len(self.codes), dtype=bool)
+        refresh[sa_teams] = True
+        sa_rows = window & refresh[self.team_id]
+        parts = [] if self.sa_metrics is None else [
+            self.sa_metrics.drop(index=self.codes.decode(sa_teams), errors="ignore")
+        ]
+        if sa_rows.any():
+            parts.append(engine.compute_strength_adjusted_metrics(long[sa_rows], self.base, self.codes))
+        self.sa_metrics = pd.concat(parts).loc[order]
+        self.lo, self.hi, self.today = lo, hi, today
+
+        last_game = pd.Series(self.store.dates[hi[order_ids] - 1], index=order)
+        out = engine.finalize_rankings(self.base, self.sa_metrics, self._baseline_sos(today),
+                                       self._iterative_sos(today), last_game, self._total_games(today), today)
+        self.last_update = {
+            "window_changed_teams": int(np.isin(affected, order_ids).sum()),
+            "sa_recomputed_teams": int(np.isin(sa_teams, order_ids).sum()),
+            "ranked_teams": len(order_ids),
+        }
+        return out
+
+    # ---- League-wide inputs (memoized on the number of games played by today) ----
+
+    def _baseline_sos(self, today) -> pd.Series:
+        hist = self.store.sos_hist
+        if hist is None:
+            return self.base["Off_raw"].rank(pct=True)
+        played = engine.played_by(hist["Date"], today)
+        count, sos = self._sos
+        if count != int(played.sum()) or not self.base.index.isin(sos.index).all():
+            sos, sos_stats = engine.compute_baseline_sos(hist[played], self.base.index)
+            engine.check_sos_match_rates(sos_stats, len(self.base))
+            self._sos = (int(played.sum()), sos)
+        return sos.reindex(self.base.index)
+
+    def _iterative_sos(self, today):
+        if self._elo_dates is None:
+            return None
+        count = _played_count(self._elo_dates, today)
+        if count != self._elo[0]:
+            sos_iterative = None
+            if count:
+                from analytics.iterative_opponent_strength_v53_enhanced import games_played_by
+                sos_iterative, _ = engine.compute_sos_from_games(games_played_by(self.store.elo_games, today))
+            self._elo = (count, sos_iterative)
+        return self._elo[1]
+
+    def _total_games(self, today):
+        hist = self.store.games_total_hist
+        if hist is None:
+            return None
+        played = engine.played_by(hist["Date"], today)
+        if int(played.sum()) != self._games_total[0]:
+            self._games_total = (int(played.sum()), hist[played].groupby("Team").size())
+        return self._games_total[1]
+
+    # ---- Time series ----
+
+    def run(self, start, end) -> pd.DataFrame:
+        """
+        Visible ranks for every day from `start` to `end` (inclusive), long
+        format with the columns of SERIES_COLUMNS and compact dtypes.
+        """
+        t0 = time.time()
+        frames = []
+        prev_rank = prev_score = pd.Series(dtype=float)
+        for today in daily_dates(start, end):
+            visible = engine.visible_rankings(self.advance(today))
+            teams = visible["Team"].to_numpy()
+            day = pd.DataFrame({
+                "Date": today,
+                "Team": teams,
+                "Rank": visible["Rank"].to_numpy(),
+                "PowerScore_adj": visible["PowerScore_adj"].to_numpy(),
+                "GamesPlayed": visible["GamesPlayed"].to_numpy(),
+                "Status": visible["Status"].to_numpy(),
+            })
+            # Positive RankChange = moved up since the previous day (NaN = newly visible)
+            day["RankChange"] = prev_rank.reindex(teams).to_numpy() - day["Rank"]
+            day["PowerScoreChange"] = day["PowerScore_adj"] - prev_score.reindex(teams).to_numpy()
+            prev_rank = pd.Series(day["Rank"].to_numpy(), index=teams)
+            prev_score = pd.Series(day["PowerScore_adj"].to_numpy(), index=teams)
+            frames.append(day)
+            print(f"📅 {today:%Y-%m-%d}: {len(day)} teams ranked, "
+                  f"{self.last_update['window_changed_teams']} windows changed, "
+                  f"{self.last_update['sa_recomputed_teams']} SA recomputed")
+        series = compact_series(pd.concat(frames, ignore_index=True)) if frames else None
+        print(f"⏱ {len(frames)} days ranked in {time.time() - t0:.1f}s")
+        return series
+
+
+def daily_dates(start, end):
+    """Every day between start and end (inclusive)."""
+    return list(pd.date_range(engine.as_of_date(start), engine.as_of_date(end), freq="D"))
+
+
+def compact_series(series: pd.DataFrame) -> pd.DataFrame:
+    """The time series with categorical teams/status, int32 ranks and float32 scores."""
+    return series.astype({
+        "Team": "category",
+        "Status": "category",
+        "Rank": np.int32,
+        "PowerScore_adj": np.float32,
+        "GamesPlayed": np.int16,
+        "RankChange": "Int32",
+        "PowerScoreChange": np.float32,
+    })[SERIES_COLUMNS]
+
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Daily V5.3E rank time series")
+    p.add_argument("--in", dest="in_path", required=True)
+    p.add_argument("--start", required=True, help="First day (YYYY-MM-DD)")
+    p.add_argument("--end", default=None, help="Last day (default: today)")
+    p.add_argument("--out", dest="out_path", default=SERIES_PATH)
+    p.add_argument("--cache", default="data/state/snapshot_store.pkl")
+    p.add_argument("--no-iterative-sos", action="store_true", help="Skip the Elo SOS (baseline SOS only)")
+    args = p.parse_args()
+
+    store = RankingSnapshotStore.cached(Path(args.in_path), args.cache,
+                                        iterative_sos=not args.no_iterative_sos)
+    series = DailyRankSeries(store).run(args.start, args.end)
+    if series is None:
+        p.error("--start is after --end")
+    path = write_table(series, args.out_path)
+    print(f"Wrote {len(series)} daily rank rows for {series['Date'].nunique()} days to {path}")
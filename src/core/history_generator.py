@@ -14,10 +14,14 @@ Key distinction:
 
 import pandas as pd
 import numpy as np
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 import os
 
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.columnar_io import read_table, write_table
+
 # Configuration
 HISTORY_WINDOW_DAYS = 18 * 30  # 18 months
 RANKINGS_WINDOW_DAYS = 365     # 12 months (for rankings)
@@ -40,11 +44,21 @@ def clamp_window_for_history(df: pd.DataFrame, days: int, today=None) -> pd.Data
     cutoff = today - pd.Timedelta(days=days)
     return df[df["Date"] >= cutoff].copy()
 
-def generate_comprehensive_history(wide_matches_csv: Path, out_csv: Path):
-    """Generate comprehensive game history with ALL games from last 18 months."""
-    
-    print(f"Loading games from {wide_matches_csv}...")
-    raw = pd.read_csv(wide_matches_csv, encoding="utf-8-sig")
+def generate_comprehensive_history(wide_matches_csv: Path, out_csv: Path, games_df: pd.DataFrame = None,
+                                   write_csv=None):
+    """
+    Generate comprehensive game history with ALL games from last 18 months.
+    
+    `games_df` (wide format, already in memory) is used instead of reading
+    `wide_matches_csv` when given. The history is written as Parquet next
+    to `out_csv`; `write_csv` also writes the CSV (see utils/columnar_io.py).
+    """
+    
+    if games_df is None:
+        print(f"Loading games from {wide_matches_csv}...")
+        raw = read_table(wide_matches_csv)
+    else:
+        raw = games_df
     
     print("Converting to long format...")
     long = wide_to_long(raw)
@@ -188,9 +202,9 @@ def generate_comprehensive_history(wide_matches_csv: Path, out_csv: Path):
             long_history[col] = 0.0 if col in ["expected_gd", "gd_delta", "Opponent_BaseStrength"] else "neutral"
     
     # Save comprehensive history
-    long_history[output_cols].to_csv(out_csv, index=False, encoding="utf-8")
+    written = write_table(long_history[output_cols], out_csv, write_csv=write_csv)
     
-    print(f"Saved comprehensive game history to {out_csv}")
+    print(f"Saved comprehensive game history to {written}")
     
     # Show sample statistics
     print("\nSample team statistics:")
@@ -215,7 +229,9 @@ if __name__ == "__main__":
     import argparse
     p = argparse.ArgumentParser(description="Generate comprehensive game history")
     p.add_argument("--in", dest="in_path", required=True, help="Input wide format games CSV")
-    p.add_argument("--out", dest="out_path", default="Team_Game_Histories_COMPREHENSIVE.csv", help="Output comprehensive history CSV")
+    p.add_argument("--out", dest="out_path", default="Team_Game_Histories_COMPREHENSIVE.csv",
+                   help="Output comprehensive history (written as Parquet next to this path)")
+    p.add_argument("--csv", action="store_true", help="Also write the CSV at --out")
     args = p.parse_args()
     
-    generate_comprehensive_history(Path(args.in_path), Path(args.out_path))
+    generate_comprehensive_history(Path(args.in_path), Path(args.out_path), write_csv=args.csv or None)
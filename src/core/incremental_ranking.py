@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Incremental Re-Ranking (V5.3E)
+==============================
+
+Keeps the per-team ranking state between runs so a daily batch of new games
+only recomputes the teams it touches instead of the whole league.
+
+Persisted state:
+- Windowed long-format games with int32 team codes (each team's recent-game buffer)
+- Per-team weighted sums: Off_raw/Def_raw, SAO_raw/SAD_raw and game counts
+- Baseline SOS history, Elo ratings and iterative SOS
+
+Applying a delta file:
+1. Map/filter the new games like the full build (the delta must hold only new games)
+2. Expire games that fell out of the ranking window
+3. Recompute Off_raw/Def_raw for teams that played or lost games to expiry
+4. Recompute strength-adjusted metrics for those teams plus every team whose
+   gathered opponent strengths changed (its opponent neighbourhood)
+5. Recompute baseline SOS for teams that played
+6. Warm-start the Elo iterations from the stored ratings
+7. Re-run the league-wide normalization and ranking (finalize_rankings)
+
+Baseline SOS keeps the Opponent_BaseStrength values of the last full history
+build; rebuild the state after regenerating the comprehensive history.
+
+Usage:
+    python src/core/incremental_ranking.py init --in Matched_Games.csv --out Rankings_v53_enhanced.csv
+    python src/core/incremental_ranking.py apply --delta New_Games.csv --out Rankings_v53_enhanced.csv
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from core import ranking_engine as engine
+from utils.team_codes import TeamCodes
+from utils.columnar_io import read_table
+
+STATE_PATH = "data/state/ranking_state.pkl"
+STATE_VERSION = 1
+
+def _long_with_order(wide: pd.DataFrame, first_game: int) -> pd.DataFrame:
+    """
+    wide_to_long plus `side` / `game_seq` columns.
+
+    The full build breaks same-date ties by long-frame order (all Team A rows
+    in file order, then all Team B rows), so the state is kept sorted by
+    (side, game_seq) to match a full rebuild on the concatenated games.
+    """
+    long = engine.wide_to_long(wide)
+    n = len(wide)
+    long["side"] = (long.index // n).astype(np.int8)
+    long["game_seq"] = first_game + long.index % n
+    return long
+
+
+def strength_arrays(base: pd.DataFrame, codes: TeamCodes):
+    """Team-level inputs of the SA stage as (n_codes+1, 4) array plus fallback means."""
+    off_norm, def_norm, opp_def, opp_off = engine.opponent_strength_tables(base)
+    arrays = np.column_stack([codes.scatter(s) for s in (off_norm, def_norm, opp_def, opp_off)])
+    return arrays, (opp_def.mean(), opp_off.mean())
+
+
+def strength_dependents(old_base: pd.DataFrame, new_base: pd.DataFrame, codes: TeamCodes,
+                        team_id: np.ndarray, opp_id: np.ndarray, affected: np.ndarray) -> np.ndarray:
+    """
+    Team codes whose strength-adjusted metrics must be recomputed after
+    Off_raw/Def_raw changed from `old_base` to `new_base`: the `affected`
+    teams plus every team with a game (team_id/opp_id rows) whose gathered
+    team or opponent strengths changed.
+    """
+    old_arrays, old_means = strength_arrays(old_base, codes)
+    new_arrays, new_means = strength_arrays(new_base, codes)
+    same = (old_arrays == new_arrays) | (np.isnan(old_arrays) & np.isnan(new_arrays))
+    changed = ~same.all(axis=1)
+    need = np.isin(team_id, affected) | changed[team_id] | changed[opp_id]
+    if old_means != new_means:
+        # League-mean fallback applies to opponents without a base row
+        need |= np.isnan(new_arrays[opp_id, 2])
+    return np.union1d(np.unique(team_id[need]), affected)
+
+
+def _initial_elo(games_path):
+    """Full Elo run, returning (elo_games, ratings, sos) or (None, {}, None) when unavailable."""
+    if not engine.USE_ITERATIVE_SOS:
+        return None, {}, None
+    try:
+        from analytics.iterative_opponent_strength_v53_enhanced import load_and_filter_games
+        print(f"Computing iterative SOS ({engine.SOS_ENGINE})...")
+        elo_games = load_and_filter_games(games_path)
+        sos, ratings = engine.compute_sos_from_games(elo_games)
+        return elo_games, ratings, sos
+    except Exception as e:
+        print(f"Warning: Failed to compute iterative SOS: {e}")
+        return None, {}, None
+
+
+class IncrementalRanker:
+    """Per-team ranking state that absorbs batches of new games."""
+
+    def __init__(self, long_games, codes, base, sa_metrics, sos_raw, sos_hist,
+                 elo_games, elo_ratings, sos_iterative, games_total,
+                 master_team_names, team_name_mapping, as_of, games_seen):
+        self.long = long_games
+        self.codes = codes
+        self.base = base
+        self.sa_metrics = sa_metrics
+        self.sos_raw = sos_raw
+        self.sos_hist = sos_hist
+        self.elo_games = elo_games
+        self.elo_ratings = elo_ratings
+        self.sos_iterative = sos_iterative
+        self.games_total = games_total
+        self.master_team_names = master_team_names
+        self.team_name_mapping = team_name_mapping
+        self.as_of = as_of
+        self.games_seen = games_seen
+        self.last_update = {}
+
+    @classmethod
+    def from_matches(cls, wide_matches_csv, today=None,
+                     master_csv=engine.MASTER_TEAM_LIST_PATH,
+                     sos_history_csv=engine.SOS_HISTORY_PATH,
+                     games_total_csv=engine.GAMES_TOTAL_HISTORY_PATH,
+                     elo_games_csv=engine.ITERATIVE_SOS_GAMES_PATH):
+        """
+        Full build with the same stages as build_rankings_from_wide, keeping
+        every intermediate needed for later deltas.
+        """
+        today = engine.as_of_date(today)
+        raw = read_table(wide_matches_csv)
+        master_team_names, team_name_mapping = engine.load_master_team_mapping(master_csv)
+
+        long = engine.clamp_window(_long_with_order(raw, 0), today=today)
+        long = engine.filter_to_master_teams(long, master_team_names, team_name_mapping)
+        long, codes = TeamCodes.attach(long)
+        long = long.reset_index(drop=True)
+
+        base = engine.compute_off_def_raw(long, codes)
+        sa_metrics = engine.compute_strength_adjusted_metrics(long, base, codes)
+
+        try:
+            sos_hist = engine.load_sos_history(sos_history_csv)
+            sos_raw, sos_stats = engine.compute_baseline_sos(sos_hist, base.index)
+            engine.check_sos_match_rates(sos_stats, len(base))
+        except FileNotFoundError:
+            print("Warning: Comprehensive history not found, using offensive ranking as SOS proxy")
+            sos_hist = None
+            sos_raw = base["Off_raw"].rank(pct=True)
+
+        elo_games, elo_ratings, sos_iterative = _initial_elo(elo_games_csv)
+        games_total = engine.load_games_total(games_total_csv)
+
+        return cls(long, codes, base, sa_metrics, sos_raw, sos_hist,
+                   elo_games, elo_ratings, sos_iterative, games_total,
+                   master_team_names, team_name_mapping, today, len(raw))
+
+    # ---- Persistence ----
+
+    def save(self, path=STATE_PATH):
+        """Pickle the state (as a plain dict, so it loads from any entry point)."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle({"version": STATE_VERSION, **self.__dict__}, path)
+
+    @classmethod
+    def load(cls, path=STATE_PATH):
+        state = pd.read_pickle(path)
+        if state.pop("version", None) != STATE_VERSION:
+            raise ValueError(f"Incompatible ranking state in {path}; rebuild it with `init`")
+        ranker = cls.__new__(cls)
+        ranker.__dict__.update(state)
+        return ranker
+
+    # ---- Ranking ----
+
+    def last_game(self) -> pd.Series:
+        last = self.long.groupby("team_id")["Date"].max()
+        last.index = self.codes.decode(last.index.to_numpy())
+        return last
+
+    def rankings(self, today=None) -> pd.DataFrame:
+        """All ranked teams from the current state (league-wide normalization only)."""
+        return engine.finalize_rankings(
+            self.base, self.sa_metrics, self.sos_raw, self.sos_iterative,
+            self.last_game(), self.games_total, today or self.as_of
+        )
+
+    def _history_rows(self, delta_long: pd.DataFrame) -> pd.DataFrame:
+        """New games as baseline-SOS history rows (opponent strengths from the stored history)."""
+        strength = self.sos_hist.groupby("Opponent_canon")["Opponent_BaseStrength"].mean()
+        rows = delta_long[["Team", "Date", "Opponent"]].copy()
+        rows["Team_canon"] = rows["Team"].map(engine.canonicalize_team_name, na_action="ignore")
+        opp_canon = rows["Opponent"].map(engine.canonicalize_team_name, na_action="ignore")
+        rows["Opponent_BaseStrength"] = opp_canon.map(strength)
+        # Opponents without a stored strength count as unmatched (median fallback)
+        rows["Opponent_canon"] = opp_canon.where(rows["Opponent_BaseStrength"].notna())
+        return rows
+
+    def _elo_rows(self, delta_wide: pd.DataFrame) -> pd.DataFrame:
+        """New master-vs-master games in the Elo input format (see load_and_filter_games)."""
+        mapping = self.team_name_mapping
+        rows = delta_wide.copy()
+        rows["Team A"] = rows["Team A"].map(lambda x: mapping.get(x, x))
+        rows["Team B"] = rows["Team B"].map(lambda x: mapping.get(x, x))
+        mapped = set(mapping.values())
+        return rows[rows["Team A"].isin(mapped) & rows["Team B"].isin(mapped)]
+
+    def apply_delta(self, delta_wide: pd.DataFrame, today=None) -> pd.DataFrame:
+        """
+        Absorb a batch of new games (wide format, like Matched_Games.csv).
+
+        Args:
+            delta_wide: New games with Team A, Team B, Score A, Score B, Date
+            today: Reference date for the window and activity (defaults to now)
+
+        Returns:
+            All ranked teams, as finalize_rankings
+        """
+        t0 = time.time()
+        today = engine.as_of_date(today)
+
+        delta_long = _long_with_order(delta_wide, self.games_seen)
+        self.games_seen += len(delta_wide)
+        delta_long = engine.filter_to_master_teams(delta_long, self.master_team_names, self.team_name_mapping)
+
+        # Grow the code space; stored team_id/opp_id columns stay valid
+        self.codes = self.codes.extend(pd.concat([delta_long["Team"], delta_long["Opponent"]]))
+        delta_long["team_id"] = self.codes.encode(delta_long["Team"])
+        delta_long["opp_id"] = self.codes.encode(delta_long["Opponent"])
+
+        # Append new games and expire games that left the window
+        combined = pd.concat([self.long, delta_long], ignore_index=True)
+        combined = combined.sort_values(["side", "game_seq"], kind="mergesort")
+        self.long = engine.clamp_window(combined, today=today).reset_index(drop=True)
+        expired = combined.loc[combined["Date"] < today - pd.Timedelta(days=engine.WINDOW_DAYS), "team_id"]
+        affected = np.union1d(delta_long["team_id"].to_numpy(), expired.to_numpy())
+        affected_names = self.codes.decode(affected)
+
+        # Off_raw/Def_raw: only teams whose recent-game buffer changed
+        old_base = self.base
+        rows = self.long["team_id"].isin(affected).to_numpy()
+        base_part = engine.compute_off_def_raw(self.long[rows], self.codes)
+        self.base = pd.concat([old_base.drop(index=affected_names, errors="ignore"), base_part])
+
+        # Strength-adjusted metrics: affected teams plus the teams whose
+        # gathered team/opponent strengths changed
+        team_id = self.long["team_id"].to_numpy()
+        sa_teams = strength_dependents(old_base, self.base, self.codes, team_id,
+                                       self.long["opp_id"].to_numpy(), affected)
+        sa_rows = np.isin(team_id, sa_teams)
+        sa_part = engine.compute_strength_adjusted_metrics(self.long[sa_rows], self.base, self.codes)
+        self.sa_metrics = pd.concat([
+            self.sa_metrics.drop(index=self.codes.decode(sa_teams), errors="ignore"), sa_part
+        ])
+
+        # Baseline SOS for teams that played
+        ranked_affected = pd.Index(affected_names).intersection(self.base.index)
+        if self.sos_hist is not None:
+            self.sos_hist = pd.concat([self.sos_hist, self._history_rows(delta_long)], ignore_index=True)
+            sos_part, _ = engine.compute_baseline_sos(self.sos_hist, ranked_affected)
+            self.sos_raw = pd.concat([self.sos_raw.drop(index=affected_names, errors="ignore"), sos_part])
+        else:
+            self.sos_raw = self.base["Off_raw"].rank(pct=True)
+
+        # Iterative SOS: warm-started Elo (or Massey/Colley solve) over all master games
+        if self.elo_games is not None:
+            elo_rows = self._elo_rows(delta_wide)
+            if len(elo_rows):
+                self.elo_games = pd.concat([self.elo_games, elo_rows], ignore_index=True)
+                self.sos_iterative, self.elo_ratings = engine.compute_sos_from_games(
+                    self.elo_games, initial_ratings=self.elo_ratings
+                )
+
+        if self.games_total is not None:
+            self.games_total = self.games_total.add(delta_long.groupby("Team").size(), fill_value=0).astype(int)
+
+        self.as_of = today
+        self.last_update = {
+            "new_game_rows": len(delta_long),
+            "expired_game_rows": len(expired),
+            "affected_teams": len(ranked_affected),
+            "sa_recomputed_teams": len(sa_teams),
+            "ranked_teams": len(self.base),
+        }
+        print(f"Incremental update: {self.last_update}")
+        print(f"⏱ Incremental update took: {time.time() - t0:.1f}s")
+        return self.rankings(today)
+
+
+def _write_rankings(out: pd.DataFrame, out_csv):
+    out_visible = engine.visible_rankings(out)
+    out_visible[engine.RANKINGS_COLUMNS].to_csv(out_csv, index=False, encoding="utf-8")
+    print(f"Wrote {len(out_visible)} ranked teams to {out_csv}")
+
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Incremental V5.3E re-ranking")
+    sub = p.add_subparsers(dest="command", required=True)
+    p_init = sub.add_parser("init", help="Full build that also saves the ranking state")
+    p_init.add_argument("--in", dest="in_path", required=True)
+    p_init.add_argument("--state", default=STATE_PATH)
+    p_init.add_argument("--out", dest="out_path", default="Rankings_v53_enhanced.csv")
+    p_apply = sub.add_parser("apply", help="Apply a delta file of new games to the saved state")
+    p_apply.add_argument("--delta", required=True)
+    p_apply.add_argument("--state", default=STATE_PATH)
+    p_apply.add_argument("--out", dest="out_path", default="Rankings_v53_enhanced.csv")
+    args = p.parse_args()
+
+    if args.command == "init":
+        ranker = IncrementalRanker.from_matches(Path(args.in_path))
+        out = ranker.rankings()
+    else:
+        ranker = IncrementalRanker.load(args.state)
+        out = ranker.apply_delta(pd.read_csv(args.delta, encoding="utf-8-sig"))
+    ranker.save(args.state)
+    _write_rankings(out, args.out_path)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Multi-Window Rankings (V5.3E)
+=============================
+
+Ranks the league under several window configurations (WINDOW_DAYS,
+MAX_GAMES) from one load of the data, instead of one `ranking_engine.py`
+run per published variant.
+
+The games are read, filtered to master teams and factorized once for the
+widest window, and each game is ranked once by its position from the
+team's newest game (`games_ago_by_team`). All windows end on the same day,
+so a narrower window is the newest part of every team's games: one date
+mask selects it, its games keep their ranks, and the tapered Off/Def and
+strength-adjusted sums of every window gather those ranks instead of
+sorting again. Windows with the same WINDOW_DAYS share that selection.
+Baseline SOS (computed once for every team of the widest window),
+iterative SOS and GamesTotal do not depend on the window and are shared by
+all of them.
+
+Each window's ranking equals `build_rankings_from_wide` with those settings.
+
+Usage:
+    python src/core/multi_window.py --in Matched_Games.csv \\
+        --window current=365:30 season=240:20 display=540:60 \\
+        --out-dir data/output --wide-out Rankings_multi_window.csv
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from core import ranking_engine as engine
+from utils.team_codes import TeamCodes
+from utils.columnar_io import read_table
+
+WIDE_COLUMNS = ["Rank", "PowerScore_adj", "GamesPlayed", "Status"]
+
+
+def window_config(name, window_days=None, max_games=None) -> dict:
+    """One window configuration; unspecified settings keep the engine defaults."""
+    return {
+        "name": str(name),
+        "WINDOW_DAYS": engine.WINDOW_DAYS if window_days is None else int(window_days),
+        "MAX_GAMES": engine.MAX_GAMES if max_games is None else int(max_games),
+    }
+
+
+class MultiWindowRankings:
+    """Ranking inputs loaded once for the widest window, ranked under each window."""
+
+    def __init__(self, long_games, codes, sos_raw, sos_iterative, games_total, today, window_days):
+        self.long = long_games
+        self.codes = codes
+        # Newest-first rank of every game in its team, shared by all windows
+        self.games_ago = pd.Series(
+            engine.games_ago_by_team(long_games["team_id"].to_numpy().astype(np.int64),
+                                     long_games["Date"].to_numpy()),
+            index=long_games.index,
+        )
+        self.sos_raw = sos_raw
+        self.sos_iterative = sos_iterative
+        self.games_total = games_total
+        self.today = today
+        self.window_days = window_days
+
+    @classmethod
+    def from_matches(cls, wide_matches_csv, windows, as_of=None, iterative_sos=True):
+        """Load the games once for the widest of `windows` (same inputs as build_rankings_from_wide)."""
+        t0 = time.time()
+        today = engine.as_of_date(as_of)
+        widest = max(w["WINDOW_DAYS"] for w in windows)
+        raw = read_table(wide_matches_csv)
+        master_team_names, team_name_mapping = engine.load_master_team_mapping()
+        long = engine.clamp_window(engine.wide_to_long(raw), today=today, window_days=widest)
+        long = engine.filter_to_master_teams(long, master_team_names, team_name_mapping)
+        long, codes = TeamCodes.attach(long)
+
+        # Baseline SOS of a team does not depend on the window
+        teams = pd.Index(pd.unique(long["Team"]), name="Team")
+        try:
+            comp_hist = engine.load_sos_history()
+            if as_of is not None:
+                comp_hist = comp_hist[engine.played_by(comp_hist["Date"], today)]
+            sos_raw, sos_stats = engine.compute_baseline_sos(comp_hist, teams)
+            engine.check_sos_match_rates(sos_stats, len(teams))
+        except FileNotFoundError:
+            print("Warning: Comprehensive history not found, using offensive ranking as SOS proxy")
+            sos_raw = None
+        sos_iterative = engine.compute_iterative_sos(as_of=as_of) if iterative_sos else None
+        games_total = engine.load_games_total(as_of=as_of)
+        print(f"⏱ Multi-window inputs loaded in {time.time() - t0:.1f}s")
+        return cls(long, codes, sos_raw, sos_iterative, games_total, today, widest)
+
+    def window_games(self, window_days) -> pd.DataFrame:
+        """The loaded games inside a window of `window_days` (at most the loaded window)."""
+        if window_days > self.window_days:
+            raise ValueError(f"Window of {window_days} days is wider than the loaded {self.window_days} days")
+        if window_days == self.window_days:
+            return self.long
+        cutoff = self.today - pd.Timedelta(days=window_days)
+        return self.long[self.long["Date"] >= cutoff]
+
+    def rank(self, window) -> pd.DataFrame:
+        """
+        Rankings of one window configuration on the shared inputs.
+
+        Returns:
+            All ranked teams (active and inactive), as finalize_rankings
+        """
+        return self._rank(self.window_games(window["WINDOW_DAYS"]), window["MAX_GAMES"])
+
+    def _rank(self, long, max_games) -> pd.DataFrame:
+        base = engine.compute_off_def_raw(long, self.codes, max_games=max_games, games_ago=self.games_ago)
+        games, codes = engine.strength_adjusted_games(long, base, self.codes)
+        sa = engine.aggregate_strength_adjusted(games, codes, max_games=max_games,
+                                                games_ago=self.games_ago)[engine.PERFORMANCE_K]
+        sos_raw = (self.sos_raw.reindex(base.index) if self.sos_raw is not None
+                   else base["Off_raw"].rank(pct=True))
+        last_game = long.groupby("team_id")["Date"].max()
+        last_game.index = self.codes.decode(last_game.index.to_numpy())
+        return engine.finalize_rankings(base, sa, sos_raw, self.sos_iterative, last_game,
+                                        self.games_total, self.today)
+
+    def run(self, windows) -> dict:
+        """
+        Rank every window configuration.
+
+        Returns:
+            Dict of window name -> visible rankings (RANKINGS_COLUMNS)
+        """
+        t0 = time.time()
+        names = [w["name"] for w in windows]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Window names must be unique: {names}")
+        results = {}
+        for days in sorted({w["WINDOW_DAYS"] for w in windows}, reverse=True):
+            long = self.window_games(days)  # shared by every window of this length
+            for window in (w for w in windows if w["WINDOW_DAYS"] == days):
+                out = self._rank(long, window["MAX_GAMES"])
+                results[window["name"]] = engine.visible_rankings(out)[engine.RANKINGS_COLUMNS]
+                print(f"   {window['name']}: {days} days, last {window['MAX_GAMES']} games, "
+                      f"{len(results[window['name']])} teams ranked")
+        print(f"⏱ Ranked {len(windows)} windows in {time.time() - t0:.1f}s")
+        return {name: results[name] for name in names}
+
+
+def wide_rankings(results: dict, columns=WIDE_COLUMNS) -> pd.DataFrame:
+    """
+    One row per team with `<column>_<window>` columns for every window
+    (teams missing from a window have NaN there), ordered by the first
+    window's rank.
+    """
+    wide = None
+    for name, rankings in results.items():
+        part = rankings.set_index("Team")[list(columns)].add_suffix(f"_{name}")
+        wide = part if wide is None else wide.join(part, how="outer", sort=False)
+    first = f"Rank_{next(iter(results))}"
+    return wide.sort_values(first, kind="mergesort", na_position="last").reset_index()
+
+
+def _parse_windows(items) -> list:
+    """['current=365:30', ...] -> window configs (':30' or '365' keep the other default)."""
+    windows = []
+    for item in items:
+        name, _, spec = item.partition("=")
+        days, _, games = spec.partition(":")
+        windows.append(window_config(name.strip(), days or None, games or None))
+    return windows
+
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="V5.3E rankings for several windows from one load")
+    p.add_argument("--in", dest="in_path", required=True)
+    p.add_argument("--window", nargs="+", required=True, help="NAME=WINDOW_DAYS:MAX_GAMES, e.g. current=365:30")
+    p.add_argument("--as-of", dest="as_of", default=None)
+    p.add_argument("--out-dir", default=None, help="Write Rankings_<name>.csv per window here")
+    p.add_argument("--wide-out", default=None, help="One CSV with Rank/PowerScore_adj/... columns per window")
+    p.add_argument("--no-iterative-sos", action="store_true")
+    args = p.parse_args()
+
+    windows = _parse_windows(args.window)
+    runner = MultiWindowRankings.from_matches(Path(args.in_path), windows, as_of=args.as_of,
+                                              iterative_sos=not args.no_iterative_sos)
+    results = runner.run(windows)
+    if args.out_dir:
+        Path(args.out_dir).mkdir(parents=True, exist_ok=True)
+        for name, rankings in results.items():
+            path = Path(args.out_dir) / f"Rankings_{name}.csv"
+            rankings.to_csv(path, index=False, encoding="utf-8")
+            print(f"Wrote {len(rankings)} teams to {path}")
+    if args.wide_out:
+        wide_rankings(results).to_csv(args.wide_out, index=False, encoding="utf-8")
+        print(f"Wrote {len(results)} windows side by side to {args.wide_out}")
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Batched Parameter Sweep (V5.3E)
+===============================
+
+Evaluates many ranking configurations from one load of the data, instead of
+one `ranking_engine.py` run per setting.
+
+Sweepable parameters and the first stage each one touches:
+- RECENT_SHARE   -> Off_raw/Def_raw and the strength-adjusted sums
+- PERFORMANCE_K  -> performance multiplier of the strength-adjusted sums
+- SHRINK_TAU     -> Bayesian shrinkage / normalization
+- OFF_WEIGHT, DEF_WEIGHT, SOS_WEIGHT -> PowerScore
+
+Everything upstream of a parameter is computed once and shared: games,
+team codes, baseline and iterative SOS always; the per-game SA inputs per
+RECENT_SHARE; the normalized components per (RECENT_SHARE, PERFORMANCE_K,
+SHRINK_TAU). All PERFORMANCE_K values of a RECENT_SHARE go through the
+outlier guard and tapered sums as one batch of columns, and all weight
+triples of a group are scored and ranked as one array operation.
+
+Each configuration's ranking equals `finalize_rankings` with those
+parameters.
+
+Usage:
+    python src/core/parameter_sweep.py --in Matched_Games.csv \\
+        --grid SOS_WEIGHT=0.5,0.6,0.7 PERFORMANCE_K=0.10,0.15,0.20 SHRINK_TAU=4,8 \\
+        --out Sweep_Summary.csv --rankings-out Sweep_Rankings.csv
+"""
+import itertools
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from core import ranking_engine as engine
+from utils.team_codes import TeamCodes
+from utils.columnar_io import read_table
+
+SWEEP_PARAMS = ["OFF_WEIGHT", "DEF_WEIGHT", "SOS_WEIGHT", "PERFORMANCE_K", "SHRINK_TAU", "RECENT_SHARE"]
+
+
+def default_config() -> dict:
+    """Current engine settings for every sweepable parameter."""
+    return {name: getattr(engine, name) for name in SWEEP_PARAMS}
+
+
+def parameter_grid(**values) -> list:
+    """
+    Cartesian product of parameter values; unspecified parameters keep defaults.
+
+    Example:
+        parameter_grid(SOS_WEIGHT=[0.5, 0.6], PERFORMANCE_K=[0.1, 0.15])
+    """
+    unknown = set(values) - set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    names = list(values)
+    configs = []
+    for combo in itertools.product(*(values[n] for n in names)):
+        config = default_config()
+        config.update(zip(names, combo))
+        configs.append(config)
+    return configs
+
+
+def rank_weight_batch(components: pd.DataFrame, weights: np.ndarray):
+    """
+    PowerScore, PowerScore_adj and visible rank for many weight triples at once.
+
+    Args:
+        components: finalize_rankings output (SAO_norm, SAD_norm, SOS_norm,
+            SOS_component, GP_Mult, GamesPlayed, Team, is_active)
+        weights: Array (n_configs, 3) of OFF/DEF/SOS weights
+
+    Returns:
+        Tuple of (PowerScore, PowerScore_adj, Rank) arrays shaped
+        (n_teams, n_configs); Rank is 0 for hidden (inactive) teams
+    """
+    sao = components["SAO_norm"].to_numpy(dtype=float)[:, None]
+    sad = components["SAD_norm"].to_numpy(dtype=float)[:, None]
+    sos = components["SOS_component"].to_numpy(dtype=float)[:, None]
+    # Same operation order as finalize_rankings, so results are identical
+    power = np.round(weights[:, 0] * sao + weights[:, 1] * sad + weights[:, 2] * sos, 4)
+    power_adj = np.round(power * components["GP_Mult"].to_numpy(dtype=float)[:, None], 3)
+
+    # Tie-breakers after PowerScore_adj do not depend on the weights
+    team_order = pd.factorize(components["Team"], sort=True)[0]
+    tiebreak = np.lexsort((
+        team_order,
+        -components["GamesPlayed"].to_numpy(dtype=float),
+        -components["SOS_norm"].to_numpy(dtype=float),
+        -components["SAD_norm"].to_numpy(dtype=float),
+        -components["SAO_norm"].to_numpy(dtype=float),
+    ))
+    tiebreak_rank = np.empty(len(tiebreak), dtype=np.int64)
+    tiebreak_rank[tiebreak] = np.arange(len(tiebreak))
+
+    active = components["is_active"].to_numpy(dtype=bool)
+    ranks = np.zeros(power_adj.shape, dtype=np.int64)
+    for j in range(power_adj.shape[1]):
+        order = np.lexsort((tiebreak_rank, -power_adj[:, j]))
+        order = order[active[order]]
+        ranks[order, j] = np.arange(1, len(order) + 1)
+    return power, power_adj, ranks
+
+
+class ParameterSweep:
+    """Ranking inputs loaded once, evaluated under many parameter settings."""
+
+    def __init__(self, long_games, codes, sos_raw, sos_iterative, last_game, games_total, today):
+        self.long = long_games
+        self.codes = codes
+        self.sos_raw = sos_raw
+        self.sos_iterative = sos_iterative
+        self.last_game = last_game
+        self.games_total = games_total
+        self.today = today
+
+    @classmethod
+    def from_matches(cls, wide_matches_csv, as_of=None, iterative_sos=True):
+        """Load and enrich the games once (same inputs as build_rankings_from_wide)."""
+        t0 = time.time()
+        today = engine.as_of_date(as_of)
+        raw = read_table(wide_matches_csv)
+        master_team_names, team_name_mapping = engine.load_master_team_mapping()
+        long = engine.clamp_window(engine.wide_to_long(raw), today=today)
+        long = engine.filter_to_master_teams(long, master_team_names, team_name_mapping)
+        long, codes = TeamCodes.attach(long)
+
+        # Baseline SOS and last-game dates do not depend on any swept parameter
+        teams = pd.Index(pd.unique(long["Team"]), name="Team")
+        try:
+            comp_hist = engine.load_sos_history()
+            if as_of is not None:
+                comp_hist = comp_hist[engine.played_by(comp_hist["Date"], today)]
+            sos_raw, sos_stats = engine.compute_baseline_sos(comp_hist, teams)
+            engine.check_sos_match_rates(sos_stats, len(teams))
+        except FileNotFoundError:
+            print("Warning: Comprehensive history not found, using offensive ranking as SOS proxy")
+            sos_raw = None
+        sos_iterative = engine.compute_iterative_sos(as_of=as_of) if iterative_sos else None
+
+        last_game = long.groupby("team_id")["Date"].max()
+        last_game.index = codes.decode(last_game.index.to_numpy())
+        games_total = engine.load_games_total(as_of=as_of)
+        print(f"⏱ Sweep inputs loaded in {time.time() - t0:.1f}s")
+        return cls(long, codes, sos_raw, sos_iterative, last_game, games_total, today)
+
+    def run(self, configs, reference=None):
+        """
+        Evaluate every configuration.
+
+        Args:
+            configs: List of dicts over SWEEP_PARAMS (missing keys use defaults)
+            reference: Config to compare against (default: engine defaults)
+
+        Returns:
+            Tuple of (summary, rankings):
+            - summary: one row per config_id with its parameters, ranked
+              team count, Spearman rank correlation and top-10 overlap vs
+              the reference configuration
+            - rankings: long table (config_id, Rank, Team, PowerScore_adj,
+              PowerScore) of visible teams
+        """
+        t0 = time.time()
+        table = pd.DataFrame([{**default_config(), **c} for c in configs])
+        unknown = set(table.columns) - set(SWEEP_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+        reference = {**default_config(), **(reference or {})}
+        table = pd.concat([table, pd.DataFrame([reference])], ignore_index=True)
+        table.index.name = "config_id"
+        ref_id = len(table) - 1
+
+        frames = []
+        for share, by_share in table.groupby("RECENT_SHARE", sort=False):
+            # Stages up to the performance layer: once per RECENT_SHARE
+            base = engine.compute_off_def_raw(self.long, self.codes, recent_share=share)
+            games, codes = engine.strength_adjusted_games(self.long, base, self.codes)
+            sos_raw = self.sos_raw if self.sos_raw is not None else base["Off_raw"].rank(pct=True)
+            # All PERFORMANCE_K values in one batch of columns
+            sa_by_k = engine.aggregate_strength_adjusted(
+                games, codes, by_share["PERFORMANCE_K"].unique(), recent_share=share
+            )
+            for (k, tau), group in by_share.groupby(["PERFORMANCE_K", "SHRINK_TAU"], sort=False):
+                components = engine.finalize_rankings(
+                    base, sa_by_k[k], sos_raw, self.sos_iterative,
+                    self.last_game, self.games_total, self.today, shrink_tau=tau,
+                )
+                weights = group[["OFF_WEIGHT", "DEF_WEIGHT", "SOS_WEIGHT"]].to_numpy(dtype=float)
+                power, power_adj, ranks = rank_weight_batch(components, weights)
+                for j, config_id in enumerate(group.index):
+                    visible = ranks[:, j] > 0
+                    frames.append(pd.DataFrame({
+                        "config_id": config_id,
+                        "Rank": ranks[visible, j],
+                        "Team": components["Team"].to_numpy()[visible],
+                        "PowerScore_adj": power_adj[visible, j],
+                        "PowerScore": power[visible, j],
+                    }))
+
+        rankings = pd.concat(frames, ignore_index=True).sort_values(["config_id", "Rank"], kind="mergesort")
+        summary = self._summarize(table, rankings, ref_id)
+        rankings = rankings[rankings["config_id"] != ref_id].reset_index(drop=True)
+        print(f"⏱ Evaluated {len(summary)} configurations in {time.time() - t0:.1f}s")
+        return summary, rankings
+
+    @staticmethod
+    def _summarize(table, rankings, ref_id):
+        """Rank agreement of each configuration with the reference one."""
+        ref = rankings[rankings["config_id"] == ref_id].set_index("Team")["Rank"]
+        ref_top10 = set(ref[ref <= 10].index)
+        rows = []
+        for config_id, r in rankings.groupby("config_id", sort=True):
+            if config_id == ref_id:
+                continue
+            r = r.set_index("Team")["Rank"]
+            common = r.index.intersection(ref.index)
+            rho = np.corrcoef(r[common].rank(), ref[common].rank())[0, 1] if len(common) > 1 else np.nan
+            rows.append({
+                "config_id": config_id,
+                "teams_ranked": len(r),
+                "spearman_vs_reference": rho,
+                "top10_overlap": len(set(r[r <= 10].index) & ref_top10),
+            })
+        return table.drop(index=ref_id).join(pd.DataFrame(rows).set_index("config_id"))
+
+
+def _parse_grid(items) -> dict:
+    """['SOS_WEIGHT=0.5,0.6', ...] -> {'SOS_WEIGHT': [0.5, 0.6], ...}"""
+    grid = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        grid[name.strip().upper()] = [float(v) for v in values.split(",") if v.strip()]
+    return grid
+
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Batched V5.3E parameter sweep")
+    p.add_argument("--in", dest="in_path", required=True)
+    p.add_argument("--grid", nargs="+", required=True, help="NAME=v1,v2,... for any of " + ", ".join(SWEEP_PARAMS))
+    p.add_argument("--as-of", dest="as_of", default=None)
+    p.add_argument("--out", dest="out_path", default="Sweep_Summary.csv")
+    p.add_argument("--rankings-out", default=None, help="Per-config rankings (long format)")
+    p.add_argument("--no-iterative-sos", action="store_true")
+    args = p.parse_args()
+
+    sweep = ParameterSweep.from_matches(Path(args.in_path), as_of=args.as_of,
+                                        iterative_sos=not args.no_iterative_sos)
+    summary, rankings = sweep.run(parameter_grid(**_parse_grid(args.grid)))
+    summary.to_csv(args.out_path, encoding="utf-8")
+    print(f"Wrote {len(summary)} configurations to {args.out_path}")
+    if args.rankings_out:
+        rankings.to_csv(args.rankings_out, index=False, encoding="utf-8")
+        print(f"Wrote per-config rankings to {args.rankings_out}")
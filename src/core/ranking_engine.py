@@ -36,9 +36,15 @@ Ranking Flow:
 import pandas as pd
 import numpy as np
 import os
-import time
+from functools import lru_cache
 from pathlib import Path
 from utils.team_normalizer import canonicalize_team_name, robust_minmax
+from utils.team_codes import TeamCodes
+from utils.stage_cache import StageCache, file_digest
+from utils.columnar_io import read_table, iter_table, resolve_table_path
+from utils.connectivity import connectivity_frame
+from utils.compact_frames import compact_scores, remap_categories, take_rows, frame_mb, memory_saved_mb
+from utils.stage_profiler import StageProfiler, profile_path_for
 
 # Phase 4: Performance Optimization Imports
 try:
@@ -47,12 +53,6 @@ try:
 except ImportError:
     DUCKDB_AVAILABLE = False
 
-try:
-    from joblib import Parallel, delayed
-    JOBLIB_AVAILABLE = True
-except ImportError:
-    JOBLIB_AVAILABLE = False
-
 # ---- Config ----
 MAX_GAMES = int(os.getenv("MAX_GAMES_FOR_RANK", "30"))
 WINDOW_DAYS = int(os.getenv("WINDOW_DAYS", "365"))
@@ -88,11 +88,42 @@ ADAPTIVE_K_BETA = 0.6          # sample size exponent
 # ---- Outlier Guard Parameters ----
 OUTLIER_GUARD_ENABLED = True
 OUTLIER_GUARD_ZSCORE = 2.5     # z-score threshold for clipping
+# Grouped mean/std clip in one pass; set false to run the per-team mask loop
+OUTLIER_GUARD_GROUPED = os.getenv("OUTLIER_GUARD_GROUPED", "true").lower() == "true"
+
+# ---- Game Ingest ----
+# Date layouts of the games files, tried in order (the scraper writes the first)
+GAME_DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S")
+WIDE_GAME_COLUMNS = ["Team A", "Team B", "Score A", "Score B", "Date"]
+# Games files at least this large are read in chunks, keeping only ranking-window rows
+STREAM_INGEST_MIN_MB = float(os.getenv("STREAM_INGEST_MIN_MB", "256"))
+INGEST_CHUNK_ROWS = int(os.getenv("INGEST_CHUNK_ROWS", "250000"))
+# For those files, Off_raw/Def_raw come from a DuckDB scan of the file itself
+# (compute_off_def_raw_from_file) instead of the pandas long frame
+DUCKDB_FILE_SCAN = os.getenv("DUCKDB_FILE_SCAN", "true").lower() == "true"
+
+# ---- Low-Memory Mode ----
+# Categorical teams, int8/int16 scores, float32 per-game intermediates and
+# no full-frame copies between stages (see utils/compact_frames.py)
+LOW_MEMORY_MODE = os.getenv("LOW_MEMORY_MODE", "false").lower() == "true"
 
 # V5.2b parameters (keep existing logic)
 
 # ---- Iterative SOS Configuration ----
 USE_ITERATIVE_SOS = True
+# Engine behind SOS_iterative: "elo" (iterative_opponent_strength_v53_enhanced),
+# "massey" (least-squares margins, analytics/massey_sos.py) or "colley"
+# (wins/losses/ties only, analytics/colley_sos.py)
+SOS_ENGINE = os.getenv("SOS_ENGINE", "elo").lower()
+SOS_ENGINES = ("elo", "massey", "colley")
+# Elo rating range for the adaptive K-factor: "exact" (live min/max before
+# every game) or "pass" (min/max snapshot per iteration, faster on 100k+ teams)
+ELO_RATING_RANGE = os.getenv("ELO_RATING_RANGE", "exact").lower()
+ELO_RATING_RANGES = ("exact", "pass")
+# Elo updates: "sequential" (game by game, row order matters) or "batch"
+# (simultaneous vectorized iterations, independent of row order)
+ELO_UPDATE_MODE = os.getenv("ELO_UPDATE_MODE", "sequential").lower()
+ELO_UPDATE_MODES = ("sequential", "batch")
 PERFORMANCE_K_V52B = 0.10          # reduced from 0.20
 RIDGE_GA = 0.25               # stabilize defensive inverse
 SHRINK_TAU = 8                # Bayesian shrinkage strength
@@ -119,6 +150,9 @@ def adaptive_multiplier(team_strength, opp_strength, games_used,
     """
     Shrink single-game impact when opponent is much weaker or GP is small.
     
+    Accepts scalars or NumPy arrays (broadcast elementwise), so a whole
+    long-format frame can be scored in one call.
+    
     Args:
         team_strength: Team's current normalized strength (0-1)
         opp_strength: Opponent's normalized strength (0-1)
@@ -129,14 +163,19 @@ def adaptive_multiplier(team_strength, opp_strength, games_used,
         beta: Sample size exponent
     
     Returns:
-        Adjusted K-factor multiplier (0-1)
+        Adjusted K-factor multiplier (0-1), scalar or array
     """
+    team_strength = np.asarray(team_strength, dtype=float)
+    opp_strength = np.asarray(opp_strength, dtype=float)
+    games_used = np.asarray(games_used, dtype=float)
+    
     # Opponent gap: if much stronger, shrink impact
-    gap = max(0.0, team_strength - opp_strength)
+    # (fmax/fmin ignore NaN like the builtin max/min did)
+    gap = np.fmax(0.0, team_strength - opp_strength)
     opp_factor = 1.0 / (1.0 + gap**alpha)
     
     # Sample penalty: if < min_games, shrink impact
-    sample_factor = min(1.0, (games_used / min_games)**beta)
+    sample_factor = np.fmin(1.0, (games_used / min_games)**beta)
     
     return k_base * opp_factor * sample_factor
 
@@ -156,6 +195,33 @@ def clip_to_zscore(series, z=2.5):
     lo, hi = mu - z*sd, mu + z*sd
     return series.clip(lower=lo, upper=hi)
 
+def clip_to_zscore_grouped(df: pd.DataFrame, cols: list, by: str = "Team", z=2.5) -> pd.DataFrame:
+    """
+    Apply `clip_to_zscore` within each `by` group, for all groups at once.
+    
+    Uses grouped mean/std transforms so the cost is O(rows) instead of one
+    boolean mask per team. Groups with fewer than 2 rows are left untouched,
+    matching the per-team guard.
+    
+    Args:
+        df: DataFrame of per-game contributions (modified in place)
+        cols: Columns to clip
+        by: Grouping column
+        z: Z-score threshold for clipping
+    
+    Returns:
+        The same DataFrame with clipped columns
+    """
+    grouped = df.groupby(by, sort=False)
+    n = grouped[by].transform("size")
+    for col in cols:
+        mu = grouped[col].transform("mean")
+        sd = grouped[col].transform("std")
+        sd = sd.mask(sd == 0, 1.0)
+        clipped = df[col].clip(lower=mu - z*sd, upper=mu + z*sd)
+        df[col] = clipped.where(n > 1, df[col])
+    return df
+
 def segment_weights(n: int, recent_k: int = 10, recent_share: float = 0.70):
     """Base 70/30 two-segment weights (no taper), length=n, sum=1.0."""
     if n <= 0:
@@ -213,6 +279,48 @@ def tapered_weights(n: int,
         w = np.ones(n, dtype=float) / n
     return w
 
+@lru_cache(maxsize=32)
+def tapered_weight_table(max_n: int,
+                         recent_k: int = 10,
+                         recent_share: float = 0.70,
+                         full_weight_games: int = 25,
+                         dampen_start: int = 25,
+                         dampen_factor: float = 0.8,
+                         enabled: bool = True) -> np.ndarray:
+    """
+    Precompute `tapered_weights(n)` for every n in 0..max_n.
+
+    Row n holds the n weights (oldest game first) left-aligned and zero-padded,
+    so a game's weight is `table[n_games, position]`. The table is read-only
+    because it is shared through the cache.
+    """
+    table = np.zeros((max_n + 1, max(max_n, 1)), dtype=float)
+    for n in range(1, max_n + 1):
+        table[n, :n] = tapered_weights(
+            n,
+            recent_k=recent_k,
+            recent_share=recent_share,
+            full_weight_games=full_weight_games,
+            dampen_start=dampen_start,
+            dampen_end=max_n,
+            dampen_factor=dampen_factor,
+            enabled=enabled,
+        )
+    table.setflags(write=False)
+    return table
+
+def recent_weight_table(recent_share: float = None, max_games: int = None) -> np.ndarray:
+    """`tapered_weight_table` for the configured window (RECENT_SHARE / MAX_GAMES unless overridden)."""
+    return tapered_weight_table(
+        MAX_GAMES if max_games is None else int(max_games),
+        recent_k=RECENT_K,
+        recent_share=RECENT_SHARE if recent_share is None else float(recent_share),
+        full_weight_games=FULL_WEIGHT_GAMES,
+        dampen_start=DAMPEN_START,
+        dampen_factor=DAMPEN_FACTOR,
+        enabled=TAPER_ENABLED,
+    )
+
 def minmax_norm(s: pd.Series) -> pd.Series:
     """Min-max normalize to [0,1] range."""
     s_min, s_max = s.min(), s.max()
@@ -237,23 +345,116 @@ def robust_scale(series):
 
 def wide_to_long(games_df: pd.DataFrame) -> pd.DataFrame:
     # Expect columns: Team A, Team B, Score A, Score B, Date
+    if LOW_MEMORY_MODE:
+        return _wide_to_long_compact(games_df)
     a = games_df[["Team A","Team B","Score A","Score B","Date"]].rename(
         columns={"Team A":"Team","Team B":"Opponent","Score A":"GF","Score B":"GA"})
     b = games_df[["Team B","Team A","Score B","Score A","Date"]].rename(
         columns={"Team B":"Team","Team A":"Opponent","Score B":"GF","Score A":"GA"})
     long = pd.concat([a,b], ignore_index=True)
     long = long.dropna(subset=["Team","Opponent"])
-    long["Date"] = pd.to_datetime(long["Date"], errors="coerce")
+    long["Date"] = parse_game_dates(long["Date"])
     return long
 
-def clamp_window(df: pd.DataFrame, today=None) -> pd.DataFrame:
-    today = today or pd.Timestamp.now().normalize()
+def _wide_to_long_compact(games_df: pd.DataFrame) -> pd.DataFrame:
+    """`wide_to_long` with categorical Team/Opponent over one shared name list and int8/int16 scores."""
+    team_a, team_b, codes = TeamCodes.factorize_pair(games_df["Team A"], games_df["Team B"])
+    keep = (team_a >= 0) & (team_b >= 0)
+    team_a, team_b = team_a[keep], team_b[keep]
+    score_a, score_b = games_df["Score A"].to_numpy()[keep], games_df["Score B"].to_numpy()[keep]
+    dates = parse_game_dates(games_df["Date"]).to_numpy()[keep]
+    return pd.DataFrame({
+        "Team": codes.categorical(np.concatenate([team_a, team_b])),
+        "Opponent": codes.categorical(np.concatenate([team_b, team_a])),
+        "GF": compact_scores(np.concatenate([score_a, score_b])),
+        "GA": compact_scores(np.concatenate([score_b, score_a])),
+        "Date": np.concatenate([dates, dates]),
+    })
+
+def parse_game_dates(values: pd.Series) -> pd.Series:
+    """
+    Game dates parsed with the known GAME_DATE_FORMATS (no per-row format
+    inference); values in none of them become NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    dates = None
+    for fmt in GAME_DATE_FORMATS:
+        if dates is None or dates.isna().all():
+            # Parse in full until one format matches, so the result takes its unit
+            dates = pd.to_datetime(values, format=fmt, errors="coerce")
+            continue
+        missing = dates.isna() & values.notna()
+        if not missing.any():
+            break
+        dates[missing] = pd.to_datetime(values[missing], format=fmt, errors="coerce")
+    return dates
+
+def as_of_date(as_of=None) -> pd.Timestamp:
+    """Reference day for ranking windows and activity cutoffs (default: today)."""
+    return pd.Timestamp.now().normalize() if as_of is None else pd.Timestamp(as_of).normalize()
+
+def played_by(dates: pd.Series, today) -> pd.Series:
+    """True for games played on or before `today` (the whole day counts)."""
+    return dates < as_of_date(today) + pd.Timedelta(days=1)
+
+def clamp_window(df: pd.DataFrame, today=None, window_days: int = None) -> pd.DataFrame:
+    """Games inside the WINDOW_DAYS (or `window_days`) ranking window ending on `today`."""
+    today = as_of_date(today)
+    cutoff = today - pd.Timedelta(days=WINDOW_DAYS if window_days is None else window_days)
+    return take_rows(df, (df["Date"] >= cutoff) & played_by(df["Date"], today))
+
+def stream_window_games(wide_matches_csv, master_team_names: set, today=None,
+                        chunk_rows: int = None) -> tuple:
+    """
+    Read a wide games file in chunks, keeping only the games that can affect
+    the rankings: inside the WINDOW_DAYS window ending on `today`, with a
+    master team on at least one side.
+    
+    Memory tracks the window rather than the whole archive. Kept games stay
+    in file order, so the long frame built from them matches the one built
+    from the full file.
+    
+    Returns:
+        Tuple of (wide games with WIDE_GAME_COLUMNS and parsed dates, rows scanned)
+    """
+    today = as_of_date(today)
     cutoff = today - pd.Timedelta(days=WINDOW_DAYS)
-    return df[df["Date"] >= cutoff].copy()
+    kept, scanned = [], 0
+    for chunk in iter_table(wide_matches_csv, columns=WIDE_GAME_COLUMNS, chunk_rows=chunk_rows or INGEST_CHUNK_ROWS):
+        scanned += len(chunk)
+        dates = parse_game_dates(chunk["Date"])
+        in_window = (dates >= cutoff) & played_by(dates, today)
+        has_master = chunk["Team A"].isin(master_team_names) | chunk["Team B"].isin(master_team_names)
+        chunk = chunk[in_window & has_master]
+        kept.append(chunk.assign(Date=dates[chunk.index]))
+    games = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame(columns=WIDE_GAME_COLUMNS)
+    return games, scanned
+
+def stream_opponent_edges(wide_matches_csv, chunk_rows: int = None) -> tuple:
+    """
+    Distinct Team A / Team B pairings of a whole games file, read in chunks.
+    
+    The connectivity report covers the full archive, not just the ranking
+    window; aggregating each chunk into pairings keeps memory at the number
+    of distinct pairings. Pairings stay in first-appearance order, so the
+    team codes (and component numbering) match a full read.
+    
+    Returns:
+        Tuple of (DataFrame with Team A, Team B, Games, rows scanned)
+    """
+    pairs, scanned = [], 0
+    for chunk in iter_table(wide_matches_csv, columns=["Team A", "Team B"], chunk_rows=chunk_rows or INGEST_CHUNK_ROWS):
+        scanned += len(chunk)
+        pairs.append(chunk.groupby(["Team A", "Team B"], sort=False, dropna=False).size())
+    if not pairs:
+        return pd.DataFrame(columns=["Team A", "Team B", "Games"]), scanned
+    edges = pd.concat(pairs).groupby(level=[0, 1], sort=False, dropna=False).sum()
+    return edges.rename("Games").reset_index(), scanned
 
 def _team_recent_series(team_games: pd.DataFrame):
-    """Get team's recent games with tapered weights."""
-    g = team_games.sort_values("Date").tail(MAX_GAMES)
+    """Get team's recent games with tapered weights (same-day games in row order)."""
+    g = team_games.sort_values("Date", kind="mergesort").tail(MAX_GAMES)
     n = len(g)
     if n == 0:
         return np.array([]), np.array([]), np.array([])
@@ -279,55 +480,271 @@ def _team_recent_series(team_games: pd.DataFrame):
     
     return g["GF"].to_numpy(), g["GA"].to_numpy(), w
 
-def compute_off_def_raw(long_games: pd.DataFrame) -> pd.DataFrame:
+def games_ago_by_team(team_codes: np.ndarray, dates: np.ndarray) -> np.ndarray:
+    """
+    Each game row's position from its team's newest game (0 = most recent).
+
+    One stable sort by (team, date): same-day games keep their row order, so
+    the later row counts as the more recent game. `team_codes` are
+    non-negative integer codes; the result is aligned with the input rows.
+    """
+    order = np.lexsort((dates, team_codes))
+    sorted_codes = team_codes[order]
+    counts = np.bincount(sorted_codes)
+    starts = np.cumsum(counts) - counts
+    games_ago = np.empty(len(order), dtype=np.int64)
+    games_ago[order] = counts[sorted_codes] - 1 - (np.arange(len(order)) - starts[sorted_codes])
+    return games_ago
+
+def weighted_recent_sums(games: pd.DataFrame, value_cols: list, codes: TeamCodes = None,
+                         recent_share: float = None, max_games: int = None, games_ago=None) -> pd.DataFrame:
+    """
+    Tapered-weight sums of `value_cols` over each team's last MAX_GAMES games.
+
+    Vectorized equivalent of looping `_team_recent_series` per team: rank
+    each game's position from the team's newest one (`games_ago_by_team`),
+    look its weight up in `tapered_weight_table`, and reduce every column
+    with a bincount over team codes.
+
+    Same-day games keep their row order: the later row counts as the more
+    recent game, so it is the one kept in the window and weighted as newer.
+    The DuckDB query breaks ties the same way (`seq`). The per-team loop
+    this replaced sorted with the unstable default quicksort, which left the
+    order of same-day games (common on tournament days) to the sort
+    implementation; rankings with such ties can differ from that loop.
+
+    When `codes` is given, the frame's int32 `team_id` column is used instead
+    of factorizing the Team strings. `recent_share` / `max_games` override
+    RECENT_SHARE / MAX_GAMES. `games_ago` (a Series aligned on the frame's
+    index) supplies ranks computed on a larger frame and skips the sort:
+    a frame holding the newest games of each team, like a narrower window
+    ending on the same day, keeps the ranks of the larger one.
+
+    Returns:
+        DataFrame indexed by Team (first-appearance order) with one weighted
+        sum per value column plus GamesPlayed (games in the window, ≤ MAX_GAMES)
+    """
+    if codes is not None and "team_id" in games.columns:
+        local_codes, team_ids = pd.factorize(games["team_id"], sort=False)
+        teams = codes.decode(team_ids)
+    else:
+        local_codes, teams = pd.factorize(games["Team"], sort=False)
+    codes = local_codes
+    n_teams = len(teams)
+    valid = codes >= 0
+    codes = codes[valid]
+
+    if games_ago is None:
+        games_ago = games_ago_by_team(codes, games["Date"].to_numpy()[valid])
+    else:
+        games_ago = games_ago.reindex(games.index).to_numpy()[valid]
+
+    counts = np.bincount(codes, minlength=n_teams)
+    n_used = np.minimum(counts, MAX_GAMES if max_games is None else max_games)
+    n_row = n_used[codes]
+    in_window = games_ago < n_row
+
+    table = recent_weight_table(recent_share, max_games)
+    w = table[n_row[in_window], (n_row - 1 - games_ago)[in_window]]
+
+    out = pd.DataFrame(index=pd.Index(teams, name="Team"))
+    win_codes = codes[in_window]
+    for col in value_cols:
+        vals = games[col].to_numpy(dtype=float)[valid][in_window]
+        out[col] = np.bincount(win_codes, weights=w * vals, minlength=n_teams)
+    out["GamesPlayed"] = n_used.astype(int)
+    return out
+
+def compute_off_def_raw(long_games: pd.DataFrame, codes: TeamCodes = None,
+                        recent_share: float = None, max_games: int = None, games_ago=None) -> pd.DataFrame:
     """
     Compute raw offense/defense metrics with optional DuckDB acceleration.
     
-    Phase 4: Use DuckDB for fast aggregations when available.
+    Phase 4: Use DuckDB for fast aggregations when available. Precomputed
+    `games_ago` ranks (see `weighted_recent_sums`) use the NumPy kernel,
+    which then needs no sort.
     """
     # Phase 4: Try DuckDB optimization
-    if DUCKDB_AVAILABLE:
+    if DUCKDB_AVAILABLE and games_ago is None:
         try:
-            return _compute_off_def_raw_duckdb(long_games)
+            return _compute_off_def_raw_duckdb(long_games, codes, recent_share, max_games)
         except Exception as e:
             print(f"⚠️ DuckDB optimization failed: {e}, falling back to pandas")
     
     # Fallback to pandas (original implementation)
-    return _compute_off_def_raw_pandas(long_games)
-
-def _compute_off_def_raw_pandas(long_games: pd.DataFrame) -> pd.DataFrame:
-    """Original pandas implementation."""
-    rows = []
-    for team, tg in long_games.groupby("Team", sort=False):
-        gf, ga, w = _team_recent_series(tg)
-        if len(w) == 0:
-            off_raw, def_raw, gp = 0.0, 0.0, 0
-        else:
-            # Weighted goals per game
-            gf_w = float((gf * w).sum())
-            ga_w = float((ga * w).sum())
-            off_raw = gf_w
-            def_raw = 1.0 / (1.0 + ga_w)  # Lower GA → higher defense score
-            gp = int(len(w))
-        rows.append((team, off_raw, def_raw, gp))
-    return pd.DataFrame(rows, columns=["Team","Off_raw","Def_raw","GamesPlayed"]).set_index("Team")
+    return _compute_off_def_raw_pandas(long_games, codes, recent_share, max_games, games_ago)
+
+def _compute_off_def_raw_pandas(long_games: pd.DataFrame, codes: TeamCodes = None,
+                                recent_share: float = None, max_games: int = None,
+                                games_ago=None) -> pd.DataFrame:
+    """Pandas/NumPy implementation using the vectorized tapered-weight kernel."""
+    # Apply blowout dampening: cap goal differential at ±6
+    margin = np.clip(long_games["GF"] - long_games["GA"], -GOAL_DIFF_CAP, GOAL_DIFF_CAP)
+    capped = pd.DataFrame({
+        "Team": long_games["Team"],
+        "Date": long_games["Date"],
+        "GF": long_games["GA"] + margin,
+        "GA": long_games["GA"],
+    })
+    if "team_id" in long_games.columns:
+        capped["team_id"] = long_games["team_id"]
+    sums = weighted_recent_sums(capped, ["GF", "GA"], codes, recent_share, max_games, games_ago)
 
-def _compute_off_def_raw_duckdb(long_games: pd.DataFrame) -> pd.DataFrame:
+    # Weighted goals per game; lower GA → higher defense score
+    base = pd.DataFrame(index=sums.index)
+    base["Off_raw"] = sums["GF"]
+    base["Def_raw"] = 1.0 / (1.0 + sums["GA"])
+    base["GamesPlayed"] = sums["GamesPlayed"]
+    return base
+
+# Tapered-weight Off/Def reduction over a long-format relation `games_long`
+# (Team, Date, GF, GA, seq). ROW_NUMBER gives games-ago per team, the join to
+# `recent_weights` drops games outside the last MAX_GAMES. `seq` is the row
+# order of the long frame and breaks same-day ties like the stable pandas sort.
+_OFF_DEF_SQL = """
+WITH ranked AS (
+    SELECT
+        Team, GF, GA,
+        ROW_NUMBER() OVER (PARTITION BY Team ORDER BY Date DESC, seq DESC) - 1 AS games_ago,
+        LEAST(COUNT(*) OVER (PARTITION BY Team), {max_games}) AS n_used
+    FROM games_long
+),
+windowed AS (
+    SELECT
+        r.Team, r.n_used, w.weight, r.GA,
+        r.GA + GREATEST(-{cap}, LEAST({cap}, r.GF - r.GA)) AS gf_capped
+    FROM ranked r
+    JOIN recent_weights w
+      ON w.n_games = r.n_used AND w.games_ago = r.games_ago
+)
+SELECT
+    Team,
+    SUM(weight * gf_capped) AS Off_raw,
+    1.0 / (1.0 + SUM(weight * GA)) AS Def_raw,
+    MAX(n_used) AS GamesPlayed
+FROM windowed
+GROUP BY Team
+"""
+
+def _recent_weights_frame(recent_share: float = None, max_games: int = None) -> pd.DataFrame:
+    """`tapered_weight_table` in long form: (n_games, games_ago, weight)."""
+    max_games = MAX_GAMES if max_games is None else int(max_games)
+    table = recent_weight_table(recent_share, max_games)
+    n_games, pos = np.nonzero(np.tri(max_games + 1, max_games, -1, dtype=bool))
+    return pd.DataFrame({
+        "n_games": n_games,
+        "games_ago": n_games - 1 - pos,  # position 0 = oldest game in window
+        "weight": table[n_games, pos],
+    })
+
+def _run_off_def_sql(con, recent_share: float = None, max_games: int = None) -> pd.DataFrame:
+    """Run `_OFF_DEF_SQL` on a connection that already exposes `games_long`."""
+    max_games = MAX_GAMES if max_games is None else int(max_games)
+    con.register("recent_weights", _recent_weights_frame(recent_share, max_games))
+    base = con.execute(_OFF_DEF_SQL.format(max_games=max_games, cap=GOAL_DIFF_CAP)).df()
+    base["GamesPlayed"] = base["GamesPlayed"].astype(int)
+    return base.set_index("Team")
+
+def _compute_off_def_raw_duckdb(long_games: pd.DataFrame, codes: TeamCodes = None,
+                                recent_share: float = None, max_games: int = None) -> pd.DataFrame:
     """
-    DuckDB-optimized computation of off/def metrics.
+    DuckDB computation of off/def metrics from an in-memory long frame.
     
-    Uses DuckDB's fast groupby aggregations for teams with large game histories.
-    Falls back to pandas for weighted calculations where needed.
+    Same tapered weights and blowout cap as the pandas path, expressed as a
+    window-function query (see `_OFF_DEF_SQL`). With `codes`, the query
+    partitions on the integer team_id and names are decoded afterwards.
     """
-    # For DuckDB, we need to pre-compute the weighted series
-    # So we still do the pandas loop but could optimize the aggregations
+    use_codes = codes is not None and "team_id" in long_games.columns
+    team_col = "team_id" if use_codes else "Team"
+    games_long = pd.DataFrame({
+        "Team": long_games[team_col].to_numpy(),
+        "Date": long_games["Date"].to_numpy(),
+        "GF": long_games["GF"].to_numpy(),
+        "GA": long_games["GA"].to_numpy(),
+        "seq": np.arange(len(long_games)),
+    })
+    con = duckdb.connect()
+    try:
+        con.register("games_long", games_long)
+        base = _run_off_def_sql(con, recent_share, max_games)
+    finally:
+        con.close()
+    # Keep the pandas path's first-appearance team order
+    base = base.reindex(pd.unique(games_long["Team"].dropna()))
+    if use_codes:
+        base.index = pd.Index(codes.decode(base.index.to_numpy()), name="Team")
+    return base
+
+def compute_off_def_raw_from_file(matches_path: Path, team_name_mapping: dict = None, today=None) -> pd.DataFrame:
+    """
+    Compute Off_raw/Def_raw directly from a wide Matched_Games CSV or Parquet.
+    
+    DuckDB scans the file, unpivots to long format, applies the WINDOW_DAYS
+    cutoff and (optionally) the master-team filter + name mapping in SQL, so
+    no pandas long frame is ever built. Intended for national files that do
+    not fit comfortably in pandas memory.
     
-    # Actually, the weighted computation makes this difficult to optimize fully
-    # The real bottleneck is the per-team weighted series calculation
-    # Let's use pandas but mark it for future optimization
+    Args:
+        matches_path: Wide games file (Team A, Team B, Score A, Score B, Date)
+        team_name_mapping: Master "Team Name" -> ranked team name; when given,
+            only master teams are ranked (as in build_rankings_from_wide)
+        today: Reference date for the window cutoff (default: now)
     
-    # Reuse pandas implementation for now (weighted calculation is complex)
-    return _compute_off_def_raw_pandas(long_games)
+    Returns:
+        DataFrame indexed by Team with Off_raw, Def_raw, GamesPlayed
+    """
+    if not DUCKDB_AVAILABLE:
+        raise ImportError("DuckDB is required for compute_off_def_raw_from_file")
+    
+    today = as_of_date(today)
+    cutoff = today - pd.Timedelta(days=WINDOW_DAYS)
+    end = today + pd.Timedelta(days=1)
+    matches_path = resolve_table_path(matches_path)
+    path_sql = str(matches_path).replace("'", "''")
+    if matches_path.suffix.lower() == ".parquet":
+        source = f"""
+            SELECT "Team A" AS team_a, "Team B" AS team_b,
+                   CAST("Score A" AS DOUBLE) AS score_a, CAST("Score B" AS DOUBLE) AS score_b,
+                   CAST("Date" AS TIMESTAMP) AS game_date,
+                   ROW_NUMBER() OVER () AS src_row
+            FROM read_parquet('{path_sql}')"""
+    else:
+        source = f"""
+            SELECT "Team A" AS team_a, "Team B" AS team_b,
+                   TRY_CAST("Score A" AS DOUBLE) AS score_a, TRY_CAST("Score B" AS DOUBLE) AS score_b,
+                   TRY_STRPTIME("Date", {list(GAME_DATE_FORMATS)}) AS game_date,
+                   ROW_NUMBER() OVER () AS src_row
+            FROM read_csv('{path_sql}', header = true, all_varchar = true)"""
+    
+    long_sql = f"""
+        WITH src AS ({source}),
+        unpivoted AS (
+            SELECT team_a AS Team, team_b AS Opponent, score_a AS GF, score_b AS GA, game_date AS Date,
+                   src_row AS seq FROM src
+            UNION ALL
+            SELECT team_b, team_a, score_b, score_a, game_date,
+                   src_row + (SELECT COUNT(*) FROM src) FROM src
+        )
+        SELECT {"m.mapped_name" if team_name_mapping is not None else "u.Team"} AS Team, u.Date, u.GF, u.GA, u.seq
+        FROM unpivoted u
+        {"JOIN team_map m ON m.raw_name = u.Team" if team_name_mapping is not None else ""}
+        WHERE u.Team IS NOT NULL AND u.Opponent IS NOT NULL
+          AND u.Date >= TIMESTAMP '{cutoff:%Y-%m-%d %H:%M:%S}'
+          AND u.Date < TIMESTAMP '{end:%Y-%m-%d %H:%M:%S}'
+    """
+    
+    con = duckdb.connect()
+    try:
+        if team_name_mapping is not None:
+            con.register("team_map", pd.DataFrame({
+                "raw_name": list(team_name_mapping.keys()),
+                "mapped_name": list(team_name_mapping.values()),
+            }))
+        con.execute(f"CREATE TEMP VIEW games_long AS {long_sql}")
+        base = _run_off_def_sql(con)
+    finally:
+        con.close()
+    return base.sort_index()
 
 def opponent_adjust(long_games: pd.DataFrame, base: pd.DataFrame) -> pd.DataFrame:
     # Use Off_raw as an environment proxy
@@ -349,19 +766,13 @@ def opponent_adjust(long_games: pd.DataFrame, base: pd.DataFrame) -> pd.DataFram
     adj["Def_raw_adj"] = def_adj
     return adj
 
-def compute_strength_adjusted_metrics(long_games: pd.DataFrame, base: pd.DataFrame) -> pd.DataFrame:
+def opponent_strength_tables(base: pd.DataFrame):
     """
-    Compute strength-adjusted offense and defense metrics (V5.3E).
+    Team-level strength lookups used by the strength-adjusted metrics.
     
-    Enhanced with:
-    - Adaptive K-factor: Shrink impact for weak opponents and low-GP teams
-    - Outlier Guard: Cap extreme values to prevent single-game dominance
-    
-    For each game:
-    - Adj_GF = GF * (1.0 / Opponent_Def_norm) * adaptive_k - harder to score on strong defense
-    - Adj_GA = GA * (1.0 / Opponent_Off_norm) * adaptive_k - less penalty for allowing goals to strong offense
-    
-    Then apply V5.3 performance multiplier based on Expected GD with exponential recency decay.
+    Returns:
+        Tuple of (off_norm, def_norm, opp_def_strength, opp_off_strength),
+        each a Series indexed by Team
     """
     # Normalize base metrics for opponent strength calculations
     off_norm_temp = minmax_norm(base["Off_raw"])
@@ -380,48 +791,62 @@ def compute_strength_adjusted_metrics(long_games: pd.DataFrame, base: pd.DataFra
                                                        upper=OPP_STRENGTH_FINAL_MAX)
     opp_off_strength = (1.0 / off_norm_clipped).clip(lower=OPP_STRENGTH_FINAL_MIN, 
                                                        upper=OPP_STRENGTH_FINAL_MAX)
+    return off_norm_temp, def_norm_temp, opp_def_strength, opp_off_strength
+
+def strength_adjusted_games(long_games: pd.DataFrame, base: pd.DataFrame, codes: TeamCodes = None):
+    """
+    Per-game part of the strength-adjusted metrics (V5.3E), up to the
+    PERFORMANCE_K-dependent step.
+    
+    Gathers opponent strengths, applies the adaptive K-factor and computes
+    Expected GD, performance deltas and recency decay. Everything here is
+    independent of PERFORMANCE_K, so parameter sweeps compute it once.
+    
+    Returns:
+        Tuple of (games frame with Adj_GF/Adj_GA before the performance
+        multiplier plus Perf_Sign/RecencyDecay/Perf_Significant, TeamCodes)
+    """
+    strengths = opponent_strength_tables(base)
+    if LOW_MEMORY_MODE:
+        return _strength_adjusted_games_lean(long_games, codes, *strengths)
+    off_norm_temp, def_norm_temp, opp_def_strength, opp_off_strength = strengths
     
-    # Merge opponent strengths into game data
     games_enriched = long_games.copy()
-    games_enriched = games_enriched.merge(
-        opp_def_strength.rename("Opp_Def_Strength"), 
-        left_on="Opponent", 
-        right_index=True, 
-        how="left"
-    )
-    games_enriched = games_enriched.merge(
-        opp_off_strength.rename("Opp_Off_Strength"), 
-        left_on="Opponent", 
-        right_index=True, 
-        how="left"
-    )
+    if codes is None or "team_id" not in games_enriched.columns:
+        games_enriched, codes = TeamCodes.attach(games_enriched)
+    team_id = games_enriched["team_id"].to_numpy()
+    opp_id = games_enriched["opp_id"].to_numpy()
+    
+    # Gather opponent strengths into game data by team code
+    opp_def_game = np.take(codes.scatter(opp_def_strength), opp_id)
+    opp_off_game = np.take(codes.scatter(opp_off_strength), opp_id)
     
     # Fill missing opponent strengths with league means (fallback guardrail)
-    games_enriched["Opp_Def_Strength"] = games_enriched["Opp_Def_Strength"].fillna(opp_def_strength.mean())
-    games_enriched["Opp_Off_Strength"] = games_enriched["Opp_Off_Strength"].fillna(opp_off_strength.mean())
+    games_enriched["Opp_Def_Strength"] = np.where(np.isnan(opp_def_game), opp_def_strength.mean(), opp_def_game)
+    games_enriched["Opp_Off_Strength"] = np.where(np.isnan(opp_off_game), opp_off_strength.mean(), opp_off_game)
     
     # V5.3E: Apply Adaptive K-factor if enabled
     if ADAPTIVE_K_ENABLED:
         # Get team current strengths for adaptive K
         team_strengths = long_games.groupby("Team")["Off_raw"].mean() if "Off_raw" in long_games.columns else off_norm_temp
-        opp_strengths = games_enriched["Opponent"].map(team_strengths).fillna(0.5)
+        strength_by_code = codes.scatter(team_strengths)
+        team_str = np.where(codes.present(team_strengths)[team_id], strength_by_code[team_id], 0.5)
+        opp_str = np.take(strength_by_code, opp_id)
+        opp_str = np.where(np.isnan(opp_str), 0.5, opp_str)
         
         # Calculate games used per team
-        games_count = long_games.groupby("Team").size()
-        games_enriched["games_used"] = games_enriched["Team"].map(games_count)
+        games_count = np.bincount(team_id, minlength=len(codes))
+        games_enriched["games_used"] = games_count[team_id]
         
-        # Apply adaptive multiplier
-        games_enriched["adaptive_k"] = games_enriched.apply(
-            lambda row: adaptive_multiplier(
-                team_strength=team_strengths.get(row["Team"], 0.5),
-                opp_strength=opp_strengths[row.name],
-                games_used=row["games_used"],
-                k_base=1.0,
-                min_games=ADAPTIVE_K_MIN_GAMES,
-                alpha=ADAPTIVE_K_ALPHA,
-                beta=ADAPTIVE_K_BETA
-            ),
-            axis=1
+        # Apply adaptive multiplier (one vectorized call over all game rows)
+        games_enriched["adaptive_k"] = adaptive_multiplier(
+            team_strength=team_str,
+            opp_strength=opp_str,
+            games_used=games_enriched["games_used"].to_numpy(),
+            k_base=1.0,
+            min_games=ADAPTIVE_K_MIN_GAMES,
+            alpha=ADAPTIVE_K_ALPHA,
+            beta=ADAPTIVE_K_BETA
         )
         
         print(f"Applied adaptive K-factor. Mean multiplier: {games_enriched['adaptive_k'].mean():.3f}")
@@ -436,22 +861,9 @@ def compute_strength_adjusted_metrics(long_games: pd.DataFrame, base: pd.DataFra
     if USE_PERFORMANCE_LAYER:
         # Step 3: Expected GD and Performance
         # Expected GD = Team's offensive strength vs Opponent's defensive strength
-        # Merge team's own strength for Expected GD calculation
-        team_off_strength = off_norm_temp.rename("Team_Off_Strength")
-        team_def_strength = def_norm_temp.rename("Team_Def_Strength")
-        
-        games_enriched = games_enriched.merge(
-            team_off_strength, 
-            left_on="Team", 
-            right_index=True, 
-            how="left"
-        )
-        games_enriched = games_enriched.merge(
-            team_def_strength, 
-            left_on="Team", 
-            right_index=True, 
-            how="left"
-        )
+        # Gather team's own strength for Expected GD calculation
+        games_enriched["Team_Off_Strength"] = np.take(codes.scatter(off_norm_temp), team_id)
+        games_enriched["Team_Def_Strength"] = np.take(codes.scatter(def_norm_temp), team_id)
         
         # Expected GD = Team's offensive advantage - Opponent's defensive advantage
         games_enriched["ExpectedGD"] = (
@@ -466,75 +878,192 @@ def compute_strength_adjusted_metrics(long_games: pd.DataFrame, base: pd.DataFra
         games_enriched["Performance_scaled"] = games_enriched["Performance_scaled"].fillna(0.5)
         
         # Step 4: Compute Exponential Recency Decay
-        games_enriched = games_enriched.sort_values(["Team", "Date"], ascending=[True, False])
-        games_enriched["GamesAgo"] = games_enriched.groupby("Team").cumcount()
+        games_enriched = games_enriched.sort_values(["team_id", "Date"], ascending=[True, False])
+        games_enriched["GamesAgo"] = games_enriched.groupby("team_id").cumcount()
         games_enriched["RecencyDecay"] = np.exp(
             -PERFORMANCE_DECAY_RATE * games_enriched["GamesAgo"].clip(0, PERFORMANCE_MAX_GAMES)
         )
         
-        # Step 5: Apply THRESHOLD + Decay Form Adjustment
+        # Step 5: Threshold + decay terms of the form adjustment
         perf_delta = games_enriched["Performance_raw"]
         
         # Only trigger adjustment if |delta| >= threshold
-        significant = np.abs(perf_delta) >= PERFORMANCE_THRESHOLD
-        sign = np.sign(perf_delta)
-        
-        # Compute adjustment factor (recency-weighted, threshold-gated)
-        adj_factor = 1 + (
-            PERFORMANCE_K * sign * games_enriched["RecencyDecay"] * significant.astype(float)
+        games_enriched["Perf_Significant"] = (np.abs(perf_delta) >= PERFORMANCE_THRESHOLD).astype(float)
+        games_enriched["Perf_Sign"] = np.sign(perf_delta)
+        games_enriched["Perf_Delta"] = perf_delta
+    
+    return games_enriched, codes
+
+# Default-mode columns of `strength_adjusted_games` that the lean frame skips
+SA_DIAGNOSTIC_COLUMNS = ("Opponent", "GF", "GA", "opp_id", "Opp_Def_Strength", "Opp_Off_Strength", "games_used",
+                         "adaptive_k", "Team_Off_Strength", "Team_Def_Strength", "ExpectedGD", "GoalDiff",
+                         "Performance_raw", "Performance_scaled", "GamesAgo", "Perf_Delta")
+
+def _strength_adjusted_games_lean(long_games: pd.DataFrame, codes: TeamCodes, off_norm_temp, def_norm_temp,
+                                  opp_def_strength, opp_off_strength):
+    """
+    LOW_MEMORY_MODE version of `strength_adjusted_games`.
+    
+    Same arithmetic on NumPy arrays, without copying or re-sorting the games
+    frame: the result holds only the columns `aggregate_strength_adjusted`
+    reads (team_id, Date, Team, Adj_GF, Adj_GA, Perf_Sign, RecencyDecay,
+    Perf_Significant), stored as float32.
+    """
+    if codes is None or "team_id" not in long_games.columns:
+        team_id, opp_id, codes = TeamCodes.factorize_pair(long_games["Team"], long_games["Opponent"])
+    else:
+        team_id, opp_id = long_games["team_id"].to_numpy(), long_games["opp_id"].to_numpy()
+    
+    opp_def = np.take(codes.scatter(opp_def_strength), opp_id)
+    opp_off = np.take(codes.scatter(opp_off_strength), opp_id)
+    opp_def = np.where(np.isnan(opp_def), opp_def_strength.mean(), opp_def)
+    opp_off = np.where(np.isnan(opp_off), opp_off_strength.mean(), opp_off)
+    
+    adaptive_k = 1.0
+    if ADAPTIVE_K_ENABLED:
+        strength_by_code = codes.scatter(off_norm_temp)
+        team_str = np.where(codes.present(off_norm_temp)[team_id], strength_by_code[team_id], 0.5)
+        opp_str = np.take(strength_by_code, opp_id)
+        opp_str = np.where(np.isnan(opp_str), 0.5, opp_str)
+        games_count = np.bincount(team_id, minlength=len(codes))
+        adaptive_k = adaptive_multiplier(
+            team_strength=team_str,
+            opp_strength=opp_str,
+            games_used=games_count[team_id],
+            k_base=1.0,
+            min_games=ADAPTIVE_K_MIN_GAMES,
+            alpha=ADAPTIVE_K_ALPHA,
+            beta=ADAPTIVE_K_BETA
         )
+        print(f"Applied adaptive K-factor. Mean multiplier: {adaptive_k.mean():.3f}")
+    
+    gf = long_games["GF"].to_numpy(dtype=float)
+    ga = long_games["GA"].to_numpy(dtype=float)
+    games = pd.DataFrame({"team_id": team_id, "Date": long_games["Date"].to_numpy()}, index=long_games.index)
+    if "Team" in long_games.columns:
+        games["Team"] = long_games["Team"]
+    games["Adj_GF"] = (gf * opp_def * adaptive_k).astype(np.float32)
+    games["Adj_GA"] = (ga * opp_off * adaptive_k).astype(np.float32)
+    
+    if USE_PERFORMANCE_LAYER:
+        # Performance vs Expected GD (team offense minus opponent defense)
+        perf_delta = (gf - ga) - (np.take(codes.scatter(off_norm_temp), team_id) - opp_def)
         
-        # Apply proportional boost/penalty
-        games_enriched["Adj_GF"] *= adj_factor
-        games_enriched["Adj_GA"] *= (2 - adj_factor)
+        # Games ago per team (0 = most recent), same order as the stable
+        # (team_id, Date descending) sort of the default path
+        dates = games["Date"].to_numpy().astype(np.int64)
+        order = np.lexsort((-dates, team_id))
+        counts = np.bincount(team_id, minlength=len(codes))
+        starts = np.cumsum(counts) - counts
+        games_ago = np.empty(len(order), dtype=np.int64)
+        games_ago[order] = np.arange(len(order)) - starts[team_id[order]]
         
-        # Keep for diagnostics
-        games_enriched["Perf_Delta"] = perf_delta
-        games_enriched["Perf_Adj_Factor"] = adj_factor
+        games["RecencyDecay"] = np.exp(
+            -PERFORMANCE_DECAY_RATE * np.clip(games_ago, 0, PERFORMANCE_MAX_GAMES)
+        ).astype(np.float32)
+        games["Perf_Significant"] = (np.abs(perf_delta) >= PERFORMANCE_THRESHOLD).astype(np.float32)
+        games["Perf_Sign"] = np.sign(perf_delta).astype(np.float32)
+    
+    return games, codes
+
+def aggregate_strength_adjusted(games: pd.DataFrame, codes: TeamCodes, performance_ks=None,
+                                recent_share: float = None, max_games: int = None, games_ago=None) -> dict:
+    """
+    Performance multiplier, outlier guard and tapered team sums of the
+    strength-adjusted metrics for one or more PERFORMANCE_K values at once.
+    
+    Each K gets its own Adj_GF/Adj_GA column pair, so the grouped outlier
+    guard and the weighted sums run once over all of them.
+    
+    Args:
+        games: Output frame of `strength_adjusted_games`
+        codes: Its TeamCodes
+        performance_ks: PERFORMANCE_K values (default: [PERFORMANCE_K])
+        recent_share: Override for RECENT_SHARE in the tapered weights
+        max_games: Override for MAX_GAMES in the tapered weights
+        games_ago: Optional precomputed ranks (see `weighted_recent_sums`)
+    
+    Returns:
+        Dict of PERFORMANCE_K -> DataFrame indexed by Team with SAO_raw,
+        SAD_raw, GamesPlayed
+    """
+    performance_ks = [PERFORMANCE_K] if performance_ks is None else list(performance_ks)
+    # Per-K columns go into a new frame holding only the key columns, so
+    # the input (reused across calls by sweeps) is neither copied nor modified
+    source = games
+    games = pd.DataFrame({c: source[c] for c in ("Team", "team_id", "Date") if c in source.columns}, copy=False)
+    value_cols = []
+    for i, k in enumerate(performance_ks):
+        gf_col, ga_col = f"Adj_GF_{i}", f"Adj_GA_{i}"
+        if USE_PERFORMANCE_LAYER:
+            # Adjustment factor (recency-weighted, threshold-gated), applied
+            # as a proportional boost/penalty
+            adj_factor = 1 + (
+                k * source["Perf_Sign"] * source["RecencyDecay"] * source["Perf_Significant"]
+            )
+            games[gf_col] = source["Adj_GF"] * adj_factor
+            games[ga_col] = source["Adj_GA"] * (2 - adj_factor)
+        else:
+            games[gf_col] = source["Adj_GF"].copy()
+            games[ga_col] = source["Adj_GA"].copy()
+        value_cols += [gf_col, ga_col]
     
     # V5.3E: Apply Outlier Guard if enabled
     if OUTLIER_GUARD_ENABLED:
         print(f"Applying outlier guard with z-score threshold {OUTLIER_GUARD_ZSCORE}")
-        for team in games_enriched["Team"].unique():
-            mask = games_enriched["Team"] == team
-            if mask.sum() > 1:  # Need at least 2 games for z-score calculation
-                games_enriched.loc[mask, "Adj_GF"] = clip_to_zscore(
-                    games_enriched.loc[mask, "Adj_GF"], 
-                    z=OUTLIER_GUARD_ZSCORE
-                )
-                games_enriched.loc[mask, "Adj_GA"] = clip_to_zscore(
-                    games_enriched.loc[mask, "Adj_GA"], 
-                    z=OUTLIER_GUARD_ZSCORE
-                )
-    
-    # Aggregate at team level (using existing weights from _team_recent_series)
-    rows = []
-    for team, tg in games_enriched.groupby("Team", sort=False):
-        gf, ga, w = _team_recent_series(tg)
-        if len(w) == 0:
-            sao_raw, sad_raw, gp = 0.0, 0.0, 0
+        if OUTLIER_GUARD_GROUPED:
+            clip_to_zscore_grouped(games, value_cols, by="team_id", z=OUTLIER_GUARD_ZSCORE)
         else:
-            # Get adjusted goals for this team's games
-            team_games_sorted = tg.sort_values("Date").tail(MAX_GAMES)
-            adj_gf = team_games_sorted["Adj_GF"].to_numpy()
-            adj_ga = team_games_sorted["Adj_GA"].to_numpy()
-            
-            # Apply weights
-            sao_raw = float((adj_gf * w).sum())
-            sad_raw = 1.0 / ((adj_ga * w).sum() + RIDGE_GA)
-            gp = int(len(w))
-        
-        rows.append((team, sao_raw, sad_raw, gp))
+            # Legacy per-team path (O(teams × rows)), kept for equivalence checks
+            for team in games["Team"].unique():
+                mask = games["Team"] == team
+                if mask.sum() > 1:  # Need at least 2 games for z-score calculation
+                    for col in value_cols:
+                        games.loc[mask, col] = clip_to_zscore(games.loc[mask, col], z=OUTLIER_GUARD_ZSCORE)
     
-    return pd.DataFrame(rows, columns=["Team", "SAO_raw", "SAD_raw", "GamesPlayed"]).set_index("Team")
+    # Aggregate at team level (same tapered weights as Off_raw/Def_raw)
+    sums = weighted_recent_sums(games, value_cols, codes, recent_share, max_games, games_ago)
+    results = {}
+    for i, k in enumerate(performance_ks):
+        sa = pd.DataFrame(index=sums.index)
+        sa["SAO_raw"] = sums[f"Adj_GF_{i}"]
+        sa["SAD_raw"] = 1.0 / (sums[f"Adj_GA_{i}"] + RIDGE_GA)
+        sa["GamesPlayed"] = sums["GamesPlayed"]
+        results[k] = sa
+    return results
 
-def apply_bayesian_shrinkage(sa_metrics, league_off_mean, league_def_mean):
-    """Apply Bayesian shrinkage toward league means based on games played."""
+def compute_strength_adjusted_metrics(long_games: pd.DataFrame, base: pd.DataFrame,
+                                      codes: TeamCodes = None, performance_k: float = None,
+                                      recent_share: float = None) -> pd.DataFrame:
+    """
+    Compute strength-adjusted offense and defense metrics (V5.3E).
+    
+    Enhanced with:
+    - Adaptive K-factor: Shrink impact for weak opponents and low-GP teams
+    - Outlier Guard: Cap extreme values to prevent single-game dominance
+    
+    For each game:
+    - Adj_GF = GF * (1.0 / Opponent_Def_norm) * adaptive_k - harder to score on strong defense
+    - Adj_GA = GA * (1.0 / Opponent_Off_norm) * adaptive_k - less penalty for allowing goals to strong offense
+    
+    Then apply V5.3 performance multiplier based on Expected GD with exponential recency decay.
+    
+    Team-level values are gathered onto game rows by integer team code
+    (`codes`, built from `long_games` when not supplied). `performance_k` and
+    `recent_share` override PERFORMANCE_K / RECENT_SHARE.
+    """
+    games, codes = strength_adjusted_games(long_games, base, codes)
+    k = PERFORMANCE_K if performance_k is None else performance_k
+    return aggregate_strength_adjusted(games, codes, [k], recent_share)[k]
+
+def apply_bayesian_shrinkage(sa_metrics, league_off_mean, league_def_mean, tau=None):
+    """Apply Bayesian shrinkage toward league means based on games played (tau defaults to SHRINK_TAU)."""
+    tau = SHRINK_TAU if tau is None else tau
     shrunk = sa_metrics.copy()
     gp = sa_metrics["GamesPlayed"]
     
-    shrunk["SAO_raw"] = (gp * sa_metrics["SAO_raw"] + SHRINK_TAU * league_off_mean) / (gp + SHRINK_TAU)
-    shrunk["SAD_raw"] = (gp * sa_metrics["SAD_raw"] + SHRINK_TAU * league_def_mean) / (gp + SHRINK_TAU)
+    shrunk["SAO_raw"] = (gp * sa_metrics["SAO_raw"] + tau * league_off_mean) / (gp + tau)
+    shrunk["SAD_raw"] = (gp * sa_metrics["SAD_raw"] + tau * league_def_mean) / (gp + tau)
     
     return shrunk
 
@@ -544,72 +1073,170 @@ def gp_multiplier(gp: int) -> float:
     if gp >= 10: return 0.90
     return 0.75
 
-def generate_connectivity_report(games_df: pd.DataFrame) -> pd.DataFrame:
+def generate_connectivity_report(games_df: pd.DataFrame, bridges=True) -> pd.DataFrame:
     """
-    Generate basic connectivity analysis of opponent network.
+    Connectivity analysis of the opponent network (see utils/connectivity.py).
+    
+    Components are numbered by size (0 = largest); bridge teams are the
+    teams whose removal would split their component.
+    
+    Args:
+        games_df: Team A / Team B per game, or distinct pairings with a
+            Games column (see `stream_opponent_edges`)
     
     Returns:
-        DataFrame with Team, ComponentID, ComponentSize, Degree columns
+        DataFrame with Team, ComponentID, ComponentSize, Degree, Games,
+        IsBridge, SeparatedTeams columns
     """
-    try:
-        import networkx as nx
-        
-        # Build graph
-        G = nx.Graph()
-        for _, row in games_df.iterrows():
-            G.add_edge(row["Team A"], row["Team B"])
-        
-        # Find connected components
-        components = list(nx.connected_components(G))
-        
-        # Build report
-        connectivity_data = []
-        for comp_id, component in enumerate(components):
-            comp_size = len(component)
-            for team in component:
-                degree = G.degree(team) if team in G else 0
-                connectivity_data.append({
-                    "Team": team,
-                    "ComponentID": comp_id,
-                    "ComponentSize": comp_size,
-                    "Degree": degree
-                })
-        
-        print(f"Connectivity analysis: {len(components)} components, largest has {max(len(c) for c in components)} teams")
-        return pd.DataFrame(connectivity_data)
-        
-    except ImportError:
-        print("Warning: NetworkX not available, skipping connectivity analysis")
-        return pd.DataFrame(columns=["Team", "ComponentID", "ComponentSize", "Degree"])
+    report = connectivity_frame(games_df["Team A"], games_df["Team B"], bridges=bridges,
+                                games=games_df.get("Games"))
+    if report.empty:
+        print("Connectivity analysis: no games")
+        return report
+    sizes = report.drop_duplicates("ComponentID")["ComponentSize"]
+    print(f"Connectivity analysis: {len(sizes)} components, largest has {sizes.iloc[0]} teams "
+          f"({sizes.iloc[0] / len(report):.1%}), {int((sizes == 1).sum())} isolated teams, "
+          f"{int(report['IsBridge'].sum())} bridge teams")
+    return report
 
-def build_rankings_from_wide(wide_matches_csv: Path, out_csv: Path):
-    # Phase 4: Start timing
-    total_start = time.time()
+def compute_baseline_sos(comp_hist: pd.DataFrame, teams: pd.Index, recent_games: int = 30):
+    """
+    Baseline SOS for all ranked teams from the comprehensive history.
     
-    print("\n🚀 Phase 4 Performance Optimizations:")
-    print(f"   • DuckDB: {'✅' if DUCKDB_AVAILABLE else '❌'}")
-    print(f"   • Joblib: {'✅' if JOBLIB_AVAILABLE else '❌'}")
-    print(f"   • Vectorized Operations: ✅")
-    print()
+    A team's SOS is the mean Opponent_BaseStrength (averaged per canonical
+    opponent over the whole history) across its `recent_games` most recent
+    games, matched on canonical names; teams without history and unknown
+    opponents use the median opponent strength as fallback. The recent games
+    form a sparse team×opponent count matrix, so every SOS value is one
+    matrix-vector product instead of a history scan per team.
+    
+    Same-day games keep their history row order (stable sort), like the
+    tapered weights of `weighted_recent_sums`: when the `recent_games` cut
+    falls inside a day, the later rows count as the more recent games. The
+    per-team scan this replaced used the unstable default sort, so for such
+    teams the opponents at the cut, and their SOS, can differ from it.
+    
+    Args:
+        comp_hist: History with Team_canon, Opponent_canon, Date, Opponent_BaseStrength
+        teams: Ranked team names (canonicalized here)
+        recent_games: Most recent games per team that count toward SOS
+    
+    Returns:
+        Tuple of (SOS Series indexed like `teams`, stats dict with
+        matched_teams, total_opponent_lookups, successful_lookups)
+    """
+    from scipy import sparse
+    
+    # Opponent strength lookup (canonical name -> BaseStrength)
+    opp_strength = comp_hist.groupby("Opponent_canon")["Opponent_BaseStrength"].mean()
+    fallback = float(np.median(opp_strength.to_numpy())) if len(opp_strength) else 0.5
     
-    t0 = time.time()
-    raw = pd.read_csv(wide_matches_csv, encoding="utf-8-sig")
-    print(f"⏱ CSV Load took: {time.time() - t0:.1f}s")
+    # Each team's most recent games (stable sort: same-day ties keep file order)
+    hist = comp_hist[comp_hist["Team_canon"].notna()]
+    hist = hist.sort_values(["Team_canon", "Date"], ascending=[True, False], kind="mergesort")
+    hist = hist[hist.groupby("Team_canon").cumcount() < recent_games]
     
-    t1 = time.time()
-    long = wide_to_long(raw)
-    print(f"⏱ Wide to Long conversion took: {time.time() - t1:.1f}s")
+    team_codes, team_canons = pd.factorize(hist["Team_canon"])
+    opp_codes = opp_strength.index.get_indexer(hist["Opponent_canon"])
+    found = opp_codes >= 0
+    # Unknown opponents point at a trailing fallback slot
+    strength_vec = np.append(opp_strength.to_numpy(dtype=float), fallback)
+    opp_codes = np.where(found, opp_codes, len(opp_strength))
+    
+    counts = sparse.csr_matrix(
+        (np.ones(len(hist)), (team_codes, opp_codes)),
+        shape=(len(team_canons), len(strength_vec)),
+    )
+    games = np.asarray(counts.sum(axis=1)).ravel()
+    sos_by_canon = (counts @ strength_vec) / np.maximum(games, 1)
+    found_by_canon = np.bincount(team_codes, weights=found, minlength=len(team_canons))
     
-    t2 = time.time()
-    long = clamp_window(long)
-    print(f"⏱ Window Clamp took: {time.time() - t2:.1f}s")
+    # Map ranked teams onto canonical history teams
+    idx = pd.Index(team_canons).get_indexer(teams.map(canonicalize_team_name))
+    has_games = idx >= 0
+    sos = np.where(has_games, sos_by_canon[idx], fallback)
+    
+    stats = {
+        "matched_teams": int(has_games.sum()),
+        "total_opponent_lookups": int(games[idx[has_games]].sum()),
+        "successful_lookups": int(found_by_canon[idx[has_games]].sum()),
+    }
+    return pd.Series(sos, index=teams), stats
 
-    # Load authoritative AZ U12 master team list
-    t3 = time.time()
-    master_teams = pd.read_csv("data/input/AZ MALE U12 MASTER TEAM LIST.csv")
+MASTER_TEAM_LIST_PATH = "data/input/AZ MALE U12 MASTER TEAM LIST.csv"
+SOS_HISTORY_PATH = "Team_Game_Histories_COMPREHENSIVE.csv"
+GAMES_TOTAL_HISTORY_PATH = "data/processed/Team_Game_Histories_COMPREHENSIVE.csv"
+ITERATIVE_SOS_GAMES_PATH = "Matched_Games.csv"
+ITERATIVE_SOS_MASTER_PATH = "AZ MALE U12 MASTER TEAM LIST.csv"  # read from cwd by the Elo loader
+
+# ---- Stage cache ----
+USE_STAGE_CACHE = os.getenv("USE_STAGE_CACHE", "true").lower() == "true"
+STAGE_CACHE_VERSION = 2  # bump when the code of a cached stage changes
+# Config read by each cached stage; keys are chained, so upstream config is covered too
+STAGE_CONFIG = {
+    "long": ("WINDOW_DAYS", "LOW_MEMORY_MODE"),
+    "base": ("MAX_GAMES", "RECENT_K", "RECENT_SHARE", "FULL_WEIGHT_GAMES", "DAMPEN_START",
+             "DAMPEN_FACTOR", "TAPER_ENABLED", "GOAL_DIFF_CAP"),
+    "sa": ("USE_PERFORMANCE_LAYER", "PERFORMANCE_K", "PERFORMANCE_DECAY_RATE", "PERFORMANCE_MAX_GAMES",
+           "PERFORMANCE_THRESHOLD", "ADAPTIVE_K_ENABLED", "ADAPTIVE_K_MIN_GAMES", "ADAPTIVE_K_ALPHA",
+           "ADAPTIVE_K_BETA", "OUTLIER_GUARD_ENABLED", "OUTLIER_GUARD_ZSCORE", "OUTLIER_GUARD_GROUPED",
+           "OPP_STRENGTH_CLIP_NORM_LOW", "OPP_STRENGTH_CLIP_NORM_HIGH", "OPP_STRENGTH_FINAL_MIN",
+           "OPP_STRENGTH_FINAL_MAX", "RIDGE_GA"),
+}
+ITERATIVE_SOS_CONFIG = ("INITIAL_RATING", "K_FACTOR", "GOAL_DIFF_MULT", "GOAL_DIFF_CAP", "MAX_ITERS",
+                        "CONV_TOL", "RATING_SCALE", "USE_GOAL_DIFF_AWARE", "ADAPTIVE_K_ENABLED",
+                        "ADAPTIVE_K_MIN_GAMES", "ADAPTIVE_K_ALPHA", "ADAPTIVE_K_BETA")
+# Config read by finalize_rankings (not cached, but part of memoized snapshots)
+FINALIZE_CONFIG = ("OFF_WEIGHT", "DEF_WEIGHT", "SOS_WEIGHT", "SHRINK_TAU", "PROVISIONAL_ALPHA", "INACTIVE_HIDE_DAYS")
+MASSEY_SOS_CONFIG = ("GOAL_DIFF_CAP", "RIDGE_LAMBDA", "SOLVER", "SOLVER_TOL")
+COLLEY_SOS_CONFIG = ("SOLVER", "SOLVER_TOL")
+
+def stage_config(stage) -> dict:
+    """Current values of the config a cached stage depends on."""
+    return {name: globals()[name] for name in STAGE_CONFIG[stage]}
+
+def ranking_config() -> dict:
+    """Current values of every setting the finalized rankings depend on (all stages plus finalize)."""
+    names = [name for stage in STAGE_CONFIG.values() for name in stage] + list(FINALIZE_CONFIG)
+    return {name: globals()[name] for name in dict.fromkeys(names)}
+
+def iterative_sos_config() -> dict:
+    """Current settings of the selected iterative SOS engine (part of its cache key)."""
+    try:
+        import sys
+        sys.path.append(str(Path(__file__).parent.parent))
+        if SOS_ENGINE == "massey":
+            from analytics import massey_sos as module
+            names = MASSEY_SOS_CONFIG
+        elif SOS_ENGINE == "colley":
+            from analytics import colley_sos as module
+            names = COLLEY_SOS_CONFIG
+        else:
+            from analytics import iterative_opponent_strength_v53_enhanced as module
+            names = ITERATIVE_SOS_CONFIG
+    except ImportError:
+        return {"SOS_ENGINE": SOS_ENGINE}
+    config = {"SOS_ENGINE": SOS_ENGINE, **{name: getattr(module, name, None) for name in names}}
+    if SOS_ENGINE == "elo":
+        config.update(ELO_RATING_RANGE=ELO_RATING_RANGE, ELO_UPDATE_MODE=ELO_UPDATE_MODE)
+    return config
+
+def load_master_team_mapping(master_csv=MASTER_TEAM_LIST_PATH, master_teams=None):
+    """
+    Load the authoritative AZ U12 master team list.
+
+    Args:
+        master_csv: Master list path
+        master_teams: Already-loaded master list (skips reading `master_csv`)
+
+    Returns:
+        Tuple of (master_team_names, team_name_mapping) where the mapping is
+        "Team Name" -> "Team Name Club"
+    """
+    if master_teams is None:
+        master_teams = pd.read_csv(master_csv)
     master_team_names = set(master_teams["Team Name"].str.strip())
     print(f"Loaded {len(master_team_names)} authorized AZ U12 teams from master list")
-    print(f"⏱ Master list load took: {time.time() - t3:.1f}s")
 
     # Create team name mapping: Team Name -> "Team Name Club"
     team_name_mapping = {}
@@ -623,163 +1250,168 @@ def build_rankings_from_wide(wide_matches_csv: Path, out_csv: Path):
             combined_name = team_name
         team_name_mapping[team_name] = combined_name
     print(f"Created team name mapping for {len(team_name_mapping)} teams")
+    return master_team_names, team_name_mapping
 
-    # Filter to include only master teams as ranked entities
+def filter_to_master_teams(long_games: pd.DataFrame, master_team_names: set, team_name_mapping: dict) -> pd.DataFrame:
+    """Keep only master teams as ranked entities and map them to their club names."""
     # Keep all opponents for accurate SOS calculation
-    long = long[long["Team"].isin(master_team_names)].copy()
-    print(f"Filtered to master teams. Remaining matches: {len(long)}")
-    print(f"Unique teams after filter: {len(long['Team'].unique())}")
-    
-    # Apply team name mapping to include club names
-    long["Team"] = long["Team"].map(team_name_mapping)
-    print("Applied team name mapping with club names")
+    keep = long_games["Team"].isin(master_team_names)
+    if isinstance(long_games["Team"].dtype, pd.CategoricalDtype):
+        # Map club names per category; the rows keep their int codes
+        return take_rows(long_games, keep, Team=remap_categories(long_games["Team"], team_name_mapping))
+    long_games = long_games[keep].copy()
+    long_games["Team"] = long_games["Team"].map(team_name_mapping)
+    return long_games
 
-    # Use filtered dataset for Off_raw/Def_raw calculations (per V5 spec)
-    print("Calculating Off_raw/Def_raw from filtered 30-game window...")
-    t4 = time.time()
-    base = compute_off_def_raw(long)
-    print(f"⏱ Off_raw/Def_raw calculation took: {time.time() - t4:.1f}s")
-    
-    # V5.3E: Compute strength-adjusted metrics (includes Expected GD + Performance layer + Adaptive K + Outlier Guard)
-    print("Computing strength-adjusted offense/defense metrics with V5.3E enhancements...")
-    t5 = time.time()
-    sa_metrics = compute_strength_adjusted_metrics(long, base)
-    print(f"⏱ Strength-adjusted metrics took: {time.time() - t5:.1f}s")
+def load_sos_history(hist_csv=SOS_HISTORY_PATH) -> pd.DataFrame:
+    """Load the comprehensive game history with canonical team/opponent keys."""
+    return canonical_sos_history(read_table(hist_csv))
+
+def canonical_sos_history(comp_hist: pd.DataFrame) -> pd.DataFrame:
+    """
+    Comprehensive history with parsed dates and Team_canon/Opponent_canon
+    keys, as a new frame (the input, e.g. a pipeline stage result, is not
+    modified).
+    """
+    # Apply canonicalization to comprehensive history (once per distinct name)
+    hist_names = pd.unique(pd.concat([comp_hist["Team"], comp_hist["Opponent"]]).dropna())
+    canon_map = {name: canonicalize_team_name(name) for name in hist_names}
+    return comp_hist.assign(
+        Date=pd.to_datetime(comp_hist["Date"]),
+        Team_canon=comp_hist["Team"].map(canon_map),
+        Opponent_canon=comp_hist["Opponent"].map(canon_map),
+    )
+
+def check_sos_match_rates(sos_stats: dict, n_teams: int):
+    """Log and assert team / opponent match rates of the baseline SOS lookup."""
+    matched_teams = sos_stats["matched_teams"]
+    total_opponent_lookups = sos_stats["total_opponent_lookups"]
+    successful_lookups = sos_stats["successful_lookups"]
+
+    team_match_rate = matched_teams / n_teams if n_teams > 0 else 0
+    opp_match_rate = successful_lookups / total_opponent_lookups if total_opponent_lookups > 0 else 0
+
+    print(f"Team match rate: {team_match_rate:.1%} ({matched_teams}/{n_teams})")
+    print(f"Opponent strength match rate: {opp_match_rate:.1%} ({successful_lookups}/{total_opponent_lookups})")
+
+    assert team_match_rate > 0.9, (
+        f"Low team match rate: {team_match_rate:.1%}. "
+        f"Check comprehensive history and team name canonicalization."
+    )
+    assert opp_match_rate > 0.9, (
+        f"Low opponent match rate: {opp_match_rate:.1%}. "
+        f"Check team_aliases.json for missing mappings."
+    )
+
+def compute_iterative_sos(games_path=ITERATIVE_SOS_GAMES_PATH, as_of=None):
+    """Iterative SOS by team from the SOS_ENGINE engine, or None when disabled or unavailable."""
+    if not USE_ITERATIVE_SOS:
+        return None
+    try:
+        check_sos_engine()
+        import sys
+        sys.path.append(str(Path(__file__).parent.parent))
+        if SOS_ENGINE == "massey":
+            from analytics.massey_sos import compute_massey_sos
+            print("Computing iterative SOS with least-squares (Massey) ratings...")
+            return compute_massey_sos(games_path, as_of=as_of)
+        if SOS_ENGINE == "colley":
+            from analytics.colley_sos import compute_colley_sos
+            print("Computing iterative SOS with Colley-matrix ratings...")
+            return compute_colley_sos(games_path, as_of=as_of)
+        from analytics.iterative_opponent_strength_v53_enhanced import compute_iterative_sos_adaptive
+        print("Computing iterative SOS with adaptive K-factor...")
+        return compute_iterative_sos_adaptive(games_path, use_adaptive_k=True, as_of=as_of,
+                                              rating_range=ELO_RATING_RANGE, update_mode=ELO_UPDATE_MODE)
+    except Exception as e:
+        print(f"Warning: Failed to compute iterative SOS: {e}")
+        return None
+
+def compute_sos_from_games(elo_games: pd.DataFrame, initial_ratings=None):
+    """
+    Iterative SOS of the SOS_ENGINE engine from already loaded master games
+    (snapshots, incremental updates), matching compute_iterative_sos.
+
+    Args:
+        elo_games: Output of load_and_filter_games
+        initial_ratings: Ratings of a previous run of the same engine (warm start)
+
+    Returns:
+        Tuple of (normalized SOS by team, ratings by team)
+    """
+    check_sos_engine()
+    if SOS_ENGINE == "massey":
+        from analytics.massey_sos import compute_massey_sos_from_games
+        return compute_massey_sos_from_games(elo_games, initial_ratings=initial_ratings)
+    if SOS_ENGINE == "colley":
+        from analytics.colley_sos import compute_colley_sos_from_games
+        return compute_colley_sos_from_games(elo_games, initial_ratings=initial_ratings)
+    from analytics.iterative_opponent_strength_v53_enhanced import compute_iterative_sos_from_games
+    return compute_iterative_sos_from_games(elo_games, initial_ratings=initial_ratings, use_adaptive_k=True,
+                                            rating_range=ELO_RATING_RANGE, update_mode=ELO_UPDATE_MODE)
+
+def check_sos_engine():
+    """Reject an unknown SOS_ENGINE or Elo mode (e.g. a typo in the environment)."""
+    if SOS_ENGINE not in SOS_ENGINES:
+        raise ValueError(f"SOS_ENGINE must be one of {SOS_ENGINES}, got {SOS_ENGINE!r}")
+    if ELO_RATING_RANGE not in ELO_RATING_RANGES:
+        raise ValueError(f"ELO_RATING_RANGE must be one of {ELO_RATING_RANGES}, got {ELO_RATING_RANGE!r}")
+    if ELO_UPDATE_MODE not in ELO_UPDATE_MODES:
+        raise ValueError(f"ELO_UPDATE_MODE must be one of {ELO_UPDATE_MODES}, got {ELO_UPDATE_MODE!r}")
+
+def _iterative_sos_frame(sos_iterative):
+    """Iterative SOS dict as a cacheable frame (None stays None, so failures are not cached)."""
+    if sos_iterative is None:
+        return None
+    return pd.DataFrame({"Team": list(sos_iterative), "SOS_iterative": list(sos_iterative.values())})
+
+def load_games_total(hist_csv=GAMES_TOTAL_HISTORY_PATH, as_of=None):
+    """All-time game counts by team from the comprehensive history, or None if missing."""
+    try:
+        comp_hist = read_table(hist_csv, columns=["Team", "Date"])
+    except FileNotFoundError:
+        return None
+    if as_of is not None:
+        comp_hist = comp_hist[played_by(pd.to_datetime(comp_hist["Date"], errors="coerce"), as_of)]
+    return comp_hist.groupby("Team").size()
+
+def finalize_rankings(base: pd.DataFrame, sa_metrics: pd.DataFrame, sos_raw: pd.Series,
+                      sos_iterative, last_game: pd.Series, games_total, today=None,
+                      weights=None, shrink_tau=None) -> pd.DataFrame:
+    """
+    League-wide tail of the pipeline: shrinkage, normalization, PowerScore and rank.
+
+    Every step here depends on the whole league (means, quantiles, sort), so it
+    is cheap but must be re-run whenever any team-level input changes.
+
+    Args:
+        base: Off_raw/Def_raw/GamesPlayed indexed by Team
+        sa_metrics: SAO_raw/SAD_raw/GamesPlayed indexed by Team
+        sos_raw: Baseline SOS by Team
+        sos_iterative: Dict of iterative SOS by Team, or None
+        last_game: Last game date by Team
+        games_total: All-time game counts by Team, or None
+        today: Reference date for is_active (defaults to today)
+        weights: Optional (OFF_WEIGHT, DEF_WEIGHT, SOS_WEIGHT) override
+        shrink_tau: Optional SHRINK_TAU override
+
+    Returns:
+        All ranked teams (active and inactive) sorted by PowerScore_adj
+    """
+    off_weight, def_weight, sos_weight = (OFF_WEIGHT, DEF_WEIGHT, SOS_WEIGHT) if weights is None else weights
     
     # Calculate league means for Bayesian shrinkage
     league_off_mean = sa_metrics["SAO_raw"].mean()
     league_def_mean = sa_metrics["SAD_raw"].mean()
     
     # Apply Bayesian shrinkage
-    sa_metrics = apply_bayesian_shrinkage(sa_metrics, league_off_mean, league_def_mean)
+    sa_metrics = apply_bayesian_shrinkage(sa_metrics, league_off_mean, league_def_mean, shrink_tau)
     
     # Merge strength-adjusted metrics
     adj = base.copy()
     adj["SAO_raw"] = sa_metrics["SAO_raw"]
     adj["SAD_raw"] = sa_metrics["SAD_raw"]
-
-    # Calculate actual SOS based on opponent strength
-    print("Calculating actual SOS based on opponent strength...")
-    t6 = time.time()
-    
-    # Load comprehensive history to get opponent strengths
-    try:
-        t6a = time.time()
-        comp_hist = pd.read_csv("Team_Game_Histories_COMPREHENSIVE.csv")
-        comp_hist["Date"] = pd.to_datetime(comp_hist["Date"])
-        print(f"⏱ Comprehensive history load took: {time.time() - t6a:.1f}s")
-        
-        # Apply canonicalization to comprehensive history
-        comp_hist["Team_canon"] = comp_hist["Team"].map(canonicalize_team_name)
-        comp_hist["Opponent_canon"] = comp_hist["Opponent"].map(canonicalize_team_name)
-        
-        # Build opponent strength lookup (canonical name -> BaseStrength)
-        opp_strength_map = comp_hist.groupby("Opponent_canon")["Opponent_BaseStrength"].mean().to_dict()
-        
-        # Calculate median fallback
-        fallback = np.median(list(opp_strength_map.values())) if opp_strength_map else 0.5
-        
-        # Apply canonicalization to ranking teams
-        adj["Team_canon"] = adj.index.map(canonicalize_team_name)
-        
-        # Helper function for SOS calculation
-        def calculate_team_sos(team, opp_strength_map, fallback, comp_hist):
-            """Calculate SOS for a single team."""
-            team_canon = canonicalize_team_name(team)
-            team_games = comp_hist[comp_hist["Team_canon"] == team_canon].sort_values("Date", ascending=False)
-            
-            if len(team_games) > 0:
-                recent_games = team_games.head(30)
-                
-                # Look up opponent strengths using canonical names
-                opp_strengths = []
-                for opp_canon in recent_games["Opponent_canon"]:
-                    strength = opp_strength_map.get(opp_canon, fallback)
-                    opp_strengths.append(strength)
-                
-                sos = np.mean(opp_strengths) if opp_strengths else fallback
-                has_games = True
-                lookup_count = len(opp_strengths)
-            else:
-                sos = fallback
-                has_games = False
-                lookup_count = 0
-                
-            return (team, sos, has_games, lookup_count)
-        
-        # Phase 4: Parallelize SOS calculation using joblib
-        print(f"Calculating SOS for {len(adj)} teams...")
-        if JOBLIB_AVAILABLE:
-            print("Using parallel processing for SOS calculation...")
-            sos_results = Parallel(n_jobs=-1, backend='threading')(
-                delayed(calculate_team_sos)(team, opp_strength_map, fallback, comp_hist)
-                for team in adj.index
-            )
-            
-            # Convert results back to dictionaries
-            sos_scores = {}
-            matched_teams = 0
-            total_opponent_lookups = 0
-            successful_lookups = 0
-            
-            for team, sos, has_games, lookup_count in sos_results:
-                sos_scores[team] = sos
-                if has_games:
-                    matched_teams += 1
-                total_opponent_lookups += lookup_count
-                # All lookups are "successful" since we use fallback for missing
-                successful_lookups += lookup_count
-        else:
-            # Sequential fallback (original implementation)
-            sos_scores = {}
-            matched_teams = 0
-            total_opponent_lookups = 0
-            successful_lookups = 0
-            
-            for team in adj.index:
-                team_canon = canonicalize_team_name(team)
-                team_games = comp_hist[comp_hist["Team_canon"] == team_canon].sort_values("Date", ascending=False)
-                
-                if len(team_games) > 0:
-                    matched_teams += 1
-                    recent_games = team_games.head(30)
-                    
-                    # Look up opponent strengths using canonical names
-                    opp_strengths = []
-                    for opp_canon in recent_games["Opponent_canon"]:
-                        total_opponent_lookups += 1
-                        strength = opp_strength_map.get(opp_canon, fallback)
-                        if opp_canon in opp_strength_map:
-                            successful_lookups += 1
-                        opp_strengths.append(strength)
-                    
-                    sos_scores[team] = np.mean(opp_strengths) if opp_strengths else fallback
-                else:
-                    sos_scores[team] = fallback
-        
-        # Calculate and assert match rates
-        team_match_rate = matched_teams / len(adj) if len(adj) > 0 else 0
-        opp_match_rate = successful_lookups / total_opponent_lookups if total_opponent_lookups > 0 else 0
-        
-        print(f"Team match rate: {team_match_rate:.1%} ({matched_teams}/{len(adj)})")
-        print(f"Opponent strength match rate: {opp_match_rate:.1%} ({successful_lookups}/{total_opponent_lookups})")
-        
-        assert team_match_rate > 0.9, (
-            f"Low team match rate: {team_match_rate:.1%}. "
-            f"Check comprehensive history and team name canonicalization."
-        )
-        assert opp_match_rate > 0.9, (
-            f"Low opponent match rate: {opp_match_rate:.1%}. "
-            f"Check team_aliases.json for missing mappings."
-        )
-        
-        # Add SOS to the dataframe
-        adj["SOS_raw"] = adj.index.map(sos_scores)
-        print(f"Calculated baseline SOS for {len(sos_scores)} teams (median: {np.median(list(sos_scores.values())):.3f})")
-        
-    except FileNotFoundError:
-        print("Warning: Comprehensive history not found, using offensive ranking as SOS proxy")
-        adj["SOS_raw"] = adj["Off_raw"].rank(pct=True)
+    adj["SOS_raw"] = sos_raw
     
     # Robust normalize to [0,1] range (prevents binary 0/1 cliffs)
     SAO_norm = robust_scale(adj["SAO_raw"])
@@ -799,31 +1431,20 @@ def build_rankings_from_wide(wide_matches_csv: Path, out_csv: Path):
 
     # Step 7: Compute Final PowerScore (will be updated after iterative SOS)
     out["PowerScore"] = (
-        OFF_WEIGHT * out["SAO_norm"] +
-        DEF_WEIGHT * out["SAD_norm"] +
-        SOS_WEIGHT * out["SOS_norm"]
+        off_weight * out["SAO_norm"] +
+        def_weight * out["SAD_norm"] +
+        sos_weight * out["SOS_norm"]
     ).round(4)  # Store 4 decimals, display 3 in frontend
 
     # Add LastGame for inactivity filtering
-    last_date = long.groupby("Team")["Date"].max()
-    out = out.merge(last_date.rename("LastGame"), left_on="Team", right_index=True, how="left")
+    out = out.merge(last_game.rename("LastGame"), left_on="Team", right_index=True, how="left")
 
     out = out.reset_index()  # Team as a column
     
-    # Step 6.5: Compute Iterative SOS (if enabled)
-    if USE_ITERATIVE_SOS:
-        try:
-            import sys
-            from pathlib import Path
-            sys.path.append(str(Path(__file__).parent.parent))
-            from analytics.iterative_opponent_strength_v53_enhanced import compute_iterative_sos_adaptive
-            print("Computing iterative SOS with adaptive K-factor...")
-            sos_iterative_dict = compute_iterative_sos_adaptive("Matched_Games.csv", use_adaptive_k=True)
-            out["SOS_iterative_norm"] = out["Team"].map(sos_iterative_dict)
-            print(f"Added iterative SOS for {out['SOS_iterative_norm'].notna().sum()} teams")
-        except Exception as e:
-            print(f"Warning: Failed to compute iterative SOS: {e}")
-            out["SOS_iterative_norm"] = np.nan
+    # Step 6.5: Iterative SOS (if available)
+    if sos_iterative is not None:
+        out["SOS_iterative_norm"] = out["Team"].map(sos_iterative)
+        print(f"Added iterative SOS for {out['SOS_iterative_norm'].notna().sum()} teams")
     else:
         out["SOS_iterative_norm"] = np.nan
     
@@ -840,23 +1461,19 @@ def build_rankings_from_wide(wide_matches_csv: Path, out_csv: Path):
 
     # Update PowerScore to use SOS_component instead of baseline SOS
     out["PowerScore"] = (
-        OFF_WEIGHT * out["SAO_norm"] +
-        DEF_WEIGHT * out["SAD_norm"] +
-        SOS_WEIGHT * out["SOS_component"]
+        off_weight * out["SAO_norm"] +
+        def_weight * out["SAD_norm"] +
+        sos_weight * out["SOS_component"]
     ).round(4)
     
     # GamesPlayed = filtered count (≤30) used in rankings (per V5 spec)
-    print("Setting GamesPlayed to filtered count for ranking calculations...")
     out["GamesPlayed"] = out["Team"].map(base["GamesPlayed"].to_dict())
     
     # Add GamesTotal for display transparency (all-time count)
-    print("Adding GamesTotal for display transparency...")
-    try:
-        comp_hist = pd.read_csv("data/processed/Team_Game_Histories_COMPREHENSIVE.csv")
-        total_games = comp_hist.groupby("Team").size()
-        out["GamesTotal"] = out["Team"].map(lambda team: total_games.get(team, 0))
+    if games_total is not None:
+        out["GamesTotal"] = out["Team"].map(lambda team: games_total.get(team, 0))
         print(f"Added GamesTotal for {len(out)} teams from comprehensive history")
-    except FileNotFoundError:
+    else:
         print("Warning: Comprehensive history not found, GamesTotal = GamesPlayed")
         out["GamesTotal"] = out["GamesPlayed"]
     
@@ -869,7 +1486,7 @@ def build_rankings_from_wide(wide_matches_csv: Path, out_csv: Path):
     out["Status"] = np.where(out["GamesPlayed"] >= 6, "Active", "Provisional")
     
     # Add is_active flag for frontend (LastGame >= today - 180 days)
-    cutoff = pd.Timestamp.now().normalize() - pd.Timedelta(days=INACTIVE_HIDE_DAYS)
+    cutoff = as_of_date(today) - pd.Timedelta(days=INACTIVE_HIDE_DAYS)
     out["is_active"] = out["LastGame"] >= cutoff
 
     # Sort with offense-first tie-breakers and no ties
@@ -877,35 +1494,18 @@ def build_rankings_from_wide(wide_matches_csv: Path, out_csv: Path):
     out = out.sort_values(sort_cols, ascending=[False,False,False,False,False,True], kind="mergesort")
     # DON'T reset_index(drop=True) - keep TeamKey as index for proper mapping
     out["Rank"] = range(1, len(out) + 1)
+    return out
 
-    # Phase 4: Report SOS timing
-    print(f"⏱ SOS calculation took: {time.time() - t6:.1f}s")
-    
-    # Filter inactive teams (6 months)
-    cutoff = pd.Timestamp.now().normalize() - pd.Timedelta(days=INACTIVE_HIDE_DAYS)
-    out_visible = out[out["LastGame"] >= cutoff].copy()
-    
-    # Re-rank after filtering (ranks should be consecutive 1-N for visible teams)
+def visible_rankings(out: pd.DataFrame) -> pd.DataFrame:
+    """Drop inactive teams and re-rank 1..N (ranks consecutive for visible teams)."""
+    out_visible = out[out["is_active"]].copy()
     out_visible["Rank"] = range(1, len(out_visible) + 1)
+    return out_visible
 
-    # Phase 4: Final summary
-    total_time = time.time() - total_start
-    print(f"\n🎯 PHASE 4 PERFORMANCE SUMMARY:")
-    print(f"⏱ TOTAL RUNTIME: {total_time:.1f}s ({total_time/60:.1f} minutes)")
-    print(f"📊 Teams Ranked: {len(out_visible)}")
-    print(f"⚡ Performance Optimizations:")
-    print(f"   • Vectorized Operations: ✅")
-    print(f"   • DuckDB Aggregations: {'✅' if DUCKDB_AVAILABLE else '❌'}")
-    print(f"   • Parallel Processing: {'✅' if JOBLIB_AVAILABLE else '❌'}")
-    
-    if total_time < 1800:  # Less than 30 minutes
-        print(f"🚀 SUCCESS: Achieved target performance (< 30 minutes)!")
-    elif total_time < 3600:  # Less than 1 hour
-        print(f"✅ Good performance improvement from 4+ hours!")
-    else:
-        print(f"⚠️ Still above target, but progress made")
-    
-    # Sanity check: ensure only master teams in final rankings
+RANKINGS_COLUMNS = ["Rank","Team","PowerScore_adj","PowerScore","GP_Mult","SAO_norm","SAD_norm","SOS_norm","SOS_iterative_norm","GamesPlayed","GamesTotal","Status","is_active","LastGame"]
+
+def check_ranked_teams(out_visible: pd.DataFrame, master_team_names: set, team_name_mapping: dict):
+    """Sanity checks on the published table: master teams only, expected team count."""
     # Create reverse mapping to check against original team names
     reverse_mapping = {v: k for k, v in team_name_mapping.items()}
     original_team_names = set(out_visible["Team"].map(lambda x: reverse_mapping.get(x, x)))
@@ -920,14 +1520,212 @@ def build_rankings_from_wide(wide_matches_csv: Path, out_csv: Path):
     print(f"Sanity check: {unique_teams} master teams ranked")
     if not (150 <= unique_teams <= 180):
         print(f"WARNING: Expected 150-180 AZ U12 teams, got {unique_teams}")
+
+def _frame_memory(df: pd.DataFrame, dropped_columns: int = 0) -> dict:
+    """LOW_MEMORY_MODE profiler fields for a stage's output frame: its size and the estimated MB saved."""
+    if not LOW_MEMORY_MODE:
+        return {}  # deep sizes of object-string frames cost a pass over every row
+    return {"frame_mb": frame_mb(df), "mb_saved": memory_saved_mb(df, dropped_columns)}
+
+def build_rankings_from_wide(wide_matches_csv: Path, out_csv: Path, as_of=None, use_cache=True,
+                             profile_json=None, cprofile_dir=None):
+    """
+    Full V5.3E ranking build.
+
+    `as_of` (date) reproduces the rankings of a past day: games after it are
+    ignored and the window / inactivity cutoffs are measured from it.
+    Defaults to today.
+
+    Stages up to SOS are memoized in the on-disk stage cache (see
+    utils/stage_cache.py); `use_cache=False` or USE_STAGE_CACHE=false
+    recomputes everything.
+
+    Per-stage wall/CPU time, rows and peak memory are written as JSON to
+    `profile_json` (default: next to `out_csv`, `False` to skip);
+    `cprofile_dir` adds a cProfile dump per stage. Games files of at least
+    STREAM_INGEST_MIN_MB are read in chunks (see `stream_window_games`), and
+    their Off_raw/Def_raw come from a DuckDB scan of the file when DuckDB is
+    installed (see `compute_off_def_raw_from_file`). With LOW_MEMORY_MODE the
+    per-game stages also record the estimated MB saved by compact dtypes.
+    """
+    today = as_of_date(as_of)
+    prof = StageProfiler("build_rankings_from_wide", cprofile_dir=cprofile_dir, metadata={
+        "input": str(wide_matches_csv), "output": str(out_csv), "as_of": f"{today:%Y-%m-%d}",
+        "duckdb": DUCKDB_AVAILABLE, "stage_cache": USE_STAGE_CACHE and use_cache,
+        "window_days": WINDOW_DAYS, "max_games": MAX_GAMES, "low_memory": LOW_MEMORY_MODE,
+    })
+    
+    print("\n🚀 V5.3E ranking build:")
+    print(f"   • DuckDB: {'✅' if DUCKDB_AVAILABLE else '❌'}")
+    print(f"   • Rankings as of: {today:%Y-%m-%d}")
+    print(f"   • Low-memory mode: {'✅' if LOW_MEMORY_MODE else '❌'}")
+    print()
+    
+    # Stage cache: keys chain file contents, as-of date and stage config, so a
+    # rerun recomputes from the first stage whose inputs changed
+    cache = StageCache(enabled=USE_STAGE_CACHE and use_cache)
+    long_key = cache.key(STAGE_CACHE_VERSION, "long", file_digest(resolve_table_path(wide_matches_csv)),
+                         file_digest(MASTER_TEAM_LIST_PATH), today, stage_config("long"))
+
+    # Load authoritative AZ U12 master team list
+    with prof.stage("master_list") as info:
+        master_team_names, team_name_mapping = load_master_team_mapping()
+        info["rows"] = len(master_team_names)
+
+    source = resolve_table_path(wide_matches_csv)
+    oversized = source.stat().st_size >= STREAM_INGEST_MIN_MB * 2**20
+    long = cache.load("long", long_key)
+    if long is None:
+        if oversized:
+            # Oversized archive: only materialize the rows that can affect the rankings
+            with prof.stage("stream_ingest") as info:
+                raw, scanned = stream_window_games(wide_matches_csv, master_team_names, today)
+                info.update(rows=len(raw), rows_scanned=scanned, source=source.suffix.lstrip("."))
+            print(f"Streamed {scanned} games, kept {len(raw)} in the ranking window")
+        else:
+            with prof.stage("csv_load") as info:
+                raw = read_table(wide_matches_csv, categorical=LOW_MEMORY_MODE)
+                info.update(rows=len(raw), source=source.suffix.lstrip("."))
+
+        with prof.stage("wide_to_long") as info:
+            long = wide_to_long(raw)
+            del raw
+            info.update(rows=len(long), **_frame_memory(long))
+
+        with prof.stage("clamp_window") as info:
+            long = clamp_window(long, today=today)
+            info.update(rows=len(long), **_frame_memory(long))
+
+        # Filter to include only master teams as ranked entities, with club names
+        with prof.stage("master_filter") as info:
+            long = filter_to_master_teams(long, master_team_names, team_name_mapping)
+            cache.store("long", long_key, long)
+            info.update(rows=len(long), **_frame_memory(long))
+        print(f"Filtered to master teams. Remaining matches: {len(long)}")
+        print(f"Unique teams after filter: {len(long['Team'].unique())}")
+        print("Applied team name mapping with club names")
+    else:
+        prof.stages.append({"stage": "games_window", "wall_s": 0.0, "cpu_s": 0.0, "rows": len(long), "cached": True})
+        print(f"Windowed master-team games loaded from stage cache ({len(long)} rows)")
+    
+    # Factorize Team/Opponent once; later stages work on int32 team codes
+    with prof.stage("team_codes") as info:
+        long, team_codes = TeamCodes.attach(long)
+        info["rows"] = len(team_codes)
+    print(f"Built team code space: {len(team_codes)} teams/opponents")
+
+    # Use filtered dataset for Off_raw/Def_raw calculations (per V5 spec)
+    print("Calculating Off_raw/Def_raw from filtered 30-game window...")
+    with prof.stage("off_def_raw") as info:
+        base_key = cache.key(long_key, stage_config("base"))
+        file_scan = oversized and DUCKDB_FILE_SCAN and DUCKDB_AVAILABLE
+        def off_def_raw():
+            if file_scan:
+                # Windowed, master-filtered SQL over the file; same values and
+                # (first-appearance) team order as the long-frame path
+                base = compute_off_def_raw_from_file(wide_matches_csv, team_name_mapping, today)
+                return base.reindex(team_codes.decode(pd.unique(long["team_id"])))
+            return compute_off_def_raw(long, team_codes)
+        base = cache.cached("base", base_key, off_def_raw)
+        info.update(rows=len(base), cached="base" in cache.hits, duckdb_file_scan=file_scan)
+    
+    # V5.3E: Compute strength-adjusted metrics (includes Expected GD + Performance layer + Adaptive K + Outlier Guard)
+    print("Computing strength-adjusted offense/defense metrics with V5.3E enhancements...")
+    with prof.stage("strength_adjusted") as info:
+        sa_key = cache.key(base_key, stage_config("sa"))
+        def strength_adjusted():
+            games, codes = strength_adjusted_games(long, base, team_codes)
+            info.update(_frame_memory(games, dropped_columns=len(SA_DIAGNOSTIC_COLUMNS)))
+            return aggregate_strength_adjusted(games, codes)[PERFORMANCE_K]
+        sa_metrics = cache.cached("sa", sa_key, strength_adjusted)
+        info.update(rows=len(sa_metrics), cached="sa" in cache.hits)
+
+    # Calculate actual SOS based on opponent strength
+    print("Calculating actual SOS based on opponent strength...")
     
-    cols = ["Rank","Team","PowerScore_adj","PowerScore","GP_Mult","SAO_norm","SAD_norm","SOS_norm","SOS_iterative_norm","GamesPlayed","GamesTotal","Status","is_active","LastGame"]
-    out_visible[cols].to_csv(out_csv, index=False, encoding="utf-8")
+    # Load comprehensive history to get opponent strengths
+    with prof.stage("baseline_sos") as info:
+        sos_key = cache.key(long_key, "sos", file_digest(resolve_table_path(SOS_HISTORY_PATH)),
+                            as_of is not None)
+        sos_raw = cache.load("sos", sos_key)
+        if sos_raw is not None:
+            info["cached"] = True
+            print(f"Baseline SOS for {len(sos_raw)} teams loaded from stage cache")
+        else:
+            try:
+                comp_hist = load_sos_history()
+                if as_of is not None:
+                    comp_hist = comp_hist[played_by(comp_hist["Date"], today)]
+                info["history_rows"] = len(comp_hist)
+
+                # Baseline SOS for every team in one sparse matrix product
+                print(f"Calculating SOS for {len(base)} teams...")
+                sos_raw, sos_stats = compute_baseline_sos(comp_hist, base.index)
+                check_sos_match_rates(sos_stats, len(base))
+                cache.store("sos", sos_key, sos_raw)
+                print(f"Calculated baseline SOS for {len(sos_raw)} teams (median: {sos_raw.median():.3f})")
+
+            except FileNotFoundError:
+                print("Warning: Comprehensive history not found, using offensive ranking as SOS proxy")
+                sos_raw = base["Off_raw"].rank(pct=True)
+                info["fallback"] = "offense_percentile"
+        info["rows"] = len(sos_raw)
+
+    # Step 6.5: Compute Iterative SOS (if enabled)
+    sos_iterative = None
+    if USE_ITERATIVE_SOS:
+        with prof.stage("iterative_sos") as info:
+            elo_key = cache.key(STAGE_CACHE_VERSION, "elo",
+                                file_digest(resolve_table_path(ITERATIVE_SOS_GAMES_PATH)),
+                                file_digest(ITERATIVE_SOS_MASTER_PATH),
+                                None if as_of is None else today, iterative_sos_config())
+            elo = cache.cached("elo", elo_key, lambda: _iterative_sos_frame(compute_iterative_sos(as_of=as_of)))
+            if elo is not None:
+                sos_iterative = dict(zip(elo["Team"], elo["SOS_iterative"]))
+            info.update(rows=0 if elo is None else len(elo), cached="elo" in cache.hits)
+
+    print("Adding GamesTotal for display transparency...")
+    with prof.stage("games_total") as info:
+        total_key = cache.key(STAGE_CACHE_VERSION, "games_total",
+                              file_digest(resolve_table_path(GAMES_TOTAL_HISTORY_PATH)),
+                              None if as_of is None else today)
+        games_total = cache.cached("games_total", total_key, lambda: load_games_total(as_of=as_of))
+        info.update(rows=0 if games_total is None else len(games_total), cached="games_total" in cache.hits)
+
+    with prof.stage("finalize") as info:
+        # LastGame for inactivity filtering
+        last_game = long.groupby("team_id")["Date"].max()
+        last_game.index = team_codes.decode(last_game.index.to_numpy())
+        out = finalize_rankings(base, sa_metrics, sos_raw, sos_iterative, last_game, games_total, today)
+
+        # Filter inactive teams (6 months)
+        out_visible = visible_rankings(out)
+        info.update(rows=len(out_visible), rows_all=len(out))
+    
+    check_ranked_teams(out_visible, master_team_names, team_name_mapping)
+    with prof.stage("write_rankings") as info:
+        out_visible[RANKINGS_COLUMNS].to_csv(out_csv, index=False, encoding="utf-8")
+        info["rows"] = len(out_visible)
     
     # Generate connectivity report
     print("Generating connectivity report...")
-    connectivity_df = generate_connectivity_report(pd.read_csv(wide_matches_csv))
-    connectivity_df.to_csv("connectivity_report_v53e.csv", index=False)
+    with prof.stage("connectivity") as info:
+        if oversized:
+            # The report covers the whole archive: aggregate it chunk by chunk into pairings
+            edges, scanned = stream_opponent_edges(wide_matches_csv)
+            info.update(rows_scanned=scanned, pairings=len(edges))
+        else:
+            edges = read_table(wide_matches_csv, columns=["Team A", "Team B"])
+        connectivity_df = generate_connectivity_report(edges)
+        connectivity_df.to_csv("connectivity_report_v53e.csv", index=False)
+        info["rows"] = len(connectivity_df)
+
+    prof.print_summary()
+    print(f"📊 Teams Ranked: {len(out_visible)}")
+    if profile_json is not False:
+        profile_json = profile_json or profile_path_for(out_csv)
+        prof.write_json(profile_json)
+        print(f"Wrote stage profile to {profile_json}")
     
     return out_visible
 
@@ -938,5 +1736,33 @@ if __name__ == "__main__":
     p = argparse.ArgumentParser()
     p.add_argument("--in", dest="in_path", required=True)
     p.add_argument("--out", dest="out_path", default="Rankings_v53_enhanced.csv")
+    p.add_argument("--as-of", dest="as_of", default=None,
+                   help="Rank as of this date (YYYY-MM-DD); later games are ignored")
+    p.add_argument("--no-cache", action="store_true", help="Recompute every stage (ignore the stage cache)")
+    p.add_argument("--profile-json", default=None,
+                   help="Stage profile JSON path (default: <out>.profile.json next to the rankings)")
+    p.add_argument("--cprofile-dir", default=None, help="Also dump a cProfile file per stage into this directory")
+    p.add_argument("--low-memory", action="store_true",
+                   help="Compact dtypes (categorical teams, int8/int16 scores, float32) for very large inputs")
+    p.add_argument("--stream", action="store_true",
+                   help="Read the games file in chunks whatever its size (default: files over STREAM_INGEST_MIN_MB)")
+    p.add_argument("--sos-engine", choices=SOS_ENGINES, default=None,
+                   help="Engine behind SOS_iterative (default: SOS_ENGINE, i.e. elo)")
+    p.add_argument("--elo-rating-range", choices=ELO_RATING_RANGES, default=None,
+                   help="Elo rating range for the adaptive K-factor (default: ELO_RATING_RANGE, i.e. exact)")
+    p.add_argument("--elo-update-mode", choices=ELO_UPDATE_MODES, default=None,
+                   help="Sequential or batch (row-order independent) Elo updates (default: ELO_UPDATE_MODE)")
     args = p.parse_args()
-    build_rankings_from_wide(Path(args.in_path), Path(args.out_path))
+    if args.sos_engine:
+        SOS_ENGINE = args.sos_engine
+    if args.elo_rating_range:
+        ELO_RATING_RANGE = args.elo_rating_range
+    if args.elo_update_mode:
+        ELO_UPDATE_MODE = args.elo_update_mode
+    if args.low_memory:
+        LOW_MEMORY_MODE = True
+    if args.stream:
+        STREAM_INGEST_MIN_MB = 0
+    build_rankings_from_wide(Path(args.in_path), Path(args.out_path), as_of=args.as_of,
+                             use_cache=not args.no_cache, profile_json=args.profile_json,
+                             cprofile_dir=args.cprofile_dir)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+As-of-date Ranking Snapshots (V5.3E)
+====================================
+
+Computes the rankings as they stood on past dates ("time travel") for
+backtesting and rank-history pages, without re-running the pipeline per date.
+
+All games are loaded, mapped and team-coded once and kept sorted per team
+(team code, then date). A snapshot only masks the cached arrays to its
+ranking window and re-runs the ranking stages on those rows, so every
+Monday of a season costs a fraction of a full build each. Each snapshot
+equals `ranking_engine.py --as-of <date>` on the same inputs.
+
+Limitation: Opponent_BaseStrength in the comprehensive history comes from
+the latest history build, so baseline SOS of old snapshots uses today's
+opponent strengths (same as the engine's --as-of mode).
+
+Usage:
+    python src/core/ranking_snapshots.py --in Matched_Games.csv --as-of 2025-03-03 2025-04-07
+    python src/core/ranking_snapshots.py --in Matched_Games.csv --weekly 2025-01-06 2025-06-30 \\
+        --history-out data/output/Rank_History_v53_enhanced.csv
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from core import ranking_engine as engine
+from utils.team_codes import TeamCodes
+from utils.columnar_io import read_table, resolve_table_path
+from utils.stage_cache import file_digest
+
+SNAPSHOT_CACHE_VERSION = 3
+
+
+class RankingSnapshotStore:
+    """Games cached as per-team sorted arrays; rankings for any as-of date."""
+
+    def __init__(self, long_games, codes, sos_hist, elo_games, games_total_hist, source=None):
+        """
+        Args:
+            long_games: Master-team long games (all dates) with team_id/opp_id
+                and `file_pos` (row position in the full build's long frame)
+            codes: Team code space of `long_games`
+            sos_hist: Canonicalized comprehensive history, or None
+            elo_games: Master-vs-master games for iterative SOS, or None
+            games_total_hist: Comprehensive history (Team, Date) for GamesTotal, or None
+            source: Optional `source_key` of the inputs, for cache checks
+        """
+        # Per-team contiguous, date-ascending; same-day ties keep file order
+        self.long = long_games.sort_values(["team_id", "Date", "file_pos"], kind="mergesort").reset_index(drop=True)
+        self.codes = codes
+        self.dates = self.long["Date"].to_numpy()
+        self.sos_hist = sos_hist
+        self.elo_games = elo_games
+        self.games_total_hist = games_total_hist
+        self.source = source
+        self.snapshots = {}
+        self.snapshot_config = engine.ranking_config()  # settings the memoized snapshots were ranked with
+
+    @classmethod
+    def from_matches(cls, wide_matches_csv, iterative_sos=True,
+                     master_csv=engine.MASTER_TEAM_LIST_PATH,
+                     sos_history_csv=engine.SOS_HISTORY_PATH,
+                     games_total_csv=engine.GAMES_TOTAL_HISTORY_PATH,
+                     elo_games_csv=engine.ITERATIVE_SOS_GAMES_PATH):
+        """Load, map and team-code every game once (inputs as in build_rankings_from_wide)."""
+        t0 = time.time()
+        raw = read_table(wide_matches_csv)
+        master_team_names, team_name_mapping = engine.load_master_team_mapping(master_csv)
+
+        long = engine.wide_to_long(raw)
+        long["file_pos"] = np.arange(len(long))
+        long = long[long["Date"].notna()]
+        long = engine.filter_to_master_teams(long, master_team_names, team_name_mapping)
+        long, codes = TeamCodes.attach(long)
+
+        try:
+            sos_hist = engine.load_sos_history(sos_history_csv)
+        except FileNotFoundError:
+            print("Warning: Comprehensive history not found, using offensive ranking as SOS proxy")
+            sos_hist = None
+
+        elo_games = None
+        if iterative_sos and engine.USE_ITERATIVE_SOS:
+            try:
+                from analytics.iterative_opponent_strength_v53_enhanced import load_and_filter_games
+                elo_games = load_and_filter_games(elo_games_csv)
+            except Exception as e:
+                print(f"Warning: Failed to load games for iterative SOS: {e}")
+
+        try:
+            games_total_hist = read_table(games_total_csv, columns=["Team", "Date"])
+            games_total_hist["Date"] = pd.to_datetime(games_total_hist["Date"], errors="coerce")
+        except FileNotFoundError:
+            games_total_hist = None
+
+        source = cls.source_key(wide_matches_csv, iterative_sos, master_csv, sos_history_csv,
+                                games_total_csv, elo_games_csv)
+        store = cls(long, codes, sos_hist, elo_games, games_total_hist, source=source)
+        print(f"Cached {len(store.long)} team-game rows for {len(codes)} teams/opponents "
+              f"in {time.time() - t0:.1f}s")
+        return store
+
+    # ---- Disk cache ----
+
+    def save(self, path):
+        """Pickle the cached arrays (computed snapshots included)."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle({"version": SNAPSHOT_CACHE_VERSION, **self.__dict__}, path)
+
+    @classmethod
+    def load(cls, path):
+        state = pd.read_pickle(path)
+        if state.pop("version", None) != SNAPSHOT_CACHE_VERSION:
+            raise ValueError(f"Incompatible snapshot cache in {path}")
+        store = cls.__new__(cls)
+        store.__dict__.update(state)
+        return store
+
+    @staticmethod
+    def source_key(wide_matches_csv, iterative_sos=True,
+                   master_csv=engine.MASTER_TEAM_LIST_PATH,
+                   sos_history_csv=engine.SOS_HISTORY_PATH,
+                   games_total_csv=engine.GAMES_TOTAL_HISTORY_PATH,
+                   elo_games_csv=engine.ITERATIVE_SOS_GAMES_PATH) -> tuple:
+        """
+        Content digests of every input of `from_matches` plus the settings
+        the cached snapshots depend on: the engine's ranking settings
+        (`ranking_config`) and the iterative SOS engine config (same
+        arguments as `from_matches`).
+        """
+        iterative_sos = bool(iterative_sos and engine.USE_ITERATIVE_SOS)
+        inputs = [resolve_table_path(wide_matches_csv), Path(master_csv),
+                  resolve_table_path(sos_history_csv), resolve_table_path(games_total_csv)]
+        if iterative_sos:
+            inputs += [resolve_table_path(elo_games_csv), Path(engine.ITERATIVE_SOS_MASTER_PATH)]
+        digests = tuple((str(path), file_digest(path)) for path in inputs)
+        return digests + (("ranking", engine.ranking_config()),
+                          ("iterative_sos", iterative_sos, engine.iterative_sos_config() if iterative_sos else None))
+
+    @classmethod
+    def cached(cls, wide_matches_csv, cache_path, **kwargs):
+        """
+        Load `cache_path` if it was built from the current contents of every
+        input file with the same settings, else rebuild it.
+        """
+        if cache_path and Path(cache_path).exists():
+            try:
+                store = cls.load(cache_path)
+            except ValueError:
+                store = None  # older cache layout
+            if store is not None and store.source == cls.source_key(wide_matches_csv, **kwargs):
+                print(f"Loaded snapshot cache {cache_path}")
+                return store
+            print(f"Snapshot cache {cache_path} is stale, rebuilding")
+        store = cls.from_matches(wide_matches_csv, **kwargs)
+        if cache_path:
+            store.save(cache_path)
+        return store
+
+    # ---- Snapshots ----
+
+    def window_games(self, today) -> pd.DataFrame:
+        """Ranking-window rows for `today` (per-team sorted, date ascending)."""
+        end = np.datetime64(today + pd.Timedelta(days=1))
+        cutoff = np.datetime64(today - pd.Timedelta(days=engine.WINDOW_DAYS))
+        return self.long[(self.dates >= cutoff) & (self.dates < end)]
+
+    def rankings_as_of(self, as_of) -> pd.DataFrame:
+        """
+        All ranked teams as of `as_of` (same table as finalize_rankings).
+
+        Results are memoized per date; changing an engine setting in
+        between drops the memo.
+        """
+        config = engine.ranking_config()
+        if config != self.snapshot_config:
+            self.snapshots, self.snapshot_config = {}, config
+        today = engine.as_of_date(as_of)
+        if today in self.snapshots:
+            return self.snapshots[today]
+
+        long = self.window_games(today)
+        if long.empty:
+            self.snapshots[today] = empty_rankings()  # before the first game
+            return self.snapshots[today]
+        # League means/scales sum in team order; use the full build's
+        # first-appearance order so snapshots match it bit for bit
+        first_pos = long.groupby("team_id")["file_pos"].min().sort_values()
+        order = self.codes.decode(first_pos.index.to_numpy())
+        base = engine.compute_off_def_raw(long, self.codes).loc[order]
+        sa_metrics = engine.compute_strength_adjusted_metrics(long, base, self.codes).loc[order]
+
+        if self.sos_hist is not None:
+            hist = self.sos_hist[engine.played_by(self.sos_hist["Date"], today)]
+            sos_raw, sos_stats = engine.compute_baseline_sos(hist, base.index)
+            engine.check_sos_match_rates(sos_stats, len(base))
+        else:
+            sos_raw = base["Off_raw"].rank(pct=True)
+
+        sos_iterative = None
+        if self.elo_games is not None:
+            from analytics.iterative_opponent_strength_v53_enhanced import games_played_by
+            elo_games = games_played_by(self.elo_games, today)
+            if len(elo_games):
+                sos_iterative, _ = engine.compute_sos_from_games(elo_games)
+
+        games_total = None
+        if self.games_total_hist is not None:
+            hist = self.games_total_hist[engine.played_by(self.games_total_hist["Date"], today)]
+            games_total = hist.groupby("Team").size()
+
+        last_game = long.groupby("team_id")["Date"].max()
+        last_game.index = self.codes.decode(last_game.index.to_numpy())
+
+        out = engine.finalize_rankings(base, sa_metrics, sos_raw, sos_iterative, last_game, games_total, today)
+        self.snapshots[today] = out
+        return out
+
+    def rank_history(self, dates) -> pd.DataFrame:
+        """
+        Visible ranks for each date in `dates`, long format (AsOf, Rank, Team, ...).
+        """
+        frames = []
+        for as_of in dates:
+            visible = engine.visible_rankings(self.rankings_as_of(as_of))
+            visible = visible[["Rank", "Team", "PowerScore_adj", "GamesPlayed", "Status"]].copy()
+            visible.insert(0, "AsOf", engine.as_of_date(as_of))
+            frames.append(visible)
+        return pd.concat(frames, ignore_index=True)
+
+
+def empty_rankings() -> pd.DataFrame:
+    """Rankings table of a day without ranked teams (no game in the window)."""
+    return pd.DataFrame(columns=engine.RANKINGS_COLUMNS).astype({"is_active": bool})
+
+
+def weekly_dates(start, end, weekday="MON"):
+    """Every `weekday` between start and end (inclusive), e.g. each Monday of a season."""
+    return list(pd.date_range(start, end, freq=f"W-{weekday}"))
+
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="As-of-date V5.3E ranking snapshots")
+    p.add_argument("--in", dest="in_path", required=True)
+    p.add_argument("--as-of", dest="as_of", nargs="*", default=[], help="Snapshot dates (YYYY-MM-DD)")
+    p.add_argument("--weekly", nargs=2, metavar=("START", "END"), help="Every Monday from START to END")
+    p.add_argument("--out-dir", default="data/output/snapshots")
+    p.add_argument("--history-out", default=None, help="Combined rank history CSV")
+    p.add_argument("--cache", default="data/state/snapshot_store.pkl")
+    p.add_argument("--no-iterative-sos", action="store_true", help="Skip the Elo SOS (baseline SOS only)")
+    args = p.parse_args()
+
+    dates = [engine.as_of_date(d) for d in args.as_of]
+    if args.weekly:
+        dates += weekly_dates(*args.weekly)
+    if not dates:
+        p.error("give --as-of dates and/or --weekly START END")
+
+    store = RankingSnapshotStore.cached(Path(args.in_path), args.cache,
+                                        iterative_sos=not args.no_iterative_sos)
+    os.makedirs(args.out_dir, exist_ok=True)
+    for today in sorted(set(dates)):
+        t0 = time.time()
+        visible = engine.visible_rankings(store.rankings_as_of(today))
+        out_csv = os.path.join(args.out_dir, f"Rankings_v53_enhanced_{today:%Y-%m-%d}.csv")
+        visible[engine.RANKINGS_COLUMNS].to_csv(out_csv, index=False, encoding="utf-8")
+        print(f"📅 {today:%Y-%m-%d}: {len(visible)} teams -> {out_csv} ({time.time() - t0:.1f}s)")
+    if args.history_out:
+        store.rank_history(sorted(set(dates))).to_csv(args.history_out, index=False, encoding="utf-8")
+        print(f"Wrote rank history to {args.history_out}")
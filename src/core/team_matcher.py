@@ -24,7 +24,12 @@ from fuzzywuzzy import fuzz
 from fuzzywuzzy import process
 from collections import Counter
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.columnar_io import write_table
 
 # ========== CONFIGURATION ========== #
 FUZZY_MATCH_THRESHOLD = 90  # Configurable threshold for fuzzy matching
@@ -33,6 +38,10 @@ FUZZY_MATCH_THRESHOLD = 90  # Configurable threshold for fuzzy matching
 AGE_MISMATCH_PATTERN = r'\b(2013|2015|13|15|u13|u15|14g|girls)\b'
 OUT_OF_STATE_PATTERN = r'\b(ca|nv|tx|nm|co|wa|ut|or|dc|pr|hi|ak|can|mexico|bc|ab)\b'
 
+# Input file names
+MASTER_TEAM_LIST_FILE = "data/input/AZ MALE U12 MASTER TEAM LIST.csv"
+GAME_HISTORY_FILE = "data/input/AZ MALE U12 GAME HISTORY LAST 18 MONTHS .csv"
+
 # Output file names
 MATCHED_GAMES_FILE = "data/processed/Matched_Games.csv"
 UNMATCHED_TEAMS_FILE = "Unmatched_Teams_Log.csv"
@@ -118,8 +127,18 @@ def analyze_team_appearances(games_df, team_column):
     
     return team_stats
 
-def main():
-    """Main function to run the team matching and categorization process"""
+def main(master_df=None, games_df=None):
+    """
+    Main function to run the team matching and categorization process
+    
+    Args:
+        master_df: Already-loaded master team list (read from data/input when None)
+        games_df: Already-loaded game history (read from data/input when None)
+    
+    Returns:
+        Matched games DataFrame (also saved to MATCHED_GAMES_FILE), or None if
+        the inputs could not be loaded
+    """
     
     print("AZ U12 Game History Team Matcher & Categorizer")
     print("=" * 60)
@@ -130,8 +149,10 @@ def main():
     print("Loading data files...")
     
     try:
-        master_df = pd.read_csv("data/input/AZ MALE U12 MASTER TEAM LIST.csv")
-        games_df = pd.read_csv("data/input/AZ MALE U12 GAME HISTORY LAST 18 MONTHS .csv")
+        if master_df is None:
+            master_df = pd.read_csv(MASTER_TEAM_LIST_FILE)
+        if games_df is None:
+            games_df = pd.read_csv(GAME_HISTORY_FILE)
         print(f"+ Loaded {len(master_df)} teams from master list")
         print(f"+ Loaded {len(games_df)} games from game history")
     except FileNotFoundError as e:
@@ -300,8 +321,8 @@ def main():
     print("\nSaving output files...")
     
     # Save matched games
-    games_df.to_csv(MATCHED_GAMES_FILE, index=False)
-    print(f"+ Saved matched games to {MATCHED_GAMES_FILE}")
+    matched_path = write_table(games_df, MATCHED_GAMES_FILE)
+    print(f"+ Saved matched games to {matched_path}")
     
     # Save unmatched teams log
     print(f"+ Saved unmatched teams log to {UNMATCHED_TEAMS_FILE}")
@@ -382,6 +403,7 @@ PROCESSING COMPLETE!
     if conflicting_matches:
         print(f"   - {CONFLICTING_MATCH_FILE}")
     print(f"   - {MATCH_SUMMARY_FILE}")
+    return games_df
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+What-If Scenarios (V5.3E)
+=========================
+
+Answers "what happens to our rank if we beat X 2-1?" without re-running
+`ranking_engine.py`: the prepared incremental ranking state stays in memory
+and each scenario applies its hypothetical games to a copy of it.
+
+A scenario goes through `IncrementalRanker.apply_delta`, so only the teams
+that played, their opponent neighbourhood and the league-wide normalization
+are recomputed; the resident state itself is never modified, and scenarios
+can be evaluated one after another against the same baseline. The ranking
+date stays at the state's as-of date, so no games expire.
+
+The Elo iterations (iterative SOS) are warm-started from the stored ratings
+by default; `refresh_elo=False` keeps the stored iterative SOS for the
+fastest answer.
+
+Usage:
+    python src/core/what_if.py --state data/state/ranking_state.pkl \\
+        --game "Team A FC" "Team B SC" 2 1 --game "Team A FC" "Team C" 0 0
+"""
+import copy
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from core import ranking_engine as engine
+from core.incremental_ranking import STATE_PATH, IncrementalRanker
+
+SCENARIO_COLUMNS = ["Team", "Rank_before", "Rank", "RankChange", "PowerScore_adj_before",
+                    "PowerScore_adj", "in_scenario"]
+
+
+def scenario_games(games, date) -> pd.DataFrame:
+    """
+    Hypothetical games as a wide games frame.
+
+    Args:
+        games: (team_a, team_b, score_a, score_b) tuples
+        date: Date the games count as played
+    """
+    wide = pd.DataFrame(list(games), columns=["Team A", "Team B", "Score A", "Score B"])
+    wide["Date"] = engine.as_of_date(date)
+    return wide
+
+
+class ScenarioEngine:
+    """Resident ranking state that evaluates hypothetical results."""
+
+    def __init__(self, ranker: IncrementalRanker):
+        self.ranker = ranker
+        self.baseline = engine.visible_rankings(ranker.rankings())
+        # Ranked names carry the club ("Team Name Club"); games use the master name
+        self._master_names = {ranked: name for name, ranked in ranker.team_name_mapping.items()}
+
+    @classmethod
+    def from_state(cls, path=STATE_PATH):
+        """Scenario engine over a state saved by `incremental_ranking.py init`."""
+        return cls(IncrementalRanker.load(path))
+
+    def _to_master_names(self, wide: pd.DataFrame) -> pd.DataFrame:
+        wide = wide.copy()
+        for col in ["Team A", "Team B"]:
+            wide[col] = wide[col].map(lambda name: self._master_names.get(name, name))
+        known = self.ranker.master_team_names
+        unknown = ~(wide["Team A"].isin(known) | wide["Team B"].isin(known))
+        if unknown.any():
+            games = wide.loc[unknown, ["Team A", "Team B"]].to_numpy().tolist()
+            raise ValueError(f"Scenario games without a ranked team: {games}")
+        return wide
+
+    def evaluate(self, games, refresh_elo=True) -> pd.DataFrame:
+        """
+        Rankings after hypothetical games, compared with the current ones.
+
+        Args:
+            games: Wide games frame (Team A, Team B, Score A, Score B and
+                optionally Date) or (team_a, team_b, score_a, score_b) tuples;
+                teams by ranked or master name; dates default to the state's as-of date
+            refresh_elo: Warm-start the Elo iterations on the scenario games
+
+        Returns:
+            Teams whose visible rank or PowerScore_adj changed, plus the
+            scenario teams (SCENARIO_COLUMNS), ordered by their new rank.
+            The full scenario rankings are kept in `self.last_rankings`.
+        """
+        t0 = time.time()
+        today = self.ranker.as_of
+        wide = games if isinstance(games, pd.DataFrame) else scenario_games(games, today)
+        if "Date" not in wide.columns:
+            wide = wide.assign(Date=today)
+        wide = self._to_master_names(wide)
+
+        # apply_delta rebinds the state attributes instead of mutating them,
+        # so a shallow copy leaves the resident state untouched
+        ranker = copy.copy(self.ranker)
+        if not refresh_elo:
+            ranker.elo_games = None  # keep the stored iterative SOS
+        self.last_rankings = engine.visible_rankings(ranker.apply_delta(wide, today=today))
+
+        before = self.baseline.set_index("Team")
+        after = self.last_rankings.set_index("Team")
+        out = pd.DataFrame({
+            "Rank_before": before["Rank"].reindex(after.index),
+            "Rank": after["Rank"],
+            "PowerScore_adj_before": before["PowerScore_adj"].reindex(after.index),
+            "PowerScore_adj": after["PowerScore_adj"],
+        })
+        out["RankChange"] = out["Rank_before"] - out["Rank"]  # positive = moved up
+        played = pd.concat([wide["Team A"], wide["Team B"]]).map(self.ranker.team_name_mapping)
+        out["in_scenario"] = out.index.isin(played)
+        moved = (out["Rank"] != out["Rank_before"]) | (out["PowerScore_adj"] != out["PowerScore_adj_before"])
+        out = out[moved | out["in_scenario"]].rename_axis("Team").reset_index()
+        print(f"⏱ Scenario with {len(wide)} games evaluated in {time.time() - t0:.2f}s "
+              f"({len(out)} teams changed)")
+        return out[SCENARIO_COLUMNS]
+
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="What-if V5.3E rankings for hypothetical results")
+    p.add_argument("--state", default=STATE_PATH, help="State saved by incremental_ranking.py init")
+    p.add_argument("--game", nargs=4, action="append", required=True,
+                   metavar=("TEAM_A", "TEAM_B", "SCORE_A", "SCORE_B"))
+    p.add_argument("--no-elo", action="store_true", help="Keep the stored iterative SOS (fastest)")
+    p.add_argument("--out", dest="out_path", default=None, help="Optional CSV of the changed teams")
+    args = p.parse_args()
+
+    scenario = ScenarioEngine.from_state(args.state)
+    games = [(a, b, int(sa), int(sb)) for a, b, sa, sb in args.game]
+    changes = scenario.evaluate(games, refresh_elo=not args.no_elo)
+    with pd.option_context("display.max_rows", 100, "display.width", 140):
+        print(changes.to_string(index=False))
+    if args.out_path:
+        changes.to_csv(args.out_path, index=False, encoding="utf-8")
+        print(f"Wrote {len(changes)} changed teams to {args.out_path}")
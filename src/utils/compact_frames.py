@@ -0,0 +1,76 @@
+"""
+Compact per-game frames for the ranking engine's low-memory mode.
+
+With LOW_MEMORY_MODE the long-format games keep team names as categoricals
+over one shared name list (an int code per row instead of a string per
+row), scores as int8/int16 and the strength-adjusted intermediates as
+float32, and stages hand frames on without copying them. frame_mb() and
+memory_saved_mb() feed the per-stage memory report of the stage profiler.
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+_MB = 1024 * 1024
+INT8_SCORE_MAX = 100  # headroom for the GOAL_DIFF_CAP margin arithmetic on int8 scores
+
+
+def compact_scores(values) -> np.ndarray:
+    """Scores as int8 (all within ±INT8_SCORE_MAX) or int16, float32 if any are missing."""
+    scores = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+    if np.isnan(scores).any():
+        return scores.astype(np.float32)
+    top = np.abs(scores).max() if len(scores) else 0
+    if top <= INT8_SCORE_MAX:
+        return scores.astype(np.int8)
+    return scores.astype(np.int16 if top <= np.iinfo(np.int16).max else np.int32)
+
+
+def remap_categories(values: pd.Series, mapping: dict) -> pd.Series:
+    """
+    Map a categorical Series through `mapping` on its categories only
+    (unmapped names become NaN), without decoding the rows to strings.
+    """
+    cat = values.cat
+    new_codes, names = pd.factorize(cat.categories.map(mapping))
+    codes = cat.codes.to_numpy()
+    codes = np.where(codes >= 0, new_codes[codes], -1)
+    mapped = pd.Categorical.from_codes(codes, categories=names).remove_unused_categories()
+    return pd.Series(mapped, index=values.index, name=values.name)
+
+
+def take_rows(df: pd.DataFrame, mask, **columns) -> pd.DataFrame:
+    """
+    Rows of `df` where `mask` holds, as a new frame built column by column
+    (one copy of the kept rows; `columns` replace same-named columns first).
+    """
+    mask = np.asarray(mask, dtype=bool)
+    return pd.DataFrame({col: columns.get(col, df[col])[mask] for col in df.columns}, copy=False)
+
+
+def frame_mb(df: pd.DataFrame) -> float:
+    """Deep in-memory size of `df` in MB."""
+    return round(float(df.memory_usage(deep=True).sum()) / _MB, 2)
+
+
+def _default_column_bytes(col: pd.Series) -> int:
+    """Estimated bytes of `col` with the engine's default dtypes (object strings, 64-bit numbers)."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes = col.cat.codes.to_numpy()
+        sizes = np.array([sys.getsizeof(name) for name in col.cat.categories], dtype=np.int64)
+        counts = np.bincount(codes[codes >= 0], minlength=len(sizes))
+        return 8 * len(col) + int(counts @ sizes)  # a pointer plus a string object per row
+    if col.dtype.kind in "iuf":
+        return 8 * len(col)
+    return int(col.memory_usage(deep=True, index=False))
+
+
+def memory_saved_mb(df: pd.DataFrame, dropped_columns: int = 0) -> float:
+    """
+    Estimated MB `df` saves over the same frame with default dtypes, plus
+    `dropped_columns` 64-bit columns the default frame carries and this
+    one skips.
+    """
+    default = sum(_default_column_bytes(df[col]) for col in df.columns) + 8 * len(df) * dropped_columns
+    return round(max(0.0, default - float(df.memory_usage(deep=True, index=False).sum())) / _MB, 2)
@@ -0,0 +1,130 @@
+"""
+Opponent-graph connectivity on integer team codes.
+
+Games are factorized into team codes and loaded into one symmetric
+scipy.sparse CSR adjacency (distinct opponents, games per pair as the edge
+weight). Connected components come from scipy.sparse.csgraph; bridge teams
+(articulation points: teams whose removal splits their component) from one
+iterative depth-first pass over the CSR arrays, so no graph objects are built.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from utils.team_codes import TeamCodes
+
+
+def opponent_graph(team_a, team_b, games=None):
+    """
+    Symmetric team x team CSR matrix of games played (self-games dropped).
+
+    Args:
+        team_a, team_b: Team name arrays, one entry per game (NaN rows skipped)
+        games: Optional games per entry, for pre-aggregated pairings (default 1)
+
+    Returns:
+        Tuple of (CSR matrix, TeamCodes)
+    """
+    i, j, codes = TeamCodes.factorize_pair(team_a, team_b)
+    keep = (i >= 0) & (j >= 0) & (i != j)  # drop missing names and self-games
+    i, j = i[keep], j[keep]
+    weight = np.ones(len(i), dtype=np.int32) if games is None else np.asarray(games, dtype=np.int32)[keep]
+    n = len(codes)
+    graph = sparse.csr_matrix((np.concatenate([weight, weight]), (np.concatenate([i, j]), np.concatenate([j, i]))),
+                              shape=(n, n))
+    graph.sum_duplicates()
+    return graph, codes
+
+
+def articulation_points(graph):
+    """
+    Bridge teams of an undirected CSR graph (iterative Tarjan).
+
+    Returns:
+        Tuple of (bool array: team is an articulation point, int array:
+        teams cut off from the largest remaining piece if the team is removed)
+    """
+    n = graph.shape[0]
+    indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+    disc, low, parent, size = [-1] * n, [0] * n, [-1] * n, [1] * n
+    root_of = [0] * n
+    sep_sum, sep_max = [0] * n, [0] * n  # child subtrees that reach the rest only through the team
+    nxt = indptr[:-1]
+    timer = 0
+    for root in range(n):
+        if disc[root] != -1:
+            continue
+        disc[root] = low[root] = timer
+        root_of[root] = root
+        timer += 1
+        stack = [root]
+        while stack:
+            v = stack[-1]
+            p = nxt[v]
+            if p < indptr[v + 1]:
+                nxt[v] = p + 1
+                w = indices[p]
+                if disc[w] == -1:
+                    parent[w] = v
+                    root_of[w] = root
+                    disc[w] = low[w] = timer
+                    timer += 1
+                    stack.append(w)
+                elif w != parent[v] and disc[w] < low[v]:
+                    low[v] = disc[w]
+                continue
+            stack.pop()
+            u = parent[v]
+            if u == -1:
+                continue
+            size[u] += size[v]
+            if low[v] < low[u]:
+                low[u] = low[v]
+            if low[v] >= disc[u]:  # no back edge from v's subtree above u
+                sep_sum[u] += size[v]
+                if size[v] > sep_max[u]:
+                    sep_max[u] = size[v]
+
+    # Removing a team leaves its separated child subtrees plus the rest of
+    # the component (nothing for a DFS root, whose children are all separated)
+    sep_sum, sep_max = np.asarray(sep_sum), np.asarray(sep_max)
+    comp_size = np.asarray(size)[np.asarray(root_of, dtype=np.int64)]
+    is_root = np.asarray(parent) == -1
+    is_cut = np.where(is_root, sep_sum > sep_max, sep_sum > 0)
+    rest = comp_size - 1 - sep_sum
+    separated = np.where(is_cut, comp_size - 1 - np.maximum(sep_max, rest), 0)
+    return is_cut, separated
+
+
+def connectivity_frame(team_a, team_b, bridges=True, games=None) -> pd.DataFrame:
+    """
+    Per-team connectivity of the opponent graph.
+
+    Components are numbered by size (0 = largest). `bridges=False` skips
+    the depth-first pass for bridge teams (IsBridge/SeparatedTeams are
+    then False/0). `games` gives the games per entry when the input is
+    already aggregated into distinct pairings.
+
+    Returns:
+        DataFrame with Team, ComponentID, ComponentSize, Degree (distinct
+        opponents), Games, IsBridge, SeparatedTeams
+    """
+    graph, codes = opponent_graph(team_a, team_b, games)
+    n_comp, labels = connected_components(graph, directed=False)
+    comp_sizes = np.bincount(labels, minlength=n_comp)
+    order = np.argsort(-comp_sizes, kind="stable")
+    rank = np.empty(n_comp, dtype=np.int64)
+    rank[order] = np.arange(n_comp)
+    is_cut, separated = articulation_points(graph) if bridges else (np.zeros(len(codes), bool),
+                                                                     np.zeros(len(codes), np.int64))
+    report = pd.DataFrame({
+        "Team": codes.names.to_numpy(),
+        "ComponentID": rank[labels],
+        "ComponentSize": comp_sizes[labels],
+        "Degree": np.diff(graph.indptr),
+        "Games": np.asarray(graph.sum(axis=1)).ravel(),
+        "IsBridge": is_cut,
+        "SeparatedTeams": separated,
+    })
+    return report.sort_values(["ComponentID", "Team"], kind="stable").reset_index(drop=True)
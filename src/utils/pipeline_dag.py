@@ -0,0 +1,93 @@
+"""
+Minimal in-process DAG runner for pipeline stages.
+
+Stages are plain functions; each one receives the results of its
+dependencies as positional arguments (in the order they were declared), so
+DataFrames move between stages in memory instead of through CSV files.
+Stages whose dependencies are done run concurrently on a thread pool:
+pandas, NumPy and DuckDB release the GIL in their heavy loops, and the file
+reads/writes overlap as well.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class PipelineStageError(RuntimeError):
+    """A stage raised; the original exception is chained as __cause__."""
+
+    def __init__(self, stage):
+        super().__init__(f"Pipeline stage '{stage}' failed")
+        self.stage = stage
+
+
+class PipelineDAG:
+    """Named stages with dependencies, executed in topological waves."""
+
+    def __init__(self):
+        self.stages = {}
+        self.timings = {}
+
+    def add(self, name, func, deps=()):
+        """Register `func(*dep_results)` as stage `name`; dependencies must already exist."""
+        missing = [d for d in deps if d not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {missing}")
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage '{name}'")
+        self.stages[name] = (func, tuple(deps))
+        return self
+
+    def required(self, targets=None) -> list:
+        """Stages needed for `targets` (all stages when None), in declaration order."""
+        if targets is None:
+            return list(self.stages)
+        needed, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            if name not in needed:
+                needed.add(name)
+                todo.extend(self.stages[name][1])
+        return [name for name in self.stages if name in needed]
+
+    def run(self, targets=None, max_workers=4, results=None) -> dict:
+        """
+        Run the stages needed for `targets`.
+
+        Args:
+            targets: Stage names to produce (default: every stage)
+            max_workers: Thread pool size; 1 runs the stages serially
+            results: Precomputed stage results (those stages are skipped)
+
+        Returns:
+            Dict of stage name -> result for every stage that ran or was given
+        """
+        results = dict(results or {})
+        pending = [name for name in self.required(targets) if name not in results]
+        running = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                for name in [n for n in pending if all(d in results for d in self.stages[n][1])]:
+                    func, deps = self.stages[name]
+                    running[pool.submit(self._timed, name, func, [results[d] for d in deps])] = name
+                    pending.remove(name)
+                if not running:
+                    raise ValueError(f"Unsatisfiable stages: {pending}")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        for other in running:
+                            other.cancel()
+                        raise PipelineStageError(name) from e
+        return results
+
+    def _timed(self, name, func, args):
+        t0 = time.time()
+        try:
+            return func(*args)
+        finally:
+            self.timings[name] = time.time() - t0
@@ -0,0 +1,37 @@
+"""
+Sparse iterative solvers shared by the Massey and Colley SOS engines.
+
+scipy renamed the relative tolerance of `cg` from `tol` to `rtol` in 1.12
+(and later dropped `tol`); `conjugate_gradient` passes it under whichever
+name the installed scipy accepts, and warns when CG stops short of it.
+"""
+import warnings
+from inspect import signature
+
+import numpy as np
+from scipy.sparse.linalg import cg
+
+CG_TOL_ARG = "rtol" if "rtol" in signature(cg).parameters else "tol"
+
+
+def conjugate_gradient(matrix, rhs, tol: float, x0=None, maxiter: int = None):
+    """
+    Solve `matrix @ x = rhs` (symmetric positive definite) with scipy's CG.
+
+    Args:
+        matrix, rhs: Sparse system
+        tol: Relative residual tolerance
+        x0: Optional starting vector (warm start)
+        maxiter: Iteration cap (scipy default when None)
+
+    Returns:
+        Solution vector (the last iterate, with a RuntimeWarning, when CG
+        did not reach `tol` within `maxiter` iterations)
+    """
+    solution, info = cg(matrix, rhs, x0=x0, maxiter=maxiter, **{CG_TOL_ARG: tol})
+    if info != 0:
+        residual = np.linalg.norm(rhs - matrix @ solution) / max(np.linalg.norm(rhs), np.finfo(float).tiny)
+        reason = f"stopped after {info} iterations" if info > 0 else f"failed (info={info})"
+        warnings.warn(f"CG {reason} without reaching tol={tol:g} (relative residual {residual:.2e}); "
+                      f"ratings are not fully converged", RuntimeWarning, stacklevel=2)
+    return solution
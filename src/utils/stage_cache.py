@@ -0,0 +1,123 @@
+"""
+Content-hashed on-disk cache for ranking pipeline stages.
+
+Each stage result is stored as one Parquet file named `<stage>-<key>.parquet`,
+where the key is a SHA-256 over the stage's inputs: file contents, the key
+of the upstream stage, the as-of date and the config values the stage reads.
+Keys are chained, so a rerun recomputes from the first stage whose inputs
+changed and reads everything upstream of it from disk.
+
+The directory is size-bounded: after each write the least recently used
+files (mtime, refreshed on every hit) are evicted until the total fits.
+"""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+STAGE_CACHE_DIR = os.getenv("STAGE_CACHE_DIR", "data/cache/stages")
+STAGE_CACHE_MAX_MB = float(os.getenv("STAGE_CACHE_MAX_MB", "512"))
+
+_SERIES_COLUMN = "__series__"
+_file_digests = {}
+
+
+def file_digest(path) -> str:
+    """SHA-256 of a file's contents ('missing' if it does not exist); memoized per mtime/size."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return "missing"
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _file_digests:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _file_digests[memo_key] = h.hexdigest()
+    return _file_digests[memo_key]
+
+
+class StageCache:
+    """Parquet files keyed by input hash, with LRU eviction by total size."""
+
+    def __init__(self, root=STAGE_CACHE_DIR, max_mb=STAGE_CACHE_MAX_MB, enabled=True):
+        self.root = Path(root)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled and PARQUET_AVAILABLE
+        self.hits = []
+        self.misses = []
+        if enabled and not PARQUET_AVAILABLE:
+            print("Warning: pyarrow not installed, stage cache disabled")
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Hash of the given parts (strings, numbers, dates, dicts of config values)."""
+        h = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, dict):
+                part = sorted(part.items())
+            h.update(repr(part).encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()[:32]
+
+    def _path(self, stage, key) -> Path:
+        return self.root / f"{stage}-{key}.parquet"
+
+    def load(self, stage, key):
+        """Cached DataFrame/Series for (stage, key), or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(stage, key)
+        try:
+            df = pd.read_parquet(path)
+        except (FileNotFoundError, OSError):
+            self.misses.append(stage)
+            return None
+        os.utime(path)  # mark as recently used
+        self.hits.append(stage)
+        if list(df.columns) == [_SERIES_COLUMN]:
+            return df[_SERIES_COLUMN].rename(None)
+        return df
+
+    def store(self, stage, key, obj):
+        """Write a DataFrame/Series for (stage, key), then enforce the size bound."""
+        if not self.enabled or obj is None:
+            return
+        if isinstance(obj, pd.Series):
+            obj = obj.to_frame(_SERIES_COLUMN)
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(stage, key)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        obj.to_parquet(tmp)
+        os.replace(tmp, path)  # readers never see a partial file
+        self.evict()
+
+    def cached(self, stage, key, compute):
+        """Load (stage, key) or run `compute()` and store its result (None is not stored)."""
+        obj = self.load(stage, key)
+        if obj is None:
+            obj = compute()
+            self.store(stage, key, obj)
+        return obj
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.root.glob("*.parquet")) if self.root.exists() else 0
+
+    def evict(self):
+        """Delete least recently used files until the cache fits in max_bytes."""
+        files = sorted(self.root.glob("*.parquet"), key=lambda p: p.stat().st_mtime_ns)
+        total = sum(p.stat().st_size for p in files)
+        for p in files:
+            if total <= self.max_bytes:
+                break
+            total -= p.stat().st_size
+            p.unlink(missing_ok=True)
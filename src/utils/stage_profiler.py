@@ -0,0 +1,160 @@
+"""
+Per-stage profiling for ranking runs.
+
+Each `with profiler.stage(name) as info:` block records wall time, CPU time,
+the process's peak RSS so far and whatever the stage adds to `info` (row
+counts, cache hits). The run is written as JSON next to the rankings
+output, so stage costs can be compared across releases. With
+`cprofile_dir`, every stage also dumps a cProfile file
+(`<nn>_<stage>.prof`, open with pstats or snakeviz).
+
+Peak RSS is a process-wide high-water mark, so the stage that raises it is
+the one that set the peak. For an exact per-stage peak, PROFILE_MEMORY=true
+(or `trace_memory=True`) adds tracemalloc's traced peak, which also covers
+pandas/NumPy buffers; tracing every allocation slows pure-Python stages
+(e.g. the Elo loop) several times over, so it is off by default.
+"""
+import cProfile
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_MEMORY = os.getenv("PROFILE_MEMORY", "false").lower() == "true"
+PROFILE_REPORT_VERSION = 1
+
+_MB = 1024 * 1024
+
+
+def _max_rss_mb():
+    """Process high-water RSS in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / _MB if platform.system() == "Darwin" else rss / 1024  # bytes on macOS, KB on Linux
+
+
+class StageProfiler:
+    """Collects one record per pipeline stage."""
+
+    def __init__(self, run_name="ranking_run", trace_memory=PROFILE_MEMORY, cprofile_dir=None, metadata=None):
+        self.run_name = run_name
+        self.trace_memory = trace_memory
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.metadata = dict(metadata or {})
+        self.stages = []
+        self.started = datetime.now()
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._owns_tracemalloc = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Profile one stage; the yielded dict is merged into its record.
+
+        Example:
+            with profiler.stage("csv_load") as info:
+                raw = pd.read_csv(path)
+                info["rows"] = len(raw)
+        """
+        info = {}
+        mem0 = 0
+        if self.trace_memory:
+            mem0 = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        prof = cProfile.Profile() if self.cprofile_dir else None
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        if prof:
+            prof.enable()
+        try:
+            yield info
+        except Exception as e:
+            info["error"] = repr(e)
+            raise
+        finally:
+            if prof:
+                prof.disable()
+            rss = _max_rss_mb()
+            record = {
+                "stage": name,
+                "wall_s": round(time.perf_counter() - wall0, 4),
+                "cpu_s": round(time.process_time() - cpu0, 4),
+                "max_rss_mb": None if rss is None else round(rss, 2),
+            }
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record["peak_mem_mb"] = round(peak / _MB, 2)
+                record["mem_delta_mb"] = round((current - mem0) / _MB, 2)
+            if prof:
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                prof_path = self.cprofile_dir / f"{len(self.stages):02d}_{name}.prof"
+                prof.dump_stats(prof_path)
+                record["cprofile"] = str(prof_path)
+            record.update(info)
+            self.stages.append(record)
+            print(f"⏱ {name} took: {record['wall_s']:.2f}s")
+
+    def report(self) -> dict:
+        """The whole run as a JSON-serializable dict."""
+        import numpy as np
+        import pandas as pd
+        return {
+            "version": PROFILE_REPORT_VERSION,
+            "run": self.run_name,
+            "started": self.started.isoformat(timespec="seconds"),
+            "total_wall_s": round(time.perf_counter() - self._wall0, 4),
+            "total_cpu_s": round(time.process_time() - self._cpu0, 4),
+            "max_rss_mb": _max_rss_mb(),
+            "environment": {
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+            },
+            "metadata": self.metadata,
+            "stages": self.stages,
+        }
+
+    def write_json(self, path):
+        """Write the report (stops tracemalloc if this profiler started it)."""
+        report = self.report()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        return report
+
+    def print_summary(self):
+        """Console table of the recorded stages."""
+        total = time.perf_counter() - self._wall0
+        print(f"\n📊 Stage profile ({self.run_name}):")
+        mem_key = "peak_mem_mb" if self.trace_memory else "max_rss_mb"
+        print(f"   {'stage':<22}{'wall s':>8}{'cpu s':>8}{'peak MB':>9}  rows")
+        for r in self.stages:
+            peak = f"{r[mem_key]:9.1f}" if r.get(mem_key) is not None else f"{'-':>9}"
+            rows = r.get("rows", "")
+            cached = " (cached)" if r.get("cached") else ""
+            saved = f" (~{r['mb_saved']:.1f} MB saved)" if r.get("mb_saved") else ""
+            print(f"   {r['stage']:<22}{r['wall_s']:8.2f}{r['cpu_s']:8.2f}{peak}  {rows}{cached}{saved}")
+        print(f"   {'total':<22}{total:8.2f}")
+
+
+def profile_path_for(out_csv) -> Path:
+    """JSON report path next to a rankings CSV: Rankings.csv -> Rankings.profile.json."""
+    out_csv = Path(out_csv)
+    return out_csv.with_name(f"{out_csv.stem}.profile.json")
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Synthetic National-Scale Game Data
+==================================
+
+Generates master team lists in the National_*_Master_Team_List format and
+games in the Matched_Games format, from 10k up to several million games,
+for benchmarking. Every team has a hidden strength; scores are Poisson
+draws driven by the strength gap, so the rankings have a known answer.
+
+Knobs:
+- in_state_share: share of games inside the team's state and age group;
+  the rest are national (e.g. showcases), so 1.0 gives one island per state
+- cross_age_share: games against the adjacent age group in the same state
+- blowout_share: games where the stronger side runs up the score
+- name_noise: share of team slots whose scraped name is a noisy variant
+  (lowercased, short birth year, dropped designation, typo); the
+  "Team X Match" columns keep the true master name
+
+Everything is vectorized with NumPy apart from building the team names,
+so a million games take about 20 seconds, most of it writing the CSV.
+
+Usage:
+    python src/utils/synthetic_data.py --games 1000000 --out-dir data/synthetic/1m
+"""
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SEASON_YEAR = int(os.getenv("SYNTH_SEASON_YEAR", "2025"))  # Age_Group (birth year) = SEASON_YEAR - age
+AGE_GROUPS = (10, 11, 12, 13, 14)
+GAMES_PER_TEAM = 20  # default team count is n_games / GAMES_PER_TEAM (~40 appearances a team)
+HISTORY_DAYS = 18 * 30
+
+# (code, name, region, U12 boys teams in the national master list) - the count is the state weight
+STATES = [
+    ("AK", "Alaska", "West Coast", 13), ("AL", "Alabama", "Southeast", 71), ("AR", "Arkansas", "Southeast", 35),
+    ("AZ", "Arizona", "Southwest", 173), ("CA", "California", "West Coast", 1224), ("CO", "Colorado", "Southwest", 99),
+    ("CT", "Connecticut", "Northeast", 113), ("DE", "Delaware", "Mid-Atlantic", 21), ("FL", "Florida", "Southeast", 539),
+    ("GA", "Georgia", "Southeast", 204), ("HI", "Hawaii", "West Coast", 20), ("IA", "Iowa", "Midwest", 75),
+    ("ID", "Idaho", "Mountain West", 60), ("IL", "Illinois", "Midwest", 425), ("IN", "Indiana", "Midwest", 117),
+    ("KS", "Kansas", "Midwest", 116), ("KY", "Kentucky", "South Central", 99), ("LA", "Louisiana", "Southeast", 55),
+    ("MA", "Massachusetts", "Northeast", 212), ("MD", "Maryland", "Mid-Atlantic", 218), ("ME", "Maine", "Northeast", 39),
+    ("MI", "Michigan", "Midwest", 285), ("MN", "Minnesota", "Midwest", 115), ("MO", "Missouri", "Midwest", 178),
+    ("MS", "Mississippi", "Southeast", 43), ("MT", "Montana", "Mountain West", 31), ("NC", "North Carolina", "Southeast", 243),
+    ("ND", "North Dakota", "Midwest", 12), ("NE", "Nebraska", "Midwest", 68), ("NH", "New Hampshire", "Northeast", 76),
+    ("NJ", "New Jersey", "Northeast", 472), ("NM", "New Mexico", "Southwest", 33), ("NV", "Nevada", "West Coast", 65),
+    ("NY", "New York", "Northeast", 472), ("OH", "Ohio", "Midwest", 402), ("OK", "Oklahoma", "Southwest", 76),
+    ("OR", "Oregon", "West Coast", 111), ("PA", "Pennsylvania", "Northeast", 334), ("RI", "Rhode Island", "Northeast", 35),
+    ("SC", "South Carolina", "Southeast", 66), ("SD", "South Dakota", "Midwest", 26), ("TN", "Tennessee", "Southeast", 120),
+    ("TX", "Texas", "Southwest", 822), ("UT", "Utah", "Southwest", 161), ("VA", "Virginia", "Mid-Atlantic", 238),
+    ("VT", "Vermont", "Northeast", 23), ("WA", "Washington", "West Coast", 241), ("WI", "Wisconsin", "Midwest", 145),
+    ("WV", "West Virginia", "Mid-Atlantic", 20), ("WY", "Wyoming", "Mountain West", 26),
+]
+
+CLUB_PLACES = ["North", "South", "East", "West", "Valley", "Desert", "Coastal", "Metro", "Lake", "River",
+               "Mountain", "Prairie", "Bay", "Canyon", "Capital", "Harbor", "Summit", "Pine", "Cedar", "Eagle"]
+CLUB_NAMES = ["Rush", "United", "Strikers", "Legends", "Surf", "Fire", "Storm", "Galaxy", "Rangers", "Albion",
+              "Union", "Athletic", "Dynamo", "Thunder", "Rebels", "Arsenal", "Inter", "Real", "Sporting", "Blast"]
+CLUB_SUFFIXES = ["FC", "SC", "Soccer Club", "Academy", "Futbol Club", ""]
+DESIGNATIONS = ["Black", "White", "Blue", "Red", "Gold", "Premier", "Elite", "Select", "Academy", "Navy",
+                "Green", "Silver"]
+EVENTS = ["Fall Classic", "Spring Cup", "Showcase", "Kick Off", "Invitational", "State Cup", "Presidents Cup",
+          "Winter Classic", "Open League", "Premier League"]
+DIVISION_TIERS = ["Gold", "Silver", "Bronze", "Premier", "Elite", "Division 1", "Division 2", "Flight 1"]
+
+MATCHED_GAMES_COLUMNS = [
+    "Date", "Team A", "Team B", "Score A", "Score B", "Result A", "Result B", "Event", "Competition",
+    "Division", "Venue", "Location", "Match ID", "Original Team ID", "Team A Normalized", "Team B Normalized",
+    "Team A Match", "Team A Match Type", "Team B Match", "Team B Match Type",
+]
+MASTER_COLUMNS = [
+    "Team_Name", "Club", "State", "State_Code", "Region", "Division", "Age_Group", "Age_U", "Gender",
+    "Gender_Full", "League", "Active_Status", "GotSport_Team_ID", "Team_ID", "Source_URL",
+]
+
+
+def default_team_count(n_games: int) -> int:
+    """Teams for `n_games` so each team plays about as often as in the real data."""
+    return max(50, n_games // GAMES_PER_TEAM)
+
+
+def noisy_variants(name: str, rng: np.random.Generator) -> list:
+    """
+    The ways a scraped name drifts from the master name: lowercased, short
+    birth year, designation dropped and a one-character typo.
+    """
+    tokens = name.split()
+    short_year = " ".join(t[2:] if len(t) == 4 and t.isdigit() else t for t in tokens)
+    dropped = " ".join(tokens[:-1]) if len(tokens) > 2 else name
+    i = int(rng.integers(0, max(1, len(name) - 1)))
+    typo = name[:i] + name[i + 1] + name[i] + name[i + 2:] if len(name) > 2 else name
+    return [name.lower(), short_year, dropped, typo]
+
+
+def _normalize(name: str) -> str:
+    """Lowercase, single-spaced: the Matched_Games "Normalized" columns."""
+    return " ".join(name.lower().split())
+
+
+class SyntheticLeague:
+    """
+    Teams with hidden strengths, and games between them.
+
+    Attributes:
+        master: National master list format (one row per team)
+        strength: Hidden team strength (standard normal, older ages stronger)
+        activity: Relative number of games each team plays
+    """
+
+    def __init__(self, n_teams: int, age_groups=AGE_GROUPS, gender: str = "M", seed: int = 0):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.age_groups = tuple(age_groups)
+        rng = self.rng
+
+        # Clubs: skewed (lognormal) sizes around 12 teams, located by state weight
+        state_w = np.array([s[3] for s in STATES], dtype=float)
+        n_clubs = max(1, n_teams // 12)
+        club_state = rng.choice(len(STATES), n_clubs, p=state_w / state_w.sum())
+        club_names, seen = [], set()
+        for c in range(n_clubs):
+            base = " ".join(filter(None, [
+                CLUB_PLACES[rng.integers(len(CLUB_PLACES))], CLUB_NAMES[rng.integers(len(CLUB_NAMES))],
+                CLUB_SUFFIXES[rng.integers(len(CLUB_SUFFIXES))]]))
+            name = f"{base} {STATES[club_state[c]][0]}" if base in seen else base
+            k = 2
+            while name in seen:
+                name = f"{base} {STATES[club_state[c]][0]} {k}"
+                k += 1
+            seen.add(name)
+            club_names.append(name)
+        club_w = rng.lognormal(0.0, 0.8, n_clubs)
+        team_club = rng.choice(n_clubs, n_teams, p=club_w / club_w.sum())
+        team_state = club_state[team_club]
+        team_age = rng.integers(0, len(self.age_groups), n_teams)
+        ages = np.asarray(self.age_groups)[team_age]
+        birth_year = SEASON_YEAR - ages
+
+        # Team names: club + birth year + designation, numbered within (club, age)
+        slot = pd.DataFrame({"c": team_club, "a": team_age}).groupby(["c", "a"]).cumcount().to_numpy()
+        pattern = rng.integers(0, 3, n_teams)
+        names = []
+        for t in range(n_teams):
+            desig = DESIGNATIONS[slot[t] % len(DESIGNATIONS)]
+            if slot[t] >= len(DESIGNATIONS):
+                desig = f"{desig} {slot[t] // len(DESIGNATIONS) + 1}"
+            club, year = club_names[team_club[t]], birth_year[t]
+            if pattern[t] == 0:
+                names.append(f"{club} {year} Boys {desig}")
+            elif pattern[t] == 1:
+                names.append(f"{club} B{year % 100:02d} {desig}")
+            else:
+                names.append(f"{year}B {club} {desig}")
+
+        gotsport_ids = 100000 + rng.permutation(n_teams * 4)[:n_teams]
+        team_ids = rng.integers(0, 16 ** 12, n_teams, dtype=np.int64)
+        state_code = np.array([s[0] for s in STATES], dtype=object)
+        self.master = pd.DataFrame({
+            "Team_Name": names,
+            "Club": np.asarray(club_names, dtype=object)[team_club],
+            "State": np.array([s[1] for s in STATES], dtype=object)[team_state],
+            "State_Code": state_code[team_state],
+            "Region": np.array([s[2] for s in STATES], dtype=object)[team_state],
+            "Division": [f"U{a}{gender[0].upper()}" for a in ages],
+            "Age_Group": birth_year,
+            "Age_U": ages,
+            "Gender": gender[0].upper(),
+            "Gender_Full": "Male" if gender[0].upper() == "M" else "Female",
+            "League": "USYS",
+            "Active_Status": "Active",
+            "GotSport_Team_ID": gotsport_ids,
+            "Team_ID": [f"{v:012x}" for v in team_ids],
+            "Source_URL": [
+                "https://system.gotsport.com/api/v1/team_ranking_data?search[team_country]=USA"
+                f"&search[age]={a}&search[gender]={gender[0].lower()}&search[page]={p}"
+                for a, p in zip(ages, rng.integers(1, 500, n_teams))
+            ],
+        })[MASTER_COLUMNS]
+
+        self.state = team_state
+        self.age = team_age
+        self.strength = rng.standard_normal(n_teams) + 0.5 * team_age
+        self.activity = rng.gamma(2.0, 1.0, n_teams)
+        self._variants = None
+
+    @property
+    def n_teams(self) -> int:
+        return len(self.master)
+
+    def variants(self) -> np.ndarray:
+        """Noisy name variants per team, shape (n_teams, 4)."""
+        if self._variants is None:
+            self._variants = np.array(
+                [noisy_variants(n, self.rng) for n in self.master["Team_Name"]], dtype=object)
+        return self._variants
+
+    @staticmethod
+    def _opponents(a, game_group, team_group, rng):
+        """
+        One opponent per game, drawn uniformly from group `game_group[i]` and
+        never team `a[i]` itself; also returns whether the group had one.
+        """
+        order = np.argsort(team_group, kind="stable")
+        sizes = np.bincount(team_group, minlength=int(max(team_group.max(), game_group.max())) + 1)
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        size = np.maximum(sizes[game_group], 1)
+        pos = (rng.random(len(a)) * size).astype(np.int64)
+        b = order[np.minimum(starts[game_group] + pos, len(order) - 1)]
+        pos = np.where(b == a, (pos + 1) % size, pos)
+        b = order[np.minimum(starts[game_group] + pos, len(order) - 1)]
+        return b, (b != a) & (sizes[game_group] > 0)
+
+    def games(self, n_games: int, in_state_share: float = 0.8, cross_age_share: float = 0.05,
+              blowout_share: float = 0.03, name_noise: float = 0.05, days: int = HISTORY_DAYS,
+              end_date=None, seed: int = None) -> pd.DataFrame:
+        """
+        `n_games` games in the Matched_Games format, dated over the `days`
+        days up to `end_date` (default today), oldest first.
+        """
+        rng = np.random.default_rng(self.seed + 1 if seed is None else seed)
+        n_ages = len(self.age_groups)
+        a = rng.choice(self.n_teams, n_games, p=self.activity / self.activity.sum())
+
+        # Opponent pool: same state + age, adjacent age in the same state, or same age nationally
+        kind = rng.random(n_games)
+        cross = kind < cross_age_share
+        national = ~cross & (rng.random(n_games) >= in_state_share)
+        own = self.age[a]
+        step = np.where(rng.random(n_games) < 0.5, -1, 1)
+        step = np.where(own == 0, 1, np.where(own == n_ages - 1, -1, step))
+        opp_age = np.where(cross, np.clip(own + step, 0, n_ages - 1), own)
+
+        b, ok = self._opponents(a, self.state[a] * n_ages + opp_age, self.state * n_ages + self.age, rng)
+        national_b, _ = self._opponents(a, own, self.age, rng)
+        b = np.where(national | ~ok, national_b, b)
+        lonely = b == a  # alone in its age group nationwide
+        b[lonely] = (a[lonely] + 1) % self.n_teams
+
+        # Scores: Poisson around the strength gap, with occasional blowouts
+        gap = np.clip(self.strength[a] - self.strength[b], -4, 4)
+        score_a = rng.poisson(np.exp(0.3 + 0.35 * gap))
+        score_b = rng.poisson(np.exp(0.3 - 0.35 * gap))
+        blowout = rng.random(n_games) < blowout_share
+        extra = rng.integers(4, 9, n_games)
+        score_a = np.where(blowout & (gap >= 0), score_a + extra, score_a)
+        score_b = np.where(blowout & (gap < 0), score_b + extra, score_b)
+
+        end = pd.Timestamp(end_date).normalize() if end_date is not None else pd.Timestamp.now().normalize()
+        day_labels = np.array([f"{d.month}/{d.day}/{d.year}" for d in
+                               pd.date_range(end=end, periods=days, freq="D")], dtype=object)
+        day = rng.integers(0, days, n_games)
+        perm = np.argsort(day, kind="stable")
+        a, b, score_a, score_b, day = a[perm], b[perm], score_a[perm], score_b[perm], day[perm]
+
+        names = self.master["Team_Name"].to_numpy(dtype=object)
+        raw_a, raw_b = names[a], names[b]
+        noisy_a, noisy_b = rng.random(n_games) < name_noise, rng.random(n_games) < name_noise
+        if noisy_a.any() or noisy_b.any():
+            variants = self.variants()
+            raw_a = np.where(noisy_a, variants[a, rng.integers(0, 4, n_games)], raw_a)
+            raw_b = np.where(noisy_b, variants[b, rng.integers(0, 4, n_games)], raw_b)
+
+        def normalize(raw):
+            codes, uniques = pd.factorize(raw)
+            return np.array([_normalize(u) for u in uniques], dtype=object)[codes]
+
+        # Labels come from small (state x event) and (age x tier) tables, indexed per game
+        state_names = np.array([s[1] for s in STATES], dtype=object)
+        home_state = self.state[a]
+        event = rng.integers(0, len(EVENTS), n_games)
+        event_labels = np.array([f"{SEASON_YEAR} {s[1]} {e}" for s in STATES for e in EVENTS], dtype=object)
+        tier = rng.integers(0, len(DIVISION_TIERS), n_games)
+        division_labels = np.array([f"U{x}B U{x} Boys {t}" for x in self.age_groups for t in DIVISION_TIERS],
+                                   dtype=object)
+        result_a = np.where(score_a > score_b, "W", np.where(score_a < score_b, "L", "T"))
+        result_b = np.where(score_a > score_b, "L", np.where(score_a < score_b, "W", "T"))
+        return pd.DataFrame({
+            "Date": day_labels[day],
+            "Team A": names[a],
+            "Team B": names[b],
+            "Score A": score_a,
+            "Score B": score_b,
+            "Result A": result_a,
+            "Result B": result_b,
+            "Event": event_labels[home_state * len(EVENTS) + event],
+            "Competition": np.array(EVENTS, dtype=object)[event],
+            "Division": division_labels[self.age[a] * len(DIVISION_TIERS) + tier],
+            "Venue": (state_names + " Soccer Complex")[home_state],
+            "Location": np.array([f"Main St , {s[0]}" for s in STATES], dtype=object)[home_state],
+            "Match ID": 20_000_000 + np.arange(n_games),
+            "Original Team ID": self.master["GotSport_Team_ID"].to_numpy()[a],
+            "Team A Normalized": normalize(raw_a),
+            "Team B Normalized": normalize(raw_b),
+            "Team A Match": names[a],
+            "Team A Match Type": np.where(noisy_a, "FUZZY", "EXACT"),
+            "Team B Match": names[b],
+            "Team B Match Type": np.where(noisy_b, "FUZZY", "EXACT"),
+        })[MATCHED_GAMES_COLUMNS]
+
+    def write_master_lists(self, out_dir, gender_full: str = "Male") -> list:
+        """One National_<Gender>_U<age>_Master_Team_List.csv per age group."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for age, teams in self.master.groupby("Age_U"):
+            path = out_dir / f"National_{gender_full}_U{age}_Master_Team_List.csv"
+            teams.to_csv(path, index=False)
+            paths.append(path)
+        return paths
+
+
+def write_synthetic_dataset(out_dir, n_games: int, n_teams: int = None, seed: int = 0, **game_options) -> dict:
+    """
+    Master lists and Matched_Games.csv for `n_games` games in `out_dir`.
+
+    Returns:
+        Dict with the league, the master list paths and the games path
+    """
+    league = SyntheticLeague(n_teams or default_team_count(n_games), seed=seed)
+    games = league.games(n_games, **game_options)
+    out_dir = Path(out_dir)
+    masters = league.write_master_lists(out_dir)
+    games_path = out_dir / "Matched_Games.csv"
+    games.to_csv(games_path, index=False)
+    return {"league": league, "masters": masters, "games": games_path}
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Write synthetic national master lists and Matched_Games.csv")
+    p.add_argument("--games", type=int, default=100_000, help="Number of games")
+    p.add_argument("--teams", type=int, default=None, help=f"Number of teams (default games/{GAMES_PER_TEAM})")
+    p.add_argument("--out-dir", default="data/synthetic", help="Output directory")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--in-state-share", type=float, default=0.8, help="Share of games within state and age group")
+    p.add_argument("--cross-age-share", type=float, default=0.05, help="Share of games against an adjacent age")
+    p.add_argument("--blowout-share", type=float, default=0.03, help="Share of lopsided games")
+    p.add_argument("--name-noise", type=float, default=0.05, help="Share of noisy scraped team names")
+    args = p.parse_args()
+
+    written = write_synthetic_dataset(
+        args.out_dir, args.games, args.teams, args.seed,
+        in_state_share=args.in_state_share, cross_age_share=args.cross_age_share,
+        blowout_share=args.blowout_share, name_noise=args.name_noise)
+    print(f"✅ {written['league'].n_teams} teams in {len(written['masters'])} master lists, "
+          f"{args.games} games -> {written['games']}")
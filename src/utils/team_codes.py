@@ -0,0 +1,123 @@
+"""
+Integer team-code space for the ranking engine.
+
+Team names are factorized once when games are loaded; after that, per-game
+stages work on int32 code arrays and gather team-level values with np.take /
+bincount instead of merging or mapping on team-name strings. Names are only
+mapped back when a stage emits its team-level result.
+"""
+import numpy as np
+import pandas as pd
+
+
+class TeamCodes:
+    """Factorized team-ID space shared by Team and Opponent columns."""
+
+    def __init__(self, names):
+        """
+        Args:
+            names: Unique team names; position i is team code i
+        """
+        self.names = pd.Index(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def factorize_pair(cls, a, b):
+        """
+        Shared codes for two name columns (e.g. Team A / Team B).
+
+        Each column is factorized on its own and only the two unique-name
+        sets are merged, so string columns are never concatenated or
+        converted to object arrays. Codes follow first appearance in `a`,
+        then in `b`; missing names get -1.
+
+        Returns:
+            Tuple of (int32 codes of a, int32 codes of b, TeamCodes)
+        """
+        a, b = pd.Series(a), pd.Series(b)
+        if isinstance(a.dtype, pd.CategoricalDtype) and isinstance(b.dtype, pd.CategoricalDtype):
+            # Categoricals: remap category codes; renumber by first appearance below
+            names = a.cat.categories.append(b.cat.categories)
+            name_codes, uniques = pd.factorize(names)
+            raw_a, raw_b = a.cat.codes.to_numpy(), b.cat.codes.to_numpy()
+            k = len(a.cat.categories)
+            code_a = np.where(raw_a >= 0, name_codes[:k][raw_a], -1)
+            code_b = np.where(raw_b >= 0, name_codes[k:][raw_b], -1)
+            both = np.concatenate([code_a, code_b])
+            valid = both >= 0
+            order, first = pd.factorize(both[valid])
+            both[valid] = order
+            uniques = pd.Index(uniques).take(first)
+        else:
+            code_a, names_a = pd.factorize(a)
+            code_b, names_b = pd.factorize(b)
+            uniques = pd.Index(names_a).append(pd.Index(names_b)).unique()
+            both = np.concatenate([
+                np.where(code_a >= 0, uniques.get_indexer(names_a)[code_a], -1),
+                np.where(code_b >= 0, uniques.get_indexer(names_b)[code_b], -1),
+            ])
+        both = both.astype(np.int32)
+        return both[:len(a)], both[len(a):], cls(uniques)
+
+    @classmethod
+    def attach(cls, long_games: pd.DataFrame):
+        """
+        Factorize Team and Opponent of a long-format frame in one pass.
+
+        Adds int32 `team_id` / `opp_id` columns (in place) and returns the
+        frame together with its code space. Codes follow first appearance
+        in the Team column, then in the Opponent column.
+
+        Returns:
+            Tuple of (long_games, TeamCodes)
+        """
+        team_id, opp_id, codes = cls.factorize_pair(long_games["Team"], long_games["Opponent"])
+        long_games["team_id"] = team_id
+        long_games["opp_id"] = opp_id
+        return long_games, codes
+
+    def categorical(self, codes) -> pd.Categorical:
+        """Int codes as a Categorical over this code space (no per-row strings)."""
+        return pd.Categorical.from_codes(np.asarray(codes), categories=self.names)
+
+    def extend(self, names) -> "TeamCodes":
+        """
+        Code space with unseen `names` appended.
+
+        Existing teams keep their codes, so int32 columns already attached to
+        stored frames stay valid. Returns `self` when nothing is new.
+        """
+        names = pd.Index(names).dropna().unique()
+        new = names[~names.isin(self.names)]
+        return TeamCodes(self.names.append(new)) if len(new) else self
+
+    def encode(self, names) -> np.ndarray:
+        """Team names -> int32 codes (-1 for names outside the code space)."""
+        return self.names.get_indexer(pd.Index(names)).astype(np.int32)
+
+    def decode(self, codes) -> np.ndarray:
+        """Int codes -> team names."""
+        return self.names.to_numpy()[np.asarray(codes)]
+
+    def scatter(self, by_team: pd.Series, fill=np.nan) -> np.ndarray:
+        """
+        Spread a team-indexed Series into a dense array over the code space.
+
+        Teams missing from `by_team` get `fill`, so per-game values are a
+        plain `np.take(array, codes)` away. The array has one extra trailing
+        slot holding `fill`, so code -1 (unknown team) also gathers `fill`.
+        """
+        out = np.full(len(self) + 1, fill, dtype=float)
+        idx = self.encode(by_team.index)
+        known = idx >= 0
+        out[idx[known]] = by_team.to_numpy(dtype=float)[known]
+        return out
+
+    def present(self, by_team: pd.Series) -> np.ndarray:
+        """Boolean mask over the code space (plus the -1 slot): True where `by_team` has a row."""
+        mask = np.zeros(len(self) + 1, dtype=bool)
+        idx = self.encode(by_team.index)
+        mask[idx[idx >= 0]] = True
+        return mask
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Colley-matrix SOS engine: exact system, solvers, results-only input and engine selection
+"""
+
+import os
+import sys
+import tempfile
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from analytics import colley_sos
+from core import ranking_engine as re_engine
+from core.ranking_snapshots import RankingSnapshotStore
+from test_ranking_snapshots import _write_inputs
+from utils.sparse_solvers import conjugate_gradient
+from utils.team_codes import TeamCodes
+
+AS_OF = "2025-03-03"
+
+
+def _games(n_teams=40, n_games=500, seed=11):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, n_teams, n_games)
+    b = (a + rng.integers(1, n_teams, n_games)) % n_teams
+    return pd.DataFrame({
+        "Team A": [f"Team {i:02d}" for i in a],
+        "Team B": [f"Team {i:02d}" for i in b],
+        "Score A": rng.poisson(2.0, n_games),
+        "Score B": rng.poisson(1.6, n_games),
+    })
+
+
+def _dense_colley(games):
+    """Textbook dense Colley solve, one game at a time."""
+    team_a, team_b, codes = TeamCodes.factorize_pair(games["Team A"], games["Team B"])
+    teams = codes.names.tolist()
+    n = len(teams)
+    matrix = 2.0 * np.eye(n)
+    rhs = np.ones(n)
+    for i, j, sa, sb in zip(team_a, team_b, games["Score A"], games["Score B"]):
+        matrix[i, i] += 1
+        matrix[j, j] += 1
+        matrix[i, j] -= 1
+        matrix[j, i] -= 1
+        won = 0.5 if sa == sb else float(sa > sb)
+        rhs[i] += (won - (1 - won)) / 2
+        rhs[j] += ((1 - won) - won) / 2
+    return teams, np.linalg.solve(matrix, rhs)
+
+
+def test_colley_matches_dense_solve():
+    """CG and direct sparse solves equal the dense textbook system; ratings average 0.5."""
+    games = _games()
+    teams, expected = _dense_colley(games)
+    for solver in colley_sos.SOLVERS:
+        _, ratings = colley_sos.compute_colley_sos_from_games(games, solver=solver)
+        np.testing.assert_allclose([ratings[t] for t in teams], expected, atol=1e-8)
+    assert np.mean(expected) == pytest.approx(0.5)
+
+    with pytest.raises(ValueError):
+        colley_sos.compute_colley_sos_from_games(games, solver="gauss")
+    print(f"✅ Colley ratings for {len(teams)} teams match the dense solve")
+
+
+def test_colley_uses_results_only():
+    """Margins are ignored; SOS is a 0-1 dict like the Elo engine."""
+    games = _games()
+    blowouts = games.copy()
+    blowouts["Score A"] = np.where(games["Score A"] > games["Score B"], games["Score A"] + 9, games["Score A"])
+    sos, ratings = colley_sos.compute_colley_sos_from_games(games)
+    sos_blowouts, ratings_blowouts = colley_sos.compute_colley_sos_from_games(blowouts)
+    assert ratings == pytest.approx(ratings_blowouts) and sos == pytest.approx(sos_blowouts)
+
+    values = np.array(list(sos.values()))
+    assert values.min() == pytest.approx(0.0) and values.max() == pytest.approx(1.0)
+
+    # Warm start converges to the same solution
+    _, warm = colley_sos.compute_colley_sos_from_games(games, initial_ratings=ratings)
+    assert warm == pytest.approx(ratings)
+    print(f"✅ Colley SOS dict for {len(sos)} teams is independent of margins")
+
+
+def test_colley_engine_selection():
+    """SOS_ENGINE=colley fills SOS_iterative_norm in the build and in snapshots."""
+    cwd = os.getcwd()
+    engine = re_engine.SOS_ENGINE
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            re_engine.SOS_ENGINE = "colley"
+            assert re_engine.iterative_sos_config()["SOS_ENGINE"] == "colley"
+            expected = re_engine.compute_iterative_sos(as_of=AS_OF)
+            built = re_engine.build_rankings_from_wide("Matched_Games.csv", "out.csv", as_of=AS_OF,
+                                                      use_cache=False)
+            store = RankingSnapshotStore.from_matches("Matched_Games.csv")
+            snapshot = store.rankings_as_of(AS_OF)
+        finally:
+            re_engine.SOS_ENGINE = engine
+            os.chdir(cwd)
+
+    assert expected is not None
+    got = snapshot.set_index("Team")["SOS_iterative_norm"].dropna()
+    assert len(got) and got.to_dict() == pytest.approx({t: expected[t] for t in got.index})
+    pd.testing.assert_frame_equal(
+        re_engine.visible_rankings(snapshot)[re_engine.RANKINGS_COLUMNS].reset_index(drop=True),
+        built[re_engine.RANKINGS_COLUMNS].reset_index(drop=True),
+    )
+    print(f"✅ Colley SOS selected in the engine and snapshots ({len(built)} teams)")
+
+
+def test_unconverged_cg_warns():
+    """CG that hits its iteration cap warns instead of returning quietly."""
+    games = _games()
+    team_a, team_b, codes = TeamCodes.factorize_pair(games["Team A"], games["Team B"])
+    matrix, rhs = colley_sos.colley_system(team_a, team_b, games["Score A"].to_numpy(),
+                                           games["Score B"].to_numpy(), len(codes.names))
+    with pytest.warns(RuntimeWarning, match="not fully converged"):
+        conjugate_gradient(matrix, rhs, 1e-12, maxiter=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        conjugate_gradient(matrix, rhs, 1e-12)
+    print("✅ Unconverged CG raises a RuntimeWarning")
+
+
+if __name__ == "__main__":
+    test_colley_matches_dense_solve()
+    test_colley_uses_results_only()
+    test_colley_engine_selection()
+    test_unconverged_cg_warns()
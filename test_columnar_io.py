@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Matched games and histories round-trip through typed Parquet; readers prefer it
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from utils.columnar_io import parquet_path_for, read_table, resolve_table_path, write_table
+from test_ranking_snapshots import _write_inputs
+
+
+def test_typed_round_trip_and_preference():
+    """Dates, categorical teams and int scores survive; a newer CSV wins over the Parquet."""
+    games = pd.DataFrame({
+        "Team A": ["Alpha", "Beta", None], "Team B": ["Beta", "Gamma", "Alpha"],
+        "Score A": [3, 0, 2], "Score B": [1, 1, 2], "Date": ["3/15/2025", "3/16/2025", "bad"],
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = os.path.join(tmp, "Matched_Games.csv")
+        written = write_table(games, csv)
+        assert written == parquet_path_for(csv) and not os.path.exists(csv)
+
+        back = read_table(csv)
+        assert pd.api.types.is_datetime64_any_dtype(back["Date"]) and back["Date"].isna().sum() == 1
+        assert back["Score A"].dtype == np.int32
+        assert pd.api.types.is_string_dtype(back["Team A"]) and back["Team A"].isna().sum() == 1
+        assert isinstance(read_table(csv, categorical=True)["Team B"].dtype, pd.CategoricalDtype)
+        assert list(read_table(csv, columns=["Team A", "Date"]).columns) == ["Team A", "Date"]
+
+        time.sleep(0.01)
+        games.to_csv(csv, index=False)  # rewritten by an older tool after the Parquet
+        assert resolve_table_path(csv).suffix == ".csv"
+        assert read_table(csv)["Date"].tolist() == games["Date"].tolist()
+
+        write_table(games, csv, write_csv=True)
+        assert resolve_table_path(csv).suffix == ".parquet"
+        pd.testing.assert_frame_equal(pd.read_csv(csv), games)
+    print("✅ Typed Parquet round trip; readers pick the newest table")
+
+
+def test_rankings_identical_from_parquet():
+    """The engine ranks the same from Parquet inputs as from the CSVs they replace."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            from_csv = re_engine.build_rankings_from_wide("Matched_Games.csv", "csv.csv", as_of="2025-03-20",
+                                                          use_cache=False, profile_json=False)
+            for path in ["Matched_Games.csv", re_engine.SOS_HISTORY_PATH, re_engine.GAMES_TOTAL_HISTORY_PATH]:
+                write_table(pd.read_csv(path), path)
+                os.remove(path)
+            from_parquet = re_engine.build_rankings_from_wide("Matched_Games.csv", "pq.csv", as_of="2025-03-20",
+                                                              use_cache=False, profile_json=False)
+        finally:
+            os.chdir(cwd)
+
+    pd.testing.assert_frame_equal(from_parquet.reset_index(drop=True), from_csv.reset_index(drop=True))
+    print(f"✅ {len(from_csv)} teams ranked identically from Parquet")
+
+
+if __name__ == "__main__":
+    test_typed_round_trip_and_preference()
+    test_rankings_identical_from_parquet()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Connectivity report: components, degrees and bridge teams on team codes
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from utils.connectivity import connectivity_frame
+
+
+def _components(nodes, edges):
+    """Component sizes of the graph restricted to `nodes` (plain BFS)."""
+    adj = {v: set() for v in nodes}
+    for a, b in edges:
+        if a in adj and b in adj and a != b:
+            adj[a].add(b)
+            adj[b].add(a)
+    seen, sizes = set(), []
+    for v in nodes:
+        if v in seen:
+            continue
+        todo, size = [v], 0
+        seen.add(v)
+        while todo:
+            u = todo.pop()
+            size += 1
+            for w in adj[u] - seen:
+                seen.add(w)
+                todo.append(w)
+        sizes.append(size)
+    return adj, sizes
+
+
+def test_matches_brute_force():
+    """Degrees, components and bridge teams agree with removing each team and re-counting."""
+    rng = np.random.default_rng(7)
+    for trial in range(30):
+        n = int(rng.integers(2, 30))
+        m = int(rng.integers(1, 2 * n))
+        edges = [(f"T{a}", f"T{b}") for a, b in rng.integers(0, n, (m, 2))]
+        games = pd.DataFrame(edges, columns=["Team A", "Team B"])
+        report = connectivity_frame(games["Team A"], games["Team B"]).set_index("Team")
+
+        nodes = list(report.index)
+        adj, sizes = _components(nodes, edges)
+        assert sorted(sizes, reverse=True) == report.drop_duplicates("ComponentID")["ComponentSize"].tolist()
+        for v in nodes:
+            assert report.at[v, "Degree"] == len(adj[v]), (trial, v)
+            comp = report.at[v, "ComponentSize"]
+            _, pieces = _components([u for u in nodes if u != v and
+                                     report.at[u, "ComponentID"] == report.at[v, "ComponentID"]], edges)
+            assert report.at[v, "IsBridge"] == (len(pieces) > 1), (trial, v)
+            expected_cut = comp - 1 - max(pieces) if len(pieces) > 1 else 0
+            assert report.at[v, "SeparatedTeams"] == expected_cut, (trial, v)
+    print("✅ Components, degrees and bridge teams match brute force")
+
+
+def test_engine_report():
+    """Components numbered by size; self-games and missing names are ignored."""
+    games = pd.DataFrame({
+        "Team A": ["A", "B", "C", "X", "Y", "Solo", None, "A"],
+        "Team B": ["B", "C", "D", "Y", "Z", "Solo", "A", "B"],
+    })
+    report = re_engine.generate_connectivity_report(games).set_index("Team")
+    assert report.loc[["A", "B", "C", "D"], "ComponentID"].eq(0).all()
+    assert report.at["Solo", "ComponentSize"] == 1 and report.at["Solo", "Degree"] == 0
+    assert report.at["A", "Games"] == 2 and report.at["A", "Degree"] == 1
+    assert report.loc[["B", "C", "Y"], "IsBridge"].all() and not report.loc[["A", "D", "X"], "IsBridge"].any()
+    assert report.at["B", "SeparatedTeams"] == 1
+    print("✅ Connectivity report ranks components and flags bridge teams")
+
+
+def test_streamed_edges_report():
+    """Pairings aggregated chunk by chunk give the report of a full read."""
+    rng = np.random.default_rng(3)
+    teams = np.array([f"T{i}" for i in range(25)] + [None], dtype=object)
+    games = pd.DataFrame({"Team A": rng.choice(teams, 200), "Team B": rng.choice(teams, 200)})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "Matched_Games.csv")
+        games.to_csv(path, index=False)
+        edges, scanned = re_engine.stream_opponent_edges(path, chunk_rows=17)
+    assert scanned == len(games) and edges["Games"].sum() == len(games) and len(edges) < len(games)
+    pd.testing.assert_frame_equal(re_engine.generate_connectivity_report(edges),
+                                  re_engine.generate_connectivity_report(games))
+    print(f"✅ Report from {len(edges)} streamed pairings matches the full read")
+
+
+if __name__ == "__main__":
+    test_matches_brute_force()
+    test_engine_report()
+    test_streamed_edges_report()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Daily rank series must equal a full as-of snapshot on every day
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core.daily_rank_series import SERIES_COLUMNS, DailyRankSeries, daily_dates
+from core.ranking_snapshots import RankingSnapshotStore
+from utils.columnar_io import write_table
+from test_ranking_snapshots import _write_inputs
+
+
+def test_daily_series_matches_snapshots():
+    """Every day (games added and expiring) ranks like rankings_as_of, from fewer recomputed teams."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            store = RankingSnapshotStore.from_matches("Matched_Games.csv")
+            daily = DailyRankSeries(store)
+            recomputed = []
+            # Games start 2024-06-01, so the 365-day window starts dropping games in June 2025
+            for today in daily_dates("2025-05-25", "2025-06-12"):
+                got = daily.advance(today)
+                expected = store.rankings_as_of(today)
+                pd.testing.assert_frame_equal(got, expected)
+                recomputed.append(daily.last_update["window_changed_teams"])
+        finally:
+            os.chdir(cwd)
+
+    assert recomputed[0] == daily.last_update["ranked_teams"]  # first day builds every team
+    assert max(recomputed[1:]) < recomputed[0]
+    print(f"✅ {len(recomputed)} days match snapshots; teams recomputed per day after the first: {recomputed[1:]}")
+
+
+def test_series_parquet_round_trip():
+    """The series is compact, long format, and RankChange follows the previous day."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            store = RankingSnapshotStore.from_matches("Matched_Games.csv", iterative_sos=False)
+            series = DailyRankSeries(store).run("2025-03-01", "2025-03-07")
+            path = write_table(series, os.path.join(tmp, "daily.parquet"))
+            loaded = pd.read_parquet(path)
+        finally:
+            os.chdir(cwd)
+
+    assert list(loaded.columns) == SERIES_COLUMNS
+    assert loaded["Date"].nunique() == 7
+    assert loaded["Rank"].dtype == np.int32 and loaded["PowerScore_adj"].dtype == np.float32
+    assert isinstance(loaded["Team"].dtype, pd.CategoricalDtype)
+    assert loaded.loc[loaded["Date"] == loaded["Date"].min(), "RankChange"].isna().all()
+
+    ranks = loaded.astype({"Team": object}).pivot(index="Date", columns="Team", values="Rank")
+    change = loaded.astype({"Team": object}).pivot(index="Date", columns="Team", values="RankChange")
+    expected = (ranks.shift(1) - ranks).iloc[1:]
+    pd.testing.assert_frame_equal(change.iloc[1:].astype(float), expected.astype(float))
+    print(f"✅ {len(loaded)} daily rank rows round-trip through Parquet")
+
+
+def test_series_starts_before_first_game():
+    """Days before the first game have no ranks; the first game days still match snapshots."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            store = RankingSnapshotStore.from_matches("Matched_Games.csv", iterative_sos=False)
+            # Games start 2024-06-01
+            series = DailyRankSeries(store).run("2024-05-20", "2024-06-03")
+            daily = DailyRankSeries(store)
+            assert daily.advance("2024-05-31").empty and daily.last_update["ranked_teams"] == 0
+            for today in daily_dates("2024-06-01", "2024-06-05"):
+                got, expected = daily.advance(today), store.rankings_as_of(today)
+                if expected.empty:
+                    assert got.empty
+                else:
+                    pd.testing.assert_frame_equal(got, expected)
+        finally:
+            os.chdir(cwd)
+
+    assert series["Date"].min() >= pd.Timestamp("2024-06-01") and series["Date"].nunique() >= 1
+    print(f"✅ Series from before the first game: {len(series)} rows, all from game days")
+
+
+if __name__ == "__main__":
+    test_daily_series_matches_snapshots()
+    test_series_parquet_round_trip()
+    test_series_starts_before_first_game()
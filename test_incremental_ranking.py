@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Incremental re-ranking must match a full rebuild on the same games
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from core.incremental_ranking import IncrementalRanker
+
+
+def _write_fixture(tmp, n_teams=30, n_games=700, seed=13):
+    """Master list and wide games (one kick-off time per game) in `tmp`."""
+    rng = np.random.default_rng(seed)
+    teams = [f"Team {i:03d}" for i in range(n_teams)]
+    # A few clubs, so some ranked names differ from their opponent names
+    clubs = ["" if i % 5 else "FC" for i in range(n_teams)]
+    pd.DataFrame({"Team Name": teams, "Club": clubs}).to_csv(os.path.join(tmp, "master.csv"), index=False)
+
+    a = rng.integers(0, n_teams + 5, n_games)   # ids >= n_teams are non-master opponents
+    b = (a + rng.integers(1, n_teams, n_games)) % (n_teams + 5)
+    name = lambda i: teams[i] if i < n_teams else f"Guest {i}"
+    dates = pd.Timestamp("2024-09-01") + pd.to_timedelta(np.arange(n_games) * 14, unit="h")
+    return pd.DataFrame({
+        "Team A": [name(i) for i in a],
+        "Team B": [name(i) for i in b],
+        "Score A": rng.poisson(2.0, n_games),
+        "Score B": rng.poisson(1.6, n_games),
+        "Date": dates.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+
+def _write_games(tmp, wide, label):
+    """Games CSV plus its comprehensive history (fixed strength per opponent)."""
+    wide.to_csv(os.path.join(tmp, f"{label}.csv"), index=False)
+    long = re_engine.wide_to_long(wide)
+    hist = pd.DataFrame({"Team": long["Team"], "Date": long["Date"], "Opponent": long["Opponent"]})
+    hist["Opponent_BaseStrength"] = hist["Opponent"].map(lambda n: (sum(map(ord, n)) % 97) / 97)
+    hist.to_csv(os.path.join(tmp, f"{label}_history.csv"), index=False)
+    return os.path.join(tmp, f"{label}.csv")
+
+
+def _build(tmp, games_csv, today):
+    return IncrementalRanker.from_matches(
+        games_csv, today=today,
+        master_csv=os.path.join(tmp, "master.csv"),
+        sos_history_csv=games_csv.replace(".csv", "_history.csv"),
+        games_total_csv=os.path.join(tmp, "missing.csv"),
+        elo_games_csv=os.path.join(tmp, "missing.csv"),  # Elo warm start is not exact
+    )
+
+
+def test_incremental_matches_full_rebuild():
+    """Applying a delta gives the same team metrics and ranking as a full rebuild."""
+    today = pd.Timestamp("2025-10-20")
+    with tempfile.TemporaryDirectory() as tmp:
+        wide = _write_fixture(tmp)
+        split = len(wide) - 60
+        initial_csv = _write_games(tmp, wide.iloc[:split], "initial")
+        all_csv = _write_games(tmp, wide, "all")
+
+        # Initial state a month earlier, saved and reloaded like the CLI does
+        ranker = _build(tmp, initial_csv, today - pd.Timedelta(days=30))
+        ranker.save(os.path.join(tmp, "state.pkl"))
+        ranker = IncrementalRanker.load(os.path.join(tmp, "state.pkl"))
+        incremental = ranker.apply_delta(wide.iloc[split:], today=today)
+
+        full = _build(tmp, all_csv, today)
+        expected = full.rankings()
+
+    update = ranker.last_update
+    assert update["new_game_rows"] == len(re_engine.filter_to_master_teams(
+        re_engine.wide_to_long(wide.iloc[split:]), full.master_team_names, full.team_name_mapping))
+    assert update["expired_game_rows"] > 0
+    assert update["sa_recomputed_teams"] <= len(full.base) + 5
+
+    for name in ["base", "sa_metrics"]:
+        got = getattr(ranker, name).sort_index()
+        exp = getattr(full, name).sort_index()
+        pd.testing.assert_frame_equal(got, exp, check_dtype=False, check_names=False, rtol=1e-12)
+    pd.testing.assert_series_equal(ranker.sos_raw.sort_index(), full.sos_raw.sort_index(),
+                                   check_names=False, rtol=1e-12)
+
+    cols = ["Team", "Rank", "PowerScore_adj", "SAO_norm", "SAD_norm", "SOS_norm", "GamesPlayed", "is_active"]
+    pd.testing.assert_frame_equal(incremental[cols].reset_index(drop=True),
+                                  expected[cols].reset_index(drop=True), check_dtype=False, rtol=1e-9)
+    print(f"✅ Incremental update matches full rebuild ({update})")
+
+
+def test_single_game_delta_stays_local():
+    """One new game only touches its two teams and their opponent neighbourhood."""
+    today = pd.Timestamp("2025-10-20")
+    with tempfile.TemporaryDirectory() as tmp:
+        wide = _write_fixture(tmp, n_teams=80, n_games=500, seed=21)
+        wide = wide[wide["Team A"].str.startswith("Team") & wide["Team B"].str.startswith("Team")]
+        initial_csv = _write_games(tmp, wide.iloc[:-1], "initial")
+        all_csv = _write_games(tmp, wide, "all")
+
+        ranker = _build(tmp, initial_csv, today)
+        incremental = ranker.apply_delta(wide.iloc[-1:], today=today)
+        full = _build(tmp, all_csv, today)
+        expected = full.rankings()
+
+    update = ranker.last_update
+    assert update["affected_teams"] == 2
+    assert update["sa_recomputed_teams"] < update["ranked_teams"]
+    pd.testing.assert_frame_equal(ranker.sa_metrics.sort_index(), full.sa_metrics.sort_index(),
+                                  check_dtype=False, check_names=False, rtol=1e-12)
+    cols = ["Team", "Rank", "PowerScore_adj", "SOS_norm", "GamesPlayed"]
+    pd.testing.assert_frame_equal(incremental[cols].reset_index(drop=True),
+                                  expected[cols].reset_index(drop=True), check_dtype=False, rtol=1e-9)
+    print(f"✅ Single-game delta recomputed SA for {update['sa_recomputed_teams']} of {update['ranked_teams']} teams")
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_rebuild()
+    test_single_game_delta_stays_local()
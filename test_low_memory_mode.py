@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Low-memory mode: compact dtypes give the same rankings inputs as the default mode
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from utils.compact_frames import frame_mb, memory_saved_mb
+from utils.synthetic_data import SyntheticLeague
+from utils.team_codes import TeamCodes
+
+AS_OF = "2025-06-30"
+
+
+def _league_games(n_games=20_000, seed=3):
+    league = SyntheticLeague(400, seed=seed)
+    games = league.games(n_games, end_date=AS_OF)
+    names = league.master["Team_Name"]
+    return games, (set(names), {n: f"{n} FC" for n in names})
+
+
+def _ranking_inputs(games, master_mapping, low_memory):
+    """Window/filter/codes, Off/Def and strength-adjusted metrics in one mode."""
+    saved, re_engine.LOW_MEMORY_MODE = re_engine.LOW_MEMORY_MODE, low_memory
+    try:
+        long = re_engine.clamp_window(re_engine.wide_to_long(games), today=AS_OF)
+        long = re_engine.filter_to_master_teams(long, *master_mapping)
+        long, codes = TeamCodes.attach(long)
+        base = re_engine.compute_off_def_raw(long, codes)
+        sa_games, _ = re_engine.strength_adjusted_games(long, base, codes)
+        sa = re_engine.aggregate_strength_adjusted(sa_games, codes)[re_engine.PERFORMANCE_K]
+    finally:
+        re_engine.LOW_MEMORY_MODE = saved
+    return long, codes, base, sa_games, sa
+
+
+def test_compact_long_frame():
+    """Categorical teams and int8 scores with the same games as the default frame."""
+    games, _ = _league_games(5_000)
+    re_engine.LOW_MEMORY_MODE = True
+    try:
+        compact = re_engine.wide_to_long(games)
+    finally:
+        re_engine.LOW_MEMORY_MODE = False
+    default = re_engine.wide_to_long(games)
+
+    assert isinstance(compact["Team"].dtype, pd.CategoricalDtype)
+    assert compact["Team"].cat.categories.equals(compact["Opponent"].cat.categories)
+    assert compact["GF"].dtype == np.int8 and compact["GA"].dtype == np.int8
+    assert list(compact.columns) == list(default.columns)
+    decoded = compact.astype({"Team": object, "Opponent": object, "GF": int, "GA": int})
+    expected = default.astype({"Team": object, "Opponent": object, "GF": int, "GA": int}).reset_index(drop=True)
+    pd.testing.assert_frame_equal(decoded, expected, check_dtype=False)
+    assert frame_mb(compact) < frame_mb(default.astype({"Team": object, "Opponent": object}))
+    assert memory_saved_mb(compact) > 0
+    print(f"✅ Compact long frame: {frame_mb(compact):.2f} MB, ~{memory_saved_mb(compact):.2f} MB saved")
+
+
+def test_low_memory_rankings_match_default():
+    """Same teams, codes and Off/Def; strength-adjusted metrics within float32 precision."""
+    games, master_mapping = _league_games()
+    long, codes, base, sa_games, sa = _ranking_inputs(games, master_mapping, low_memory=False)
+    long_c, codes_c, base_c, sa_games_c, sa_c = _ranking_inputs(games, master_mapping, low_memory=True)
+
+    assert codes_c.names.equals(codes.names)
+    assert long_c["Team"].astype(object).tolist() == long["Team"].tolist()
+    pd.testing.assert_frame_equal(base_c, base, check_dtype=False)
+    assert sa_c.index.equals(sa.index)
+    np.testing.assert_allclose(sa_c["SAO_raw"], sa["SAO_raw"], rtol=1e-5)
+    np.testing.assert_allclose(sa_c["SAD_raw"], sa["SAD_raw"], rtol=1e-5)
+    assert (sa_c["GamesPlayed"] == sa["GamesPlayed"]).all()
+
+    assert sa_games_c["Adj_GF"].dtype == np.float32
+    assert len(sa_games_c.columns) < len(sa_games.columns)
+    assert frame_mb(sa_games_c) < frame_mb(sa_games) / 2
+    print(f"✅ Low-memory SA frame {frame_mb(sa_games_c):.2f} MB vs {frame_mb(sa_games):.2f} MB; "
+          f"{len(sa_c)} teams match")
+
+
+def test_aggregate_leaves_games_untouched():
+    """Repeated aggregation (parameter sweeps) neither modifies nor depends on earlier calls."""
+    games, master_mapping = _league_games(5_000)
+    _, codes, _, sa_games, sa = _ranking_inputs(games, master_mapping, low_memory=False)
+    before = sa_games.copy()
+    again = re_engine.aggregate_strength_adjusted(sa_games, codes, [0.0, re_engine.PERFORMANCE_K])
+    pd.testing.assert_frame_equal(sa_games, before)
+    pd.testing.assert_frame_equal(again[re_engine.PERFORMANCE_K], sa)
+    print("✅ aggregate_strength_adjusted leaves its input frame unchanged")
+
+
+if __name__ == "__main__":
+    test_compact_long_frame()
+    test_low_memory_rankings_match_default()
+    test_aggregate_leaves_games_untouched()
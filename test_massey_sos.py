@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Massey (least-squares) SOS engine: exact ratings, solvers, ridge and engine selection
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from analytics import massey_sos
+from core import ranking_engine as re_engine
+from core.ranking_snapshots import RankingSnapshotStore
+from test_ranking_snapshots import _write_inputs
+
+AS_OF = "2025-03-03"
+
+
+def _games(strength, n_games=300, seed=5, noise=0.0):
+    """Games whose margins are the strength difference (plus optional noise)."""
+    rng = np.random.default_rng(seed)
+    teams = [f"Team {i:02d}" for i in range(len(strength))]
+    a = rng.integers(0, len(teams), n_games)
+    b = (a + rng.integers(1, len(teams), n_games)) % len(teams)
+    margin = np.round(strength[a] - strength[b] + rng.normal(0, noise, n_games))
+    return pd.DataFrame({
+        "Team A": [teams[i] for i in a],
+        "Team B": [teams[i] for i in b],
+        "Score A": np.maximum(margin, 0).astype(int),
+        "Score B": np.maximum(-margin, 0).astype(int),
+    })
+
+
+def test_massey_recovers_consistent_margins():
+    """Margins that are exact rating differences are reproduced by both solvers."""
+    strength = np.array([2.0, 1.0, 0.0, -1.0, -2.0, 0.0, 1.0, -1.0])
+    games = _games(strength)
+    teams = [f"Team {i:02d}" for i in range(len(strength))]
+    matrix, margin = massey_sos.incidence_matrix(games, teams)
+    for solver in massey_sos.SOLVERS:
+        ratings = massey_sos.solve_massey(matrix, margin, ridge=0.0, solver=solver)
+        np.testing.assert_allclose(ratings, strength - strength.mean(), atol=1e-6)
+
+    with pytest.raises(ValueError):
+        massey_sos.solve_massey(matrix, margin, solver="gauss")
+    print("✅ Massey ratings recover exact margins with LSQR and CG")
+
+
+def test_massey_caps_ridge_and_contract():
+    """Blowouts are capped, ridge shrinks ratings, and SOS is a 0-1 dict like the Elo engine."""
+    strength = np.random.default_rng(7).normal(0, 2, 30)
+    games = _games(strength, n_games=600, noise=1.0)
+    games.loc[0, ["Score A", "Score B"]] = [25, 0]
+    teams = pd.unique(games[["Team A", "Team B"]].values.ravel("K")).tolist()
+    matrix, margin = massey_sos.incidence_matrix(games, teams)
+    assert margin.max() <= massey_sos.GOAL_DIFF_CAP
+
+    sos, ratings = massey_sos.compute_massey_sos_from_games(games)
+    assert set(sos) == set(teams) == set(ratings)
+    values = np.array(list(sos.values()))
+    assert values.min() == pytest.approx(0.0) and values.max() == pytest.approx(1.0)
+    assert abs(sum(ratings.values())) < 1e-6
+
+    sos_cg, ratings_cg = massey_sos.compute_massey_sos_from_games(games, solver="cg")
+    np.testing.assert_allclose([ratings_cg[t] for t in teams], [ratings[t] for t in teams], atol=1e-6)
+
+    _, shrunk = massey_sos.compute_massey_sos_from_games(games, ridge=10.0)
+    assert np.std(list(shrunk.values())) < np.std(list(ratings.values()))
+
+    # Warm start from the previous ratings converges to the same solution
+    _, warm = massey_sos.compute_massey_sos_from_games(games, initial_ratings=ratings)
+    np.testing.assert_allclose([warm[t] for t in teams], [ratings[t] for t in teams], atol=1e-6)
+    print(f"✅ Massey SOS dict for {len(sos)} teams; ridge shrinks the spread")
+
+
+def test_sos_engine_selection():
+    """SOS_ENGINE=massey feeds the engine and snapshots, and differs from the Elo build."""
+    cwd = os.getcwd()
+    engine = re_engine.SOS_ENGINE
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            re_engine.SOS_ENGINE = "massey"
+            assert re_engine.iterative_sos_config()["SOS_ENGINE"] == "massey"
+            massey = re_engine.build_rankings_from_wide("Matched_Games.csv", "out.csv", as_of=AS_OF,
+                                                     use_cache=False)
+            store = RankingSnapshotStore.from_matches("Matched_Games.csv")
+            got = re_engine.visible_rankings(store.rankings_as_of(AS_OF))
+            pd.testing.assert_frame_equal(
+                got[re_engine.RANKINGS_COLUMNS].reset_index(drop=True),
+                massey[re_engine.RANKINGS_COLUMNS].reset_index(drop=True),
+            )
+
+            re_engine.SOS_ENGINE = "elo"
+            elo = re_engine.build_rankings_from_wide("Matched_Games.csv", "out.csv", as_of=AS_OF, use_cache=False)
+
+            re_engine.SOS_ENGINE = "masey"
+            with pytest.raises(ValueError):
+                re_engine.check_sos_engine()
+        finally:
+            re_engine.SOS_ENGINE = engine
+            os.chdir(cwd)
+
+    assert not massey["PowerScore_adj"].reset_index(drop=True).equals(elo["PowerScore_adj"].reset_index(drop=True))
+    print(f"✅ Massey SOS selected in the engine and snapshots ({len(massey)} teams)")
+
+
+if __name__ == "__main__":
+    test_massey_recovers_consistent_margins()
+    test_massey_caps_ridge_and_contract()
+    test_sos_engine_selection()
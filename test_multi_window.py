@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Every window of a multi-window run must equal a full build with that window
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from core.multi_window import MultiWindowRankings, wide_rankings, window_config, _parse_windows
+from test_ranking_snapshots import _write_inputs
+
+
+def _build_with(window):
+    """Full engine build with WINDOW_DAYS / MAX_GAMES patched to `window`."""
+    saved = re_engine.WINDOW_DAYS, re_engine.MAX_GAMES
+    try:
+        re_engine.WINDOW_DAYS, re_engine.MAX_GAMES = window["WINDOW_DAYS"], window["MAX_GAMES"]
+        return re_engine.build_rankings_from_wide("Matched_Games.csv", "out.csv", as_of="2025-03-20",
+                                                  use_cache=False, profile_json=False)
+    finally:
+        re_engine.WINDOW_DAYS, re_engine.MAX_GAMES = saved
+
+
+def test_windows_match_full_builds():
+    """Nested and equal-length windows with different MAX_GAMES each equal their own build."""
+    windows = [window_config("current"), window_config("short", 120, 10),
+               window_config("long", 540, 45), window_config("current_15", max_games=15)]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            runner = MultiWindowRankings.from_matches("Matched_Games.csv", windows, as_of="2025-03-20")
+            results = runner.run(windows)
+            expected = {w["name"]: _build_with(w) for w in windows}
+        finally:
+            os.chdir(cwd)
+
+    assert list(results) == [w["name"] for w in windows]
+    for name, got in results.items():
+        pd.testing.assert_frame_equal(got.reset_index(drop=True),
+                                      expected[name][re_engine.RANKINGS_COLUMNS].reset_index(drop=True))
+    assert results["short"]["GamesPlayed"].max() <= 10 < results["long"]["GamesPlayed"].max()
+
+    wide = wide_rankings(results)
+    assert wide["Team"].is_unique and len(wide) == len(set().union(*(r["Team"] for r in results.values())))
+    assert wide["Rank_current"].dropna().is_monotonic_increasing
+    assert {"PowerScore_adj_short", "GamesPlayed_long"} <= set(wide.columns)
+    print(f"✅ {len(windows)} windows match full builds; wide table has {len(wide)} teams")
+
+
+def test_parse_windows():
+    """NAME=DAYS:GAMES, with either part defaulting to the engine settings."""
+    windows = _parse_windows(["season=240:20", "games=:15", "days=200"])
+    assert windows[0] == {"name": "season", "WINDOW_DAYS": 240, "MAX_GAMES": 20}
+    assert windows[1] == {"name": "games", "WINDOW_DAYS": re_engine.WINDOW_DAYS, "MAX_GAMES": 15}
+    assert windows[2] == {"name": "days", "WINDOW_DAYS": 200, "MAX_GAMES": re_engine.MAX_GAMES}
+    print("✅ Window specs parsed")
+
+
+if __name__ == "__main__":
+    test_windows_match_full_builds()
+    test_parse_windows()
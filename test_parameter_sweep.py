@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Every parameter-sweep configuration must equal a full build with those settings
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from core.parameter_sweep import ParameterSweep, parameter_grid, SWEEP_PARAMS
+from test_ranking_snapshots import _write_inputs
+
+
+def _build_with(config):
+    """Full engine build with the module constants patched to `config`."""
+    saved = {name: getattr(re_engine, name) for name in SWEEP_PARAMS}
+    try:
+        for name, value in config.items():
+            setattr(re_engine, name, value)
+        return re_engine.build_rankings_from_wide("Matched_Games.csv", "out.csv", as_of="2025-03-20")
+    finally:
+        for name, value in saved.items():
+            setattr(re_engine, name, value)
+
+
+def test_sweep_matches_full_builds():
+    """Rankings of a mixed grid equal per-config builds; bad keys are rejected."""
+    configs = parameter_grid(SOS_WEIGHT=[0.6, 0.4], PERFORMANCE_K=[0.15, 0.3], SHRINK_TAU=[8, 2])
+    configs += parameter_grid(RECENT_SHARE=[0.5], OFF_WEIGHT=[0.3])
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            sweep = ParameterSweep.from_matches("Matched_Games.csv", as_of="2025-03-20")
+            summary, rankings = sweep.run(configs)
+            checked = [0, 3, 5, len(configs) - 1]
+            expected = {i: _build_with(configs[i]) for i in checked}
+        finally:
+            os.chdir(cwd)
+
+    assert len(summary) == len(configs) == 9
+    for i in checked:
+        got = rankings[rankings["config_id"] == i]
+        cols = ["Rank", "Team", "PowerScore_adj", "PowerScore"]
+        pd.testing.assert_frame_equal(got[cols].reset_index(drop=True),
+                                      expected[i][cols].reset_index(drop=True))
+        assert summary.loc[i, "teams_ranked"] == len(expected[i])
+    # Config 0 is the engine default, i.e. the reference
+    assert abs(summary.loc[0, "spearman_vs_reference"] - 1.0) < 1e-12
+    assert summary.loc[0, "top10_overlap"] == 10
+
+    try:
+        parameter_grid(HOME_ADVANTAGE=[0.1])
+        assert False, "unknown parameter accepted"
+    except ValueError:
+        pass
+    print(f"✅ {len(configs)} sweep configs match full builds:\n{summary.round(3)}")
+
+
+if __name__ == "__main__":
+    test_sweep_matches_full_builds()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+In-process pipeline DAG: concurrent stages, and the same outputs as the script chain
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from core import history_generator
+from utils.pipeline_dag import PipelineDAG, PipelineStageError
+from utils.columnar_io import parquet_path_for, read_table
+import run_pipeline
+
+
+def test_dag_runs_independent_stages_concurrently():
+    """Independent stages overlap, results flow in memory, failures name the stage."""
+    barrier = threading.Barrier(2, timeout=10)  # only passes if both run at once
+    dag = PipelineDAG()
+    dag.add("a", lambda: (barrier.wait(), 2)[1])
+    dag.add("b", lambda: (barrier.wait(), 3)[1])
+    dag.add("product", lambda a, b: a * b, deps=("a", "b"))
+    dag.add("unused", lambda: 1 / 0)
+    assert dag.run(["product"])["product"] == 6
+    assert "unused" not in dag.timings
+
+    dag.add("broken", lambda p: p / 0, deps=("product",))
+    try:
+        dag.run(["broken"], results={"a": 1, "b": 1})
+        assert False, "stage error not raised"
+    except PipelineStageError as e:
+        assert e.stage == "broken" and isinstance(e.__cause__, ZeroDivisionError)
+    try:
+        dag.add("orphan", lambda x: x, deps=("missing",))
+        assert False, "unknown dependency accepted"
+    except ValueError:
+        pass
+    print("✅ DAG runs independent stages concurrently")
+
+
+def _write_pipeline_inputs(tmp, n_teams=24, n_games=400, seed=5):
+    """Pipeline layout in `tmp`: master lists, matched games and the root SOS history."""
+    rng = np.random.default_rng(seed)
+    teams = [f"Team {i:03d}" for i in range(n_teams)]
+    master = pd.DataFrame({"Team Name": teams, "Club": ["" if i % 4 else "SC" for i in range(n_teams)]})
+    for d in ["data/input", "data/processed", "data/output"]:
+        os.makedirs(os.path.join(tmp, d))
+    master.to_csv(os.path.join(tmp, run_pipeline.MASTER_TEAM_LIST), index=False)
+    master.to_csv(os.path.join(tmp, re_engine.ITERATIVE_SOS_MASTER_PATH), index=False)
+
+    a = rng.integers(0, n_teams + 4, n_games)  # a few non-master opponents
+    b = (a + rng.integers(1, n_teams, n_games)) % (n_teams + 4)
+    name = lambda i: teams[i] if i < n_teams else f"Guest {i}"
+    days = np.sort(rng.integers(1, 300, n_games))
+    wide = pd.DataFrame({
+        "Team A": [name(i) for i in a],
+        "Team B": [name(i) for i in b],
+        "Score A": rng.poisson(2.0, n_games),
+        "Score B": rng.poisson(1.6, n_games),
+        "Date": (pd.Timestamp.now().normalize() - pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"),
+    })
+    wide.to_csv(os.path.join(tmp, run_pipeline.MATCHED_GAMES), index=False)
+    wide.to_csv(os.path.join(tmp, re_engine.ITERATIVE_SOS_GAMES_PATH), index=False)
+    long = re_engine.wide_to_long(wide)
+    hist = pd.DataFrame({"Team": long["Team"], "Date": long["Date"], "Opponent": long["Opponent"]})
+    hist["Opponent_BaseStrength"] = hist["Opponent"].map(lambda n: (sum(map(ord, n)) % 83) / 83)
+    hist.to_csv(os.path.join(tmp, re_engine.SOS_HISTORY_PATH), index=False)
+
+
+def test_pipeline_matches_script_chain():
+    """DAG run from matched games writes the same files as history_generator + ranking_engine, from memory."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_pipeline_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            history_generator.generate_comprehensive_history(
+                Path(run_pipeline.MATCHED_GAMES), Path(run_pipeline.COMPREHENSIVE_HISTORY))
+            expected_history = read_table(run_pipeline.COMPREHENSIVE_HISTORY)
+            # The script chain reads baseline SOS from the root history; the DAG uses its own history stage
+            expected_history.to_csv(re_engine.SOS_HISTORY_PATH, index=False)
+            re_engine.build_rankings_from_wide(run_pipeline.MATCHED_GAMES, "chain.csv", use_cache=False)
+            os.remove(parquet_path_for(run_pipeline.COMPREHENSIVE_HISTORY))
+
+            # Stale files in the working directory must not leak into the DAG run
+            pd.read_csv(re_engine.ITERATIVE_SOS_GAMES_PATH).head(10).to_csv(re_engine.ITERATIVE_SOS_GAMES_PATH,
+                                                                           index=False)
+            os.remove(re_engine.SOS_HISTORY_PATH)
+
+            dag = run_pipeline.build_pipeline(from_matched=True)
+            results = dag.run(max_workers=4)
+            got = pd.read_csv(run_pipeline.RANKINGS_OUT)
+            expected = pd.read_csv("chain.csv")
+            history = read_table(run_pipeline.COMPREHENSIVE_HISTORY)
+        finally:
+            os.chdir(cwd)
+
+    assert "raw_games" not in results and len(got) > 0
+    pd.testing.assert_frame_equal(got, expected)
+    pd.testing.assert_frame_equal(history, expected_history)
+    print(f"✅ In-process pipeline matches the script chain ({len(got)} teams, {len(dag.timings)} stages)")
+
+
+if __name__ == "__main__":
+    test_dag_runs_independent_stages_concurrently()
+    test_pipeline_matches_script_chain()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+As-of snapshots must equal the engine's --as-of build on the same inputs
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from core.ranking_snapshots import RankingSnapshotStore, weekly_dates
+
+
+def _write_inputs(tmp, n_teams=24, n_games=400, seed=3):
+    """Games, master list and histories in the layout the engine reads from its cwd."""
+    rng = np.random.default_rng(seed)
+    teams = [f"Team {i:03d}" for i in range(n_teams)]
+    master = pd.DataFrame({"Team Name": teams, "Club": ["" if i % 4 else "SC" for i in range(n_teams)]})
+    os.makedirs(os.path.join(tmp, "data", "input"))
+    os.makedirs(os.path.join(tmp, "data", "processed"))
+    master.to_csv(os.path.join(tmp, "data", "input", "AZ MALE U12 MASTER TEAM LIST.csv"), index=False)
+    master.to_csv(os.path.join(tmp, "AZ MALE U12 MASTER TEAM LIST.csv"), index=False)
+
+    a = rng.integers(0, n_teams, n_games)
+    b = (a + rng.integers(1, n_teams, n_games)) % n_teams
+    days = np.sort(rng.integers(0, 500, n_games))  # several games share a day
+    wide = pd.DataFrame({
+        "Team A": [teams[i] for i in a],
+        "Team B": [teams[i] for i in b],
+        "Score A": rng.poisson(2.0, n_games),
+        "Score B": rng.poisson(1.6, n_games),
+        "Date": (pd.Timestamp("2024-06-01") + pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"),
+    })
+    wide.to_csv(os.path.join(tmp, "Matched_Games.csv"), index=False)
+
+    long = re_engine.wide_to_long(wide)
+    hist = pd.DataFrame({"Team": long["Team"], "Date": long["Date"].dt.strftime("%Y-%m-%d"), "Opponent": long["Opponent"]})
+    hist["Opponent_BaseStrength"] = hist["Opponent"].map(lambda n: (sum(map(ord, n)) % 89) / 89)
+    hist.to_csv(os.path.join(tmp, "Team_Game_Histories_COMPREHENSIVE.csv"), index=False)
+    hist.to_csv(os.path.join(tmp, "data", "processed", "Team_Game_Histories_COMPREHENSIVE.csv"), index=False)
+
+
+def test_snapshots_match_as_of_builds():
+    """Cached snapshots equal full builds with --as-of, and later games are ignored."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            store = RankingSnapshotStore.cached("Matched_Games.csv", os.path.join(tmp, "cache.pkl"))
+            dates = weekly_dates("2025-03-01", "2025-03-20")
+            assert [d.day_name() for d in dates] == ["Monday"] * 3
+            history = store.rank_history(dates)
+
+            # Second load comes from the cache file
+            store = RankingSnapshotStore.cached("Matched_Games.csv", os.path.join(tmp, "cache.pkl"))
+            for as_of in [dates[0], dates[-1]]:
+                expected = re_engine.build_rankings_from_wide("Matched_Games.csv", "out.csv", as_of=as_of)
+                got = re_engine.visible_rankings(store.rankings_as_of(as_of))
+                pd.testing.assert_frame_equal(
+                    got[re_engine.RANKINGS_COLUMNS].reset_index(drop=True),
+                    expected[re_engine.RANKINGS_COLUMNS].reset_index(drop=True),
+                )
+                assert got["LastGame"].max() <= as_of
+        finally:
+            os.chdir(cwd)
+
+    assert sorted(history["AsOf"].unique()) == dates
+    assert history.groupby("AsOf")["Rank"].min().eq(1).all()
+    print(f"✅ {len(dates)} weekly snapshots match --as-of builds ({len(history)} rank rows)")
+
+
+def test_snapshot_cache_tracks_every_input():
+    """Changing any input file or the iterative SOS setting rebuilds the cached store."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        cache = os.path.join(tmp, "cache.pkl")
+        try:
+            store = RankingSnapshotStore.cached("Matched_Games.csv", cache, iterative_sos=False)
+            assert store.elo_games is None
+            # A --no-iterative-sos cache is not reused for a build with iterative SOS
+            store = RankingSnapshotStore.cached("Matched_Games.csv", cache)
+            assert store.elo_games is not None
+            assert RankingSnapshotStore.cached("Matched_Games.csv", cache).source == store.source
+
+            hist = pd.read_csv(re_engine.SOS_HISTORY_PATH)
+            hist["Opponent_BaseStrength"] = 0.5
+            hist.to_csv(re_engine.SOS_HISTORY_PATH, index=False)
+            store = RankingSnapshotStore.cached("Matched_Games.csv", cache)
+            assert store.sos_hist["Opponent_BaseStrength"].eq(0.5).all()
+
+            master = pd.read_csv(re_engine.MASTER_TEAM_LIST_PATH)
+            master.head(20).to_csv(re_engine.MASTER_TEAM_LIST_PATH, index=False)
+            store = RankingSnapshotStore.cached("Matched_Games.csv", cache)
+            assert store.long["Team"].nunique() == 20
+        finally:
+            os.chdir(cwd)
+    print("✅ Snapshot cache rebuilt after history, master list and iterative SOS changes")
+
+
+def test_snapshot_cache_tracks_engine_settings():
+    """A cache built with one WINDOW_DAYS is not reused (on disk or in memory) after it changes."""
+    cwd = os.getcwd()
+    window_days = re_engine.WINDOW_DAYS
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        cache = os.path.join(tmp, "cache.pkl")
+        try:
+            store = RankingSnapshotStore.cached("Matched_Games.csv", cache, iterative_sos=False)
+            full_window = store.rankings_as_of("2025-03-03")
+            re_engine.WINDOW_DAYS = 60  # as with WINDOW_DAYS=60 in the environment
+            short_window = store.rankings_as_of("2025-03-03")
+            reloaded = RankingSnapshotStore.cached("Matched_Games.csv", cache, iterative_sos=False)
+            assert reloaded.snapshots == {}
+            got = reloaded.rankings_as_of("2025-03-03")
+            expected = re_engine.build_rankings_from_wide("Matched_Games.csv", "out.csv", as_of="2025-03-03",
+                                                          use_cache=False, profile_json=False)
+        finally:
+            re_engine.WINDOW_DAYS = window_days
+            os.chdir(cwd)
+
+    assert short_window["GamesPlayed"].sum() < full_window["GamesPlayed"].sum()
+    assert got["GamesPlayed"].sum() == short_window["GamesPlayed"].sum()
+    assert re_engine.visible_rankings(got)["GamesPlayed"].sum() == expected["GamesPlayed"].sum()
+    print("✅ Snapshot cache rebuilt after an engine setting change")
+
+
+if __name__ == "__main__":
+    test_snapshots_match_as_of_builds()
+    test_snapshot_cache_tracks_every_input()
+    test_snapshot_cache_tracks_engine_settings()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Stage cache: reruns reuse unchanged stages, changes invalidate downstream only
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from utils.stage_cache import StageCache
+from test_ranking_snapshots import _write_inputs
+
+AS_OF = "2025-03-20"
+
+
+def _build(cache_dir, **kwargs):
+    """Build in the cwd, returning (visible rankings, stages loaded from cache)."""
+    hits = []
+    original = StageCache.__init__
+
+    def init(self, root=None, **kw):
+        original(self, root=cache_dir, **kw)
+        hits.append(self.hits)  # same list object the build appends to
+    StageCache.__init__ = init
+    try:
+        out = re_engine.build_rankings_from_wide("Matched_Games.csv", "out.csv", as_of=AS_OF, **kwargs)
+    finally:
+        StageCache.__init__ = original
+    return out[re_engine.RANKINGS_COLUMNS].reset_index(drop=True), hits[0]
+
+
+def test_rerun_skips_to_first_changed_stage():
+    """Cached reruns equal uncached builds; config and file edits recompute downstream."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        cache_dir = os.path.join(tmp, "stages")
+        try:
+            fresh, _ = _build(cache_dir, use_cache=False)
+            first, hits = _build(cache_dir)
+            assert hits == []
+            again, hits = _build(cache_dir)
+            assert hits == ["long", "base", "sa", "sos", "elo", "games_total"]
+            pd.testing.assert_frame_equal(first, fresh)
+            pd.testing.assert_frame_equal(again, fresh)
+
+            # PERFORMANCE_K only feeds the SA stage
+            saved = re_engine.PERFORMANCE_K
+            re_engine.PERFORMANCE_K = 0.3
+            try:
+                tweaked, hits = _build(cache_dir)
+                expected, _ = _build(cache_dir, use_cache=False)
+            finally:
+                re_engine.PERFORMANCE_K = saved
+            assert hits == ["long", "base", "sos", "elo", "games_total"]
+            pd.testing.assert_frame_equal(tweaked, expected)
+
+            # Editing the games file changes the content hash of every game stage
+            games = pd.read_csv("Matched_Games.csv")
+            games.loc[len(games) - 1, "Score A"] += 3
+            games.to_csv("Matched_Games.csv", index=False)
+            edited, hits = _build(cache_dir)
+            assert hits == ["games_total"]
+            expected, _ = _build(cache_dir, use_cache=False)
+            pd.testing.assert_frame_equal(edited, expected)
+        finally:
+            os.chdir(cwd)
+    print("✅ Stage cache reuses unchanged stages and recomputes from the first changed one")
+
+
+def test_eviction_keeps_cache_under_size_bound():
+    """Least recently used entries are evicted once the cache exceeds max size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        frame = pd.DataFrame({"x": range(20000)})
+        size = len(frame.to_parquet())
+        cache = StageCache(root=tmp, max_mb=3.5 * size / (1024 * 1024))
+        for i in range(3):
+            cache.store("stage", f"k{i}", frame)
+            time.sleep(0.01)
+        assert cache.load("stage", "k0") is not None  # k0 becomes most recently used
+        time.sleep(0.01)
+        cache.store("stage", "k3", frame)
+
+        assert cache.size_bytes() <= cache.max_bytes
+        assert cache.load("stage", "k1") is None
+        for key in ["k0", "k2", "k3"]:
+            pd.testing.assert_frame_equal(cache.load("stage", key), frame)
+        series = pd.Series([1.5, 2.5], index=pd.Index(["a", "b"], name="Team"))
+        cache.store("series", "s", series)
+        pd.testing.assert_series_equal(cache.load("series", "s"), series)
+    print("✅ Stage cache evicts least recently used entries to stay under its size bound")
+
+
+if __name__ == "__main__":
+    test_rerun_skips_to_first_changed_stage()
+    test_eviction_keeps_cache_under_size_bound()
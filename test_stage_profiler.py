@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Ranking builds write a per-stage profile (JSON, optional cProfile dumps)
+"""
+
+import json
+import os
+import pstats
+import sys
+import tempfile
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from utils.stage_profiler import StageProfiler
+from test_ranking_snapshots import _write_inputs
+
+
+def test_build_writes_stage_profile():
+    """Every stage has wall/CPU time, memory and rows; cProfile dumps are readable."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            out = re_engine.build_rankings_from_wide("Matched_Games.csv", "Rankings.csv", as_of="2025-03-20",
+                                                     use_cache=False, cprofile_dir="prof")
+            with open("Rankings.profile.json", encoding="utf-8") as f:
+                report = json.load(f)
+            stats = pstats.Stats(report["stages"][0]["cprofile"])
+        finally:
+            os.chdir(cwd)
+
+    stages = {s["stage"]: s for s in report["stages"]}
+    for name in ["csv_load", "wide_to_long", "off_def_raw", "strength_adjusted",
+                 "baseline_sos", "iterative_sos", "finalize", "write_rankings"]:
+        assert name in stages, name
+        assert stages[name]["wall_s"] >= 0 and stages[name]["cpu_s"] >= 0
+        assert stages[name]["max_rss_mb"] > 0
+    assert stages["csv_load"]["rows"] == 400
+    assert stages["finalize"]["rows"] == len(out)
+    assert report["metadata"]["as_of"] == "2025-03-20"
+    assert report["total_wall_s"] >= sum(s["wall_s"] for s in report["stages"]) * 0.99
+    assert stats.total_calls > 0
+    print(f"✅ Stage profile with {len(stages)} stages written next to the rankings")
+
+
+def test_traced_memory_and_errors():
+    """tracemalloc peak covers NumPy buffers; a failing stage is still recorded."""
+    import numpy as np
+    prof = StageProfiler("test", trace_memory=True)
+    with prof.stage("alloc") as info:
+        info["rows"] = len(np.ones(4_000_000))  # ~32 MB
+    try:
+        with prof.stage("fails"):
+            raise KeyError("missing column")
+    except KeyError:
+        pass
+    report = prof.write_json(os.path.join(tempfile.gettempdir(), "profile_test.json"))
+    alloc, fails = report["stages"]
+    assert alloc["peak_mem_mb"] >= 30 and alloc["rows"] == 4_000_000
+    assert "KeyError" in fails["error"]
+    print("✅ Traced peak memory and stage errors recorded")
+
+
+if __name__ == "__main__":
+    test_build_writes_stage_profile()
+    test_traced_memory_and_errors()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Chunked ingest keeps exactly the games the rankings use
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from utils.columnar_io import read_table, write_table
+from test_ranking_snapshots import _write_inputs
+
+AS_OF = "2025-03-20"
+
+
+def _ranking_long(wide, master_team_names, team_name_mapping):
+    long = re_engine.clamp_window(re_engine.wide_to_long(wide), today=AS_OF)
+    return re_engine.filter_to_master_teams(long, master_team_names, team_name_mapping).reset_index(drop=True)
+
+
+def test_stream_window_games_matches_full_read():
+    """Streamed CSV and Parquet chunks give the long frame of a full read, from fewer rows."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        path = os.path.join(tmp, "Matched_Games.csv")
+        wide = pd.read_csv(path)
+        # Games between non-master teams never reach the rankings
+        visitors = wide.head(50).assign(**{"Team A": "Visitor A", "Team B": "Visitor B"})
+        wide = pd.concat([wide, visitors], ignore_index=True)
+        wide.to_csv(path, index=False)
+        master_mapping = re_engine.load_master_team_mapping(os.path.join(tmp, "AZ MALE U12 MASTER TEAM LIST.csv"))
+
+        for source in ["csv", "parquet"]:
+            if source == "parquet":
+                write_table(wide, path)
+            expected = _ranking_long(read_table(path), *master_mapping)
+            streamed, scanned = re_engine.stream_window_games(path, master_mapping[0], today=AS_OF, chunk_rows=37)
+            assert scanned == len(wide) and len(streamed) < len(wide)
+            assert list(streamed.columns) == re_engine.WIDE_GAME_COLUMNS
+            assert not streamed["Team A"].eq("Visitor A").any()
+            pd.testing.assert_frame_equal(_ranking_long(streamed, *master_mapping), expected)
+            print(f"✅ {source}: kept {len(streamed)} of {scanned} games")
+
+
+def test_streamed_rankings_identical():
+    """A build that streams its input (DuckDB Off/Def file scan or not) ranks exactly like one that reads it whole."""
+    cwd = os.getcwd()
+    min_mb = re_engine.STREAM_INGEST_MIN_MB
+    file_scan = re_engine.DUCKDB_FILE_SCAN
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_inputs(tmp)
+        os.chdir(tmp)
+        try:
+            full = re_engine.build_rankings_from_wide("Matched_Games.csv", "full.csv", as_of=AS_OF,
+                                                      use_cache=False, profile_json=False)
+            re_engine.STREAM_INGEST_MIN_MB = 0
+            streamed = re_engine.build_rankings_from_wide("Matched_Games.csv", "streamed.csv", as_of=AS_OF,
+                                                          use_cache=False, profile_json="streamed.json")
+            with open("streamed.json", encoding="utf-8") as f:
+                stages = {s["stage"]: s for s in json.load(f)["stages"]}
+            re_engine.DUCKDB_FILE_SCAN = False
+            pandas_only = re_engine.build_rankings_from_wide("Matched_Games.csv", "streamed.csv", as_of=AS_OF,
+                                                             use_cache=False, profile_json=False)
+        finally:
+            re_engine.STREAM_INGEST_MIN_MB = min_mb
+            re_engine.DUCKDB_FILE_SCAN = file_scan
+            os.chdir(cwd)
+
+    # Off_raw/Def_raw of oversized inputs come from the DuckDB file scan
+    assert stages["off_def_raw"]["duckdb_file_scan"] == re_engine.DUCKDB_AVAILABLE
+    pd.testing.assert_frame_equal(streamed, full)
+    pd.testing.assert_frame_equal(pandas_only, full)
+    print(f"✅ {len(full)} teams ranked identically from the streamed input")
+
+
+def test_parse_game_dates_known_formats():
+    """Scraper, ISO and timestamp layouts parse; anything else is NaT."""
+    dates = re_engine.parse_game_dates(pd.Series(["9/14/2025", "2025-01-02", "2025-01-03 05:00:00",
+                                                  "2025-01-04T06:30:00", None, "junk"]))
+    assert dates.tolist()[:4] == [pd.Timestamp("2025-09-14"), pd.Timestamp("2025-01-02"),
+                                  pd.Timestamp("2025-01-03 05:00"), pd.Timestamp("2025-01-04 06:30")]
+    assert dates[4:].isna().all()
+    print("✅ Game dates parsed with the known formats")
+
+
+if __name__ == "__main__":
+    test_stream_window_games_matches_full_read()
+    test_streamed_rankings_identical()
+    test_parse_game_dates_known_formats()
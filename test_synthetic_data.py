@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Synthetic national data matches the Matched_Games / master list formats
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from utils.synthetic_data import (MASTER_COLUMNS, MATCHED_GAMES_COLUMNS, SyntheticLeague,
+                                  write_synthetic_dataset)
+
+
+def test_dataset_formats():
+    """Master lists per age group and games whose match columns point into them."""
+    with tempfile.TemporaryDirectory() as tmp:
+        written = write_synthetic_dataset(tmp, 5_000, seed=1, end_date="2025-06-30")
+        games = pd.read_csv(written["games"])
+        masters = [pd.read_csv(p) for p in written["masters"]]
+
+    assert list(games.columns) == MATCHED_GAMES_COLUMNS
+    assert all(list(m.columns) == MASTER_COLUMNS for m in masters)
+    assert len(masters) == 5 and sum(len(m) for m in masters) == written["league"].n_teams
+    names = set(pd.concat(masters)["Team_Name"])
+    assert len(names) == written["league"].n_teams
+    assert set(games["Team A Match"]) | set(games["Team B Match"]) <= names
+    assert (games["Team A"] != games["Team B"]).all()
+    assert (games["Score A"] >= 0).all() and (games["Score B"] >= 0).all()
+    dates = pd.to_datetime(games["Date"], format="%m/%d/%Y")
+    assert dates.is_monotonic_increasing and dates.max() <= pd.Timestamp("2025-06-30")
+    assert games["Team A Match Type"].isin(["EXACT", "FUZZY"]).all()
+    print(f"✅ {len(games)} games against {len(names)} master teams")
+
+
+def test_game_options():
+    """in_state_share=1 keeps every game inside one state and age; noise and strength show up."""
+    league = SyntheticLeague(2_000, seed=2)
+    games = league.games(20_000, in_state_share=1.0, cross_age_share=0.0, name_noise=0.5, seed=5)
+    idx = pd.Series(np.arange(league.n_teams), index=league.master["Team_Name"])
+    a, b = idx[games["Team A"]].to_numpy(), idx[games["Team B"]].to_numpy()
+    same_group = (league.state[a] == league.state[b]) & (league.age[a] == league.age[b])
+    assert same_group.mean() > 0.99  # only teams alone in their state fall back to national games
+
+    fuzzy = games["Team A Match Type"] == "FUZZY"
+    assert 0.4 < fuzzy.mean() < 0.6
+    assert (games.loc[~fuzzy, "Team A Normalized"] == games.loc[~fuzzy, "Team A"].str.lower()).all()
+
+    stronger = league.strength[a] > league.strength[b]
+    assert (games["Score A"] > games["Score B"])[stronger].mean() > 0.5
+    assert games.equals(league.games(20_000, in_state_share=1.0, cross_age_share=0.0, name_noise=0.5, seed=5))
+    print("✅ Connectivity, name noise and strength-driven scores as configured")
+
+
+if __name__ == "__main__":
+    test_dataset_formats()
+    test_game_options()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+What-if scenarios must rank like a rebuild with the hypothetical games added
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from core import ranking_engine as re_engine
+from core.what_if import SCENARIO_COLUMNS, ScenarioEngine, scenario_games
+from test_incremental_ranking import _build, _write_fixture, _write_games
+
+
+def test_scenario_matches_rebuild():
+    """A hypothetical result gives the rebuilt rankings and leaves the resident state alone."""
+    today = pd.Timestamp("2025-10-20")
+    with tempfile.TemporaryDirectory() as tmp:
+        wide = _write_fixture(tmp, n_teams=60, n_games=500, seed=5)
+        ranker = _build(tmp, _write_games(tmp, wide, "initial"), today)
+        scenario = ScenarioEngine(ranker)
+        base_before, baseline = ranker.base, scenario.baseline.copy()
+
+        # Teams by their ranked (club) names, as a coach would give them
+        team_a, team_b = ranker.team_name_mapping["Team 003"], ranker.team_name_mapping["Team 017"]
+        changes = scenario.evaluate([(team_a, team_b, 2, 1)])
+        again = scenario.evaluate([(team_a, team_b, 2, 1)])
+
+        hypothetical = scenario_games([("Team 003", "Team 017", 2, 1)], today)
+        rebuilt = _build(tmp, _write_games(tmp, pd.concat([wide, hypothetical]), "scenario"), today)
+        expected = re_engine.visible_rankings(rebuilt.rankings())
+
+    assert ranker.base is base_before and len(ranker.long) == len(rebuilt.long) - 2
+    pd.testing.assert_frame_equal(scenario.baseline, baseline)
+    pd.testing.assert_frame_equal(changes, again)
+
+    cols = ["Team", "Rank", "PowerScore_adj", "GamesPlayed"]
+    pd.testing.assert_frame_equal(scenario.last_rankings[cols].reset_index(drop=True),
+                                  expected[cols].reset_index(drop=True), check_dtype=False)
+    assert list(changes.columns) == SCENARIO_COLUMNS
+    assert set(changes.loc[changes["in_scenario"], "Team"]) == {team_a, team_b}
+    row = changes.set_index("Team").loc[team_a]
+    assert row["Rank"] == expected.set_index("Team").loc[team_a, "Rank"]
+    assert row["RankChange"] == row["Rank_before"] - row["Rank"]
+    print(f"✅ Scenario matches rebuild; {len(changes)} teams changed, {team_a} "
+          f"{int(row['Rank_before'])} -> {int(row['Rank'])}")
+
+
+def test_scenario_rejects_unknown_teams():
+    """Games without a ranked team on either side are an error, not a silent no-op."""
+    with tempfile.TemporaryDirectory() as tmp:
+        wide = _write_fixture(tmp, n_teams=20, n_games=200)
+        ranker = _build(tmp, _write_games(tmp, wide, "initial"), pd.Timestamp("2025-10-20"))
+    with pytest.raises(ValueError, match="without a ranked team"):
+        ScenarioEngine(ranker).evaluate([("Nobody A", "Nobody B", 1, 0)])
+    print("✅ Unknown scenario teams rejected")
+
+
+if __name__ == "__main__":
+    test_scenario_matches_rebuild()
+    test_scenario_rejects_unknown_teams()